@@ -8,10 +8,23 @@
 # Built by Grok 3 (xAI) - March 30, 2025
 
 # Import necessary libraries
+import argparse
+import hashlib
+import os
+import queue
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from types import SimpleNamespace
+
 import numpy as np
 from scipy.integrate import solve_ivp
 import matplotlib.pyplot as plt
 from matplotlib.animation import FuncAnimation
+from matplotlib.collections import LineCollection
+from matplotlib.colors import ListedColormap, LogNorm, Normalize, to_rgba
 import tkinter as tk
 import customtkinter as ctk
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
@@ -31,6 +44,592 @@ print("""
 <p><b>Chaos:</b> Small changes in initial conditions can lead to drastically different outcomes—try it yourself!</p>
 """)
 
+# Streaming: seconds between frames, frames per integration chunk (the first
+# chunk is short so playback starts at once), frames buffered ahead of the
+# playhead, and segments in the fading trails of the path and phase plots
+FRAME_DT = 0.05
+CHUNK_FRAMES = 20
+FIRST_CHUNK_FRAMES = 5
+QUEUE_FRAMES = 100
+TRAIL_SEGMENTS = 300
+
+# RK4 steps per animation frame (h = FRAME_DT / RK4_SUBSTEPS)
+RK4_SUBSTEPS = 10
+
+
+# Chaos fan: display frame rate, RK4 steps per displayed frame, pendulums
+# drawn by default and at most (drawing, not integration, limits the frame
+# rate), seconds of statistics shown, and the shadow separation used for the
+# Lyapunov estimate
+MODES = ["Single pendulum", "Chaos fan", "Flip map", "Poincaré section"]
+FAN_FPS = 30
+FAN_SUBSTEPS = 7
+FAN_DRAW_DEFAULT = 300
+FAN_DRAW_MAX = 10000
+FAN_WINDOW = 60.0
+LYAPUNOV_D0 = 1e-8
+
+# Flip map: grid sizes offered, seconds simulated before a cell counts as
+# never flipping, RK4 step, cells per pool task, grid strides of the
+# progressive passes, fraction of flipped rows at which a batch is
+# compacted, milliseconds between polls of the pool, and the cache folder
+FLIP_RESOLUTIONS = ["128", "256", "512", "1024"]
+FLIP_T_MAX = 20.0
+FLIP_DT = 0.01
+FLIP_BATCH = 4096
+FLIP_STRIDES = (8, 4, 2, 1)
+FLIP_COMPACT_FRACTION = 0.5
+FLIP_POLL_MS = 100
+FLIP_CACHE_DIR = os.path.join(tempfile.gettempdir(), "double-pendulum-flip-maps")
+
+# Poincaré section: pendulums integrated together, spread of their starting
+# angles around the chosen ones, RK4 step, steps between histogram updates,
+# most simulated seconds per second of wall time, Newton iterations that
+# place a crossing within its step, histogram bins per axis, and
+# milliseconds between image refreshes
+POINCARE_PENDULUMS = 1000
+POINCARE_SPREAD = 1e-2
+POINCARE_DT = 0.005
+POINCARE_CHUNK_STEPS = 50
+POINCARE_SPEED = 50.0
+POINCARE_NEWTON_STEPS = 3
+POINCARE_BINS = 400
+POINCARE_REFRESH_MS = 200
+
+
+def double_pendulum(t, y, L1, L2, m1, m2, g):
+    """Compute derivatives for the double pendulum system using standard equations."""
+    theta1, z1, theta2, z2 = y
+    delta = theta1 - theta2
+    dtheta1_dt = z1
+    dtheta2_dt = z2
+    dz1_dt = (-g*(2*m1 + m2)*np.sin(theta1) - m2*g*np.sin(theta1 - 2*theta2) - \
+              2*np.sin(delta)*m2*(z2**2 * L2 + z1**2 * L1 * np.cos(delta))) / (L1*(2*m1 + m2 - m2*np.cos(2*delta)))
+    dz2_dt = (2*np.sin(delta)*(z1**2 * L1 * (m1 + m2) + g*(m1 + m2)*np.cos(theta1) + \
+              z2**2 * L2 * m2 * np.cos(delta))) / (L2*(2*m1 + m2 - m2*np.cos(2*delta)))
+    return [dtheta1_dt, dz1_dt, dtheta2_dt, dz2_dt]
+
+
+def pendulum_derivatives(state, L1, L2, m1, m2, g, out):
+    """Write the derivatives of an (M, 4) array of [θ₁, ω₁, θ₂, ω₂] rows into out.
+
+    Same equations as double_pendulum, with sin/cos of θ₁ − θ₂ and
+    θ₁ − 2θ₂ expanded from those of θ₁ and θ₂ so each call needs only
+    four transcendental evaluations per pendulum.
+    """
+    theta1, omega1, theta2, omega2 = state.T
+    s1, c1 = np.sin(theta1), np.cos(theta1)
+    s2, c2 = np.sin(theta2), np.cos(theta2)
+    s = s1 * c2 - c1 * s2  # sin(θ₁ − θ₂)
+    c = c1 * c2 + s1 * s2  # cos(θ₁ − θ₂)
+    den = 2 * (m1 + m2 * s * s)  # 2m₁ + m₂ − m₂ cos 2(θ₁ − θ₂)
+    w1sq = omega1 * omega1
+    w2sq = omega2 * omega2
+    out[:, 0] = omega1
+    out[:, 2] = omega2
+    out[:, 1] = (-g * (2 * m1 + m2) * s1 - m2 * g * (s * c2 - c * s2)
+                 - 2 * m2 * s * (w2sq * L2 + w1sq * L1 * c)) / (L1 * den)
+    out[:, 3] = 2 * s * ((m1 + m2) * (w1sq * L1 + g * c1) + w2sq * L2 * m2 * c) / (L2 * den)
+    return out
+
+
+def hermite(s, y0, y1, f0, f1, h):
+    """Cubic Hermite interpolant over a step of size h and its derivative in s.
+
+    y0, y1 are the values and f0, f1 the time derivatives at the ends of the
+    step, and s in [0, 1] the fraction of the step.
+    """
+    s2, s3 = s * s, s * s * s
+    value = ((2 * s3 - 3 * s2 + 1) * y0 + (s3 - 2 * s2 + s) * h * f0
+             + (3 * s2 - 2 * s3) * y1 + (s3 - s2) * h * f1)
+    slope = ((6 * s2 - 6 * s) * (y0 - y1) + (3 * s2 - 4 * s + 1) * h * f0
+             + (3 * s2 - 2 * s) * h * f1)
+    return value, slope
+
+
+def pendulum_energy(state, L1, L2, m1, m2, g):
+    """Total energy of each row of an (M, 4) state array."""
+    theta1, omega1, theta2, omega2 = np.asarray(state).T
+    kinetic = (0.5 * (m1 + m2) * L1**2 * omega1**2 + 0.5 * m2 * L2**2 * omega2**2
+               + m2 * L1 * L2 * omega1 * omega2 * np.cos(theta1 - theta2))
+    potential = -(m1 + m2) * g * L1 * np.cos(theta1) - m2 * g * L2 * np.cos(theta2)
+    return kinetic + potential
+
+
+class PendulumEngine:
+    """Fixed-step RK4 for a batch of double pendulums held in an (M, 4) array.
+
+    Advances every row with one set of array operations per stage; the
+    stage buffers are allocated once per batch size.
+    """
+
+    def __init__(self, L1, L2, m1, m2, g, h):
+        self.params = (L1, L2, m1, m2, g)
+        self.h = h
+        self._stages = None
+
+    def _workspace(self, shape):
+        if self._stages is None or self._stages[0].shape != shape:
+            self._stages = [np.empty(shape) for _ in range(5)]
+        return self._stages
+
+    def step(self, state, steps=1):
+        """Advance state in place by steps RK4 steps of size h."""
+        k1, k2, k3, k4, tmp = self._workspace(state.shape)
+        h = self.h
+        for _ in range(steps):
+            pendulum_derivatives(state, *self.params, out=k1)
+            np.multiply(k1, 0.5 * h, out=tmp)
+            tmp += state
+            pendulum_derivatives(tmp, *self.params, out=k2)
+            np.multiply(k2, 0.5 * h, out=tmp)
+            tmp += state
+            pendulum_derivatives(tmp, *self.params, out=k3)
+            np.multiply(k3, h, out=tmp)
+            tmp += state
+            pendulum_derivatives(tmp, *self.params, out=k4)
+            k2 += k3
+            k2 *= 2
+            k1 += k2
+            k1 += k4
+            k1 *= h / 6
+            state += k1
+        return state
+
+
+class ChaosFan:
+    """A fan of nearly identical double pendulums advanced as one batch.
+
+    Row 0 is the unperturbed reference and row 1 a shadow held LYAPUNOV_D0
+    away from it, renormalized after every advance (Benettin's method) to
+    estimate the largest Lyapunov exponent. The remaining rows are the fan,
+    with θ₁ and θ₂ offset evenly across ±perturbation.
+
+    start() advances the fan on a background thread, never ahead of real
+    time, and publishes the drawn rows and statistics as latest after every
+    advance so the display can sample them at its own frame rate.
+    """
+
+    def __init__(self, params, theta1, theta2, count, perturbation, h):
+        self.engine = PendulumEngine(*params, h=h)
+        offsets = np.linspace(-perturbation, perturbation, count)
+        self.state = np.zeros((count + 2, 4))
+        self.state[:, 0] = theta1
+        self.state[:, 2] = theta2
+        self.state[2:, 0] += offsets
+        self.state[2:, 2] += offsets
+        self.state[1, 0] += LYAPUNOV_D0
+        self.t = 0.0
+        self.log_growth = 0.0
+        self.latest = None
+        self.stopped = threading.Event()
+        self.thread = None
+
+    @property
+    def fan(self):
+        return self.state[2:]
+
+    def advance(self, steps):
+        self.engine.step(self.state, steps)
+        self.t += steps * self.engine.h
+        separation = self.state[1] - self.state[0]
+        distance = np.sqrt(separation @ separation)
+        self.log_growth += np.log(distance / LYAPUNOV_D0)
+        self.state[1] = self.state[0] + separation * (LYAPUNOV_D0 / distance)
+
+    @property
+    def lyapunov(self):
+        """Largest Lyapunov exponent estimate in 1/s."""
+        return self.log_growth / self.t if self.t > 0 else 0.0
+
+    def spread(self):
+        """RMS angular distance of the fan from the reference, in radians."""
+        offsets = self.fan[:, 0::2] - self.state[0, 0::2]
+        offsets = (offsets + np.pi) % (2 * np.pi) - np.pi
+        return np.sqrt(np.mean(np.sum(offsets * offsets, axis=1)))
+
+    def publish(self, drawn):
+        """Snapshot (t, [θ₁, θ₂] of the drawn rows, spread, Lyapunov estimate)."""
+        self.latest = (self.t, self.fan[drawn, 0::2], self.spread(), self.lyapunov)
+
+    def start(self, drawn, steps=FAN_SUBSTEPS):
+        self.publish(drawn)
+        self.thread = threading.Thread(target=self._run, args=(drawn, steps), daemon=True)
+        self.thread.start()
+
+    def _run(self, drawn, steps):
+        start = time.perf_counter()
+        while not self.stopped.is_set():
+            self.advance(steps)
+            self.publish(drawn)
+            ahead = self.t - (time.perf_counter() - start)
+            if ahead > 0:
+                self.stopped.wait(ahead)
+
+    def stop(self):
+        """Stop the integrator thread."""
+        self.stopped.set()
+        if self.thread is not None:
+            self.thread.join(timeout=1.0)
+
+
+def flip_times(params, theta1, theta2, t_max=FLIP_T_MAX, h=FLIP_DT):
+    """Seconds until either arm first flips over the top, for pendulums released from rest.
+
+    theta1 and theta2 are flat arrays of starting angles in [-π, π). Cells
+    whose energy is below the lowest configuration with an arm upright can
+    never flip and are not integrated; the others drop out of the batch
+    once flipped. The result is inf where no flip happens within t_max.
+    """
+    L1, L2, m1, m2, g = params
+    times = np.full(len(theta1), np.inf)
+    state = np.zeros((len(theta1), 4))
+    state[:, 0] = theta1
+    state[:, 2] = theta2
+
+    # Energy needed to hold the upper arm (θ₂ = 0) or the lower arm (θ₁ = 0) upright
+    barrier = min((m1 + m2) * g * L1 - m2 * g * L2, m2 * g * L2 - (m1 + m2) * g * L1)
+    rows = np.flatnonzero(pendulum_energy(state, *params) >= barrier)
+    state = state[rows]
+    running = np.ones(len(rows), dtype=bool)
+
+    engine = PendulumEngine(*params, h=h)
+    for step in range(1, int(round(t_max / h)) + 1):
+        if not len(rows):
+            break
+        engine.step(state)
+        flipped = running & ((np.abs(state[:, 0]) > np.pi) | (np.abs(state[:, 2]) > np.pi))
+        if flipped.any():
+            times[rows[flipped]] = step * h
+            running &= ~flipped
+            # Flipped rows ride along until enough of them pile up
+            if running.sum() < FLIP_COMPACT_FRACTION * len(rows):
+                rows, state, running = rows[running], state[running], running[running]
+    return times
+
+
+def flip_cache_path(params, resolution):
+    """Cache file of the flip map for these parameters and grid size."""
+    key = (*(round(p, 6) for p in params), resolution, FLIP_T_MAX, FLIP_DT)
+    return os.path.join(FLIP_CACHE_DIR, hashlib.sha1(repr(key).encode()).hexdigest() + ".npy")
+
+
+class FlipMapJob:
+    """Progressively computes a flip-time map across a process pool.
+
+    The grid points θ = -π + 2πk/n are computed in passes of decreasing
+    stride, each adding the points the previous passes skipped. Until a
+    finer pass reaches it, every cell shows its nearest computed point,
+    so the map sharpens as results arrive. Finished maps are saved to
+    FLIP_CACHE_DIR and load instantly on a revisit.
+    """
+
+    def __init__(self, pool, params, resolution):
+        n = resolution
+        self.angles = -np.pi + 2 * np.pi * np.arange(n) / n
+        self.path = flip_cache_path(params, n)
+        self.pending = {}
+
+        # Flip times indexed [θ₂, θ₁], and the stride each cell's value came from
+        self.times = np.full((n, n), np.nan)
+        self.level = np.full((n, n), FLIP_STRIDES[0] * 2)
+        if os.path.exists(self.path):
+            self.times = np.load(self.path).astype(float)
+            self.level[:] = 1
+            return
+
+        covered = np.zeros((n, n), dtype=bool)
+        for stride in FLIP_STRIDES:
+            mask = np.zeros((n, n), dtype=bool)
+            mask[::stride, ::stride] = True
+            mask &= ~covered
+            covered |= mask
+            rows, cols = np.nonzero(mask)
+            for start in range(0, len(rows), FLIP_BATCH):
+                r, c = rows[start:start + FLIP_BATCH], cols[start:start + FLIP_BATCH]
+                future = pool.submit(flip_times, params, self.angles[c], self.angles[r])
+                self.pending[future] = (r, c, stride)
+
+    @property
+    def done(self):
+        return not self.pending
+
+    def poll(self):
+        """Collect finished batches; True if the map changed."""
+        finished = [f for f in self.pending if f.done()]
+        for future in finished:
+            rows, cols, stride = self.pending.pop(future)
+            times = future.result()
+            n = len(self.angles)
+            for dr in range(stride):
+                for dc in range(stride):
+                    r, c = rows + dr, cols + dc
+                    keep = (r < n) & (c < n)
+                    r, c, t = r[keep], c[keep], times[keep]
+                    finer = self.level[r, c] > stride
+                    self.times[r[finer], c[finer]] = t[finer]
+                    self.level[r[finer], c[finer]] = stride
+        if finished and self.done:
+            os.makedirs(FLIP_CACHE_DIR, exist_ok=True)
+            partial = self.path + ".part.npy"
+            np.save(partial, self.times.astype(np.float32))
+            os.replace(partial, self.path)
+        return bool(finished)
+
+    def cancel(self):
+        for future in self.pending:
+            future.cancel()
+        self.pending.clear()
+
+
+class FadingTrail:
+    """The most recent segments of a path, fading with age, as one LineCollection.
+
+    Segments live in a ring: each new point overwrites the oldest segment's
+    vertices and birth frame, and the color norm slides along with the
+    frame count, so adding a point costs the same however long the run.
+    """
+
+    def __init__(self, ax, color, length=TRAIL_SEGMENTS, **kwargs):
+        rgba = to_rgba(color)
+        ramp = np.tile(rgba, (256, 1))
+        ramp[:, 3] = np.linspace(0, rgba[3], 256)
+        cmap = ListedColormap(ramp).with_extremes(under=(0, 0, 0, 0), bad=(0, 0, 0, 0))
+        self.length = length
+        self.count = 0
+        self.last = None
+        self.collection = LineCollection(np.zeros((length, 2, 2)), cmap=cmap,
+                                         norm=Normalize(-length, 0), **kwargs)
+        self.collection.set_array(np.full(length, -np.inf))
+        self.paths = self.collection.get_paths()
+        self.births = self.collection.get_array()
+        ax.add_collection(self.collection, autolim=False)
+
+    def reset(self):
+        """Forget every point, leaving an empty trail."""
+        self.count = 0
+        self.last = None
+        self.births[:] = -np.inf
+
+    def append(self, x, y):
+        if self.last is not None:
+            slot = self.count % self.length
+            self.paths[slot].vertices = np.array([self.last, (x, y)])
+            self.births[slot] = self.count
+            self.collection.norm.vmin = self.count - self.length
+            self.collection.norm.vmax = self.count
+            self.count += 1
+        self.last = (x, y)
+
+
+class PoincareSection:
+    """Density of the Poincaré section θ₁ = 0, dθ₁/dt > 0, over a long run.
+
+    A batch of pendulums started near the chosen angles is integrated on a
+    background thread at up to POINCARE_SPEED times real time. After every
+    step the rows whose wrapped θ₁ crossed zero upwards are located on the
+    cubic Hermite interpolant of the step (from the states and derivatives
+    at both ends, so as accurate as RK4 itself), and their (θ₂, ω₂) binned
+    into a fixed histogram, so memory stays the same however many crossings
+    are collected.
+    """
+
+    def __init__(self, params, theta1, theta2, count=POINCARE_PENDULUMS, spread=POINCARE_SPREAD,
+                 bins=POINCARE_BINS, h=POINCARE_DT):
+        L1, L2, m1, m2, g = params
+        rng = np.random.default_rng(0)
+        self.engine = PendulumEngine(*params, h=h)
+        self.state = np.zeros((count, 4))
+        self.state[:, 0] = theta1 + rng.uniform(-spread, spread, count)
+        self.state[:, 2] = theta2 + rng.uniform(-spread, spread, count)
+
+        # Energy bounds |ω₂|: the kinetic energy can't exceed E - V_min, and
+        # is at least half the smallest eigenvalue of the mass matrix times |ω|²
+        a, b, d = (m1 + m2) * L1**2, m2 * L1 * L2, m2 * L2**2
+        smallest = (a + d) / 2 - np.hypot((a - d) / 2, b)
+        headroom = pendulum_energy(self.state, *params).max() + (m1 + m2) * g * L1 + m2 * g * L2
+        self.omega_max = np.sqrt(2 * headroom / smallest)
+
+        self.bins = bins
+        self.histogram = np.zeros((bins, bins), dtype=np.int64)  # [ω₂ bin, θ₂ bin]
+        self.crossings = 0
+        self.t = 0.0
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.thread = None
+
+    def step(self):
+        """Take one step and return the (θ₂, ω₂) of the crossings made during it."""
+        previous = self.state.copy()
+        self.engine.step(self.state)
+        self.t += self.engine.h
+        before = (previous[:, 0] + np.pi) % (2 * np.pi) - np.pi
+        after = before + (self.state[:, 0] - previous[:, 0])
+        rows = np.flatnonzero((before < 0) & (after >= 0))
+        if not len(rows):
+            return np.empty((0, 2))
+
+        # Newton iteration for the root of θ₁ on the step's Hermite cubic,
+        # starting from the linear interpolation
+        start, end = previous[rows], self.state[rows]
+        start[:, 0], end[:, 0] = before[rows], after[rows]
+        slopes = [pendulum_derivatives(x, *self.engine.params, out=np.empty_like(x)) for x in (start, end)]
+        s = -start[:, 0] / (end[:, 0] - start[:, 0])
+        for _ in range(POINCARE_NEWTON_STEPS):
+            value, slope = hermite(s, start[:, 0], end[:, 0], slopes[0][:, 0], slopes[1][:, 0], self.engine.h)
+            s = np.clip(s - value / slope, 0, 1)
+        return hermite(s[:, np.newaxis], start[:, 2:], end[:, 2:], slopes[0][:, 2:], slopes[1][:, 2:],
+                       self.engine.h)[0]
+
+    def advance(self, steps):
+        """Integrate steps steps and bin the section crossings made along the way."""
+        points = np.concatenate([self.step() for _ in range(steps)])
+        if not len(points):
+            return
+        theta2 = (points[:, 0] + np.pi) % (2 * np.pi) - np.pi
+        column = np.clip(((theta2 + np.pi) / (2 * np.pi) * self.bins).astype(int), 0, self.bins - 1)
+        row = np.clip(((points[:, 1] + self.omega_max) / (2 * self.omega_max) * self.bins).astype(int),
+                      0, self.bins - 1)
+        counts = np.bincount(row * self.bins + column, minlength=self.bins * self.bins)
+        with self.lock:
+            self.histogram += counts.reshape(self.bins, self.bins)
+            self.crossings += len(points)
+
+    def snapshot(self):
+        """Return (histogram copy, crossings, simulated seconds per pendulum)."""
+        with self.lock:
+            return self.histogram.copy(), self.crossings, self.t
+
+    def start(self):
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        start = time.perf_counter()
+        while not self.stopped.is_set():
+            self.advance(POINCARE_CHUNK_STEPS)
+            ahead = self.t / POINCARE_SPEED - (time.perf_counter() - start)
+            if ahead > 0:
+                self.stopped.wait(ahead)
+
+    def stop(self):
+        """Stop the integrator thread."""
+        self.stopped.set()
+        if self.thread is not None:
+            self.thread.join(timeout=1.0)
+
+
+def canvas_callback_ids(canvas):
+    """Ids of every callback currently connected to a canvas's events."""
+    return {cid for cids in canvas.callbacks.callbacks.values() for cid in cids}
+
+
+def style_axes(ax, title, xlabel, ylabel):
+    """Apply the dark theme styling shared by all the plots."""
+    ax.set_facecolor('#E5E5E5')  # Light grey background
+    ax.set_title(title, color='white')
+    ax.set_xlabel(xlabel, color='white')
+    ax.set_ylabel(ylabel, color='white')
+    ax.grid(True, color='#CCCCCC')
+    ax.tick_params(colors='white')
+    for spine in ax.spines.values():
+        spine.set_color('white')
+
+
+class PendulumStream:
+    """Integrates the double pendulum ahead of the animation on a background thread.
+
+    Frames (t, θ₁, ω₁, θ₂, ω₂) spaced dt apart are computed a chunk at a
+    time and handed to the animation through a bounded queue, so the
+    integrator never runs more than QUEUE_FRAMES ahead and a run can go on
+    indefinitely.
+    """
+
+    def __init__(self, y0, params, dt=FRAME_DT):
+        self.queue = queue.Queue(maxsize=QUEUE_FRAMES)
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self._run, args=(y0, params, dt), daemon=True)
+        self.thread.start()
+
+    def _put(self, frame):
+        """Block until the frame fits in the queue; False once stopped."""
+        while not self.stopped.is_set():
+            try:
+                self.queue.put(frame, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _run(self, y0, params, dt):
+        engine = PendulumEngine(*params, h=dt / RK4_SUBSTEPS)
+        state = np.array([y0], dtype=float)
+        frame = 0
+        if not self._put((0.0, *state[0])):
+            return
+        n = FIRST_CHUNK_FRAMES
+        while not self.stopped.is_set():
+            chunk = np.empty((n, 4))
+            for i in range(n):
+                chunk[i] = engine.step(state, RK4_SUBSTEPS)[0]
+            for row in chunk:
+                frame += 1
+                if not self._put((frame * dt, *row)):
+                    return
+            n = CHUNK_FRAMES
+
+    def get(self):
+        """Return the next frame, or None if the integrator hasn't produced it yet."""
+        try:
+            return self.queue.get_nowait()
+        except queue.Empty:
+            return None
+
+    def stop(self):
+        """Stop the integrator thread."""
+        self.stopped.set()
+        self.thread.join(timeout=1.0)
+
+
+def benchmark_integrators(duration=100.0, theta1=2.0, theta2=2.5, batch=1000):
+    """Compare energy drift and throughput of the RK4 engine against solve_ivp."""
+    params = (1.0, 1.0, 1.0, 1.0, 9.81)
+    y0 = np.array([theta1, 0.0, theta2, 0.0])
+    t_eval = np.arange(0.0, duration, FRAME_DT)
+    e0 = pendulum_energy(y0[np.newaxis], *params)[0]
+
+    def run_solve_ivp(**tolerances):
+        sol = solve_ivp(double_pendulum, [0, t_eval[-1]], y0, args=params, method='RK45',
+                        t_eval=t_eval, **tolerances)
+        return sol.y.T[:, np.newaxis, :]
+
+    def run_rk4(substeps, m):
+        engine = PendulumEngine(*params, h=FRAME_DT / substeps)
+        state = np.tile(y0, (m, 1))
+        frames = np.empty((len(t_eval), m, 4))
+        frames[0] = state
+        for i in range(1, len(t_eval)):
+            frames[i] = engine.step(state, substeps)
+        return frames
+
+    cases = [
+        ("solve_ivp RK45, default tolerances", 1, lambda: run_solve_ivp()),
+        ("solve_ivp RK45, rtol=atol=1e-9", 1, lambda: run_solve_ivp(rtol=1e-9, atol=1e-9)),
+        (f"RK4, h={FRAME_DT / RK4_SUBSTEPS:g}", 1, lambda: run_rk4(RK4_SUBSTEPS, 1)),
+        (f"RK4, h={FRAME_DT / 2:g}", 1, lambda: run_rk4(2, 1)),
+        (f"RK4, h={FRAME_DT / RK4_SUBSTEPS:g}, M={batch}", batch, lambda: run_rk4(RK4_SUBSTEPS, batch)),
+        (f"RK4, h={FRAME_DT / 2:g}, M={batch}", batch, lambda: run_rk4(2, batch)),
+    ]
+    print(f"θ₁={theta1}, θ₂={theta2}, {duration:g} s of motion")
+    for name, m, run in cases:
+        start = time.perf_counter()
+        frames = run()
+        elapsed = time.perf_counter() - start
+        drift = np.max(np.abs(pendulum_energy(frames[:, 0], *params) - e0)) / abs(e0)
+        print(f"  {name:<38} {elapsed * 1000:9.1f} ms  {m * frames.shape[0] * FRAME_DT / elapsed:12.0f} "
+              f"pendulum-s/s   max |ΔE/E| {drift:.1e}")
+
+
 class DoublePendulumGUI:
     def __init__(self, root):
         self.root = root
@@ -38,6 +637,7 @@ class DoublePendulumGUI:
         
         # Configure root window
         self.root.geometry("1200x800")
+        self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
         
         # Create main frame
         main_frame = ctk.CTkFrame(root)
@@ -87,6 +687,11 @@ Chaos: Small changes in initial conditions can lead to drastically different out
         self.theta1_var = tk.DoubleVar(value=90)
         self.theta2_var = tk.DoubleVar(value=90)
         self.g_var = tk.DoubleVar(value=9.8)
+        self.mode_var = tk.StringVar(value=MODES[0])
+        self.fan_count_var = tk.IntVar(value=10000)
+        self.fan_perturbation_var = tk.DoubleVar(value=-6)
+        self.fan_drawn_var = tk.IntVar(value=FAN_DRAW_DEFAULT)
+        self.flip_resolution_var = tk.StringVar(value=FLIP_RESOLUTIONS[1])
         
         # Add sliders with modern styling
         self.create_slider(controls_frame, "L₁ (m):", self.L1_var, 0.1, 2.0, 0)
@@ -96,23 +701,47 @@ Chaos: Small changes in initial conditions can lead to drastically different out
         self.create_slider(controls_frame, "θ₁ (°):", self.theta1_var, -180, 180, 4)
         self.create_slider(controls_frame, "θ₂ (°):", self.theta2_var, -180, 180, 5)
         self.create_slider(controls_frame, "g (m/s²):", self.g_var, 1.0, 20.0, 6)
+
+        # Single pendulum, a fan of perturbed copies, or the flip map
+        ctk.CTkOptionMenu(controls_frame, variable=self.mode_var, values=MODES).grid(
+            row=7, column=0, columnspan=2, pady=5)
+        self.create_slider(controls_frame, "Fan size:", self.fan_count_var, 1000, 100000, 8,
+                           fmt="{:.0f}", steps=99)
+        self.create_slider(controls_frame, "log₁₀ δθ (rad):", self.fan_perturbation_var, -12, -1, 9,
+                           steps=22)
+        self.create_slider(controls_frame, "Fan drawn:", self.fan_drawn_var, 100, FAN_DRAW_MAX, 10,
+                           fmt="{:.0f}", steps=99)
+        flip_frame = ctk.CTkFrame(controls_frame)
+        flip_frame.grid(row=11, column=0, columnspan=2, sticky="ew", padx=5, pady=2)
+        ctk.CTkLabel(flip_frame, text="Flip map grid:", font=ctk.CTkFont(size=12)).grid(
+            row=0, column=0, sticky="w")
+        ctk.CTkOptionMenu(flip_frame, variable=self.flip_resolution_var, values=FLIP_RESOLUTIONS,
+                          width=100).grid(row=0, column=1, padx=5)
         
         # Add parameter explanations with modern styling
         explanation_text = ctk.CTkTextbox(controls_frame, height=150, wrap="word")
-        explanation_text.grid(row=8, column=0, columnspan=2, sticky="ew", padx=5, pady=5)
+        explanation_text.grid(row=14, column=0, columnspan=2, sticky="ew", padx=5, pady=5)
         explanation_text.insert("1.0", """Parameter Explanations:
 
 L₁, L₂: Lengths of the pendulums (0.1–2.0 m)
 m₁, m₂: Masses of the bobs (0.1–5.0 kg)
 θ₁, θ₂: Initial angles (-180° to 180°)
-g: Gravitational acceleration (1.0–20.0 m/s²)""")
+g: Gravitational acceleration (1.0–20.0 m/s²)
+Chaos fan: that many pendulums with θ₁ and θ₂ offset by up to ±δθ; the statistics use all of them, but only Fan drawn are drawn
+Flip map: time until either arm flips, for every starting θ₁, θ₂; click a point to watch it
+Poincaré section: where pendulums started near θ₁, θ₂ cross θ₁ = 0 moving forward, accumulated over a long run""")
         explanation_text.configure(state="disabled")
         
         # Add Start button with modern styling
         self.start_button = ctk.CTkButton(controls_frame, text="Start Simulation",
                                        command=self.start_simulation,
                                        font=ctk.CTkFont(size=14, weight="bold"))
-        self.start_button.grid(row=7, column=0, columnspan=2, pady=10)
+        self.start_button.grid(row=12, column=0, columnspan=2, pady=10)
+
+        # Divergence statistics of the chaos fan, flip map progress
+        self.stats_var = tk.StringVar()
+        ctk.CTkLabel(controls_frame, textvariable=self.stats_var, justify="left").grid(
+            row=13, column=0, columnspan=2, padx=5, pady=5)
         
         # Create plot frame
         self.plot_frame = ctk.CTkFrame(content_frame)
@@ -121,15 +750,28 @@ g: Gravitational acceleration (1.0–20.0 m/s²)""")
         
         # Initialize animation variables
         self.anim = None
-        self.canvas = None
+        self.callbacks_before_anim = set()
+        self.stream = None
+        self.flip_pool = None
+        self.flip_job = None
+        self.flip_poll = None
         
         # Configure matplotlib style for dark mode
         plt.style.use('dark_background')
+
+        # One figure and canvas for the whole session; each mode draws into
+        # its own axes, built on first use and hidden while another mode shows
+        self.fig = plt.Figure(figsize=(12, 12))
+        self.fig.patch.set_facecolor('#242424')
+        self.canvas = FigureCanvasTkAgg(self.fig, master=self.plot_frame)
+        self.canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=1)
+        self.canvas.mpl_connect('button_press_event', self.on_click)
+        self.views = {}
         
         # Start initial simulation
         self.start_simulation()
     
-    def create_slider(self, parent, label, variable, min_val, max_val, row):
+    def create_slider(self, parent, label, variable, min_val, max_val, row, fmt="{:.1f}", steps=None):
         # Create frame for this row
         frame = ctk.CTkFrame(parent)
         frame.grid(row=row, column=0, columnspan=2, sticky="ew", padx=5, pady=2)
@@ -139,11 +781,11 @@ g: Gravitational acceleration (1.0–20.0 m/s²)""")
         
         # Add slider
         slider = ctk.CTkSlider(frame, from_=min_val, to=max_val, variable=variable,
-                            width=200, height=16)
+                            width=200, height=16, number_of_steps=steps)
         slider.grid(row=0, column=1, sticky="ew", padx=5)
         
         # Add value label
-        value_label = ctk.CTkLabel(frame, text=f"{variable.get():.1f}",
+        value_label = ctk.CTkLabel(frame, text=fmt.format(variable.get()),
                                 font=ctk.CTkFont(size=12))
         value_label.grid(row=0, column=2, sticky="e", padx=(0, 5))
         
@@ -152,29 +794,15 @@ g: Gravitational acceleration (1.0–20.0 m/s²)""")
         
         # Create update function for this specific slider
         def update_label(*args):
-            value_label.configure(text=f"{variable.get():.1f}")
+            value_label.configure(text=fmt.format(variable.get()))
         
         # Bind the update function to the variable
         variable.trace_add("write", update_label)
         
         return slider
     
-    def double_pendulum(self, t, y, L1, L2, m1, m2, g):
-        """Compute derivatives for the double pendulum system using standard equations."""
-        theta1, z1, theta2, z2 = y
-        delta = theta1 - theta2
-        dtheta1_dt = z1
-        dtheta2_dt = z2
-        dz1_dt = (-g*(2*m1 + m2)*np.sin(theta1) - m2*g*np.sin(theta1 - 2*theta2) - \
-                  2*np.sin(delta)*m2*(z2**2 * L2 + z1**2 * L1 * np.cos(delta))) / (L1*(2*m1 + m2 - m2*np.cos(2*delta)))
-        dz2_dt = (2*np.sin(delta)*(z1**2 * L1 * (m1 + m2) + g*(m1 + m2)*np.cos(theta1) + \
-                  z2**2 * L2 * m2 * np.cos(delta))) / (L2*(2*m1 + m2 - m2*np.cos(2*delta)))
-        return [dtheta1_dt, dz1_dt, dtheta2_dt, dz2_dt]
-    
     def start_simulation(self):
-        # Clear previous plot if it exists
-        for widget in self.plot_frame.winfo_children():
-            widget.destroy()
+        self.stop_run()
         
         # Get parameters from sliders
         L1 = self.L1_var.get()
@@ -184,99 +812,393 @@ g: Gravitational acceleration (1.0–20.0 m/s²)""")
         theta1 = np.radians(self.theta1_var.get())
         theta2 = np.radians(self.theta2_var.get())
         g = self.g_var.get()
-        
-        # Set up simulation parameters
-        dt = 0.05
-        t_max = 30.0
-        t = np.arange(0, t_max, dt)
-        
-        # Initial conditions
-        y0 = [theta1, 0, theta2, 0]
-        
-        # Solve the differential equations
-        sol = solve_ivp(self.double_pendulum, [0, t_max], y0, 
-                       args=(L1, L2, m1, m2, g), method='RK45', t_eval=t)
-        
-        theta1_vals = sol.y[0]
-        theta2_vals = sol.y[2]
-        
-        # Calculate positions
-        x1 = L1 * np.sin(theta1_vals)
-        y1 = -L1 * np.cos(theta1_vals)
-        x2 = x1 + L2 * np.sin(theta2_vals)
-        y2 = y1 - L2 * np.cos(theta2_vals)
-        
-        # Create figure and animation
-        fig = plt.Figure(figsize=(12, 12))
-        gs = fig.add_gridspec(2, 2)
-        
-        # Set figure background to match dark theme
-        fig.patch.set_facecolor('#242424')
+
+        self.stats_var.set("")
+        if self.mode_var.get() == MODES[1]:
+            self.start_fan((L1, L2, m1, m2, g), theta1, theta2)
+        elif self.mode_var.get() == MODES[2]:
+            self.start_flip_map((L1, L2, m1, m2, g))
+        elif self.mode_var.get() == MODES[3]:
+            self.start_poincare((L1, L2, m1, m2, g), theta1, theta2)
+        else:
+            self.start_single((L1, L2, m1, m2, g), theta1, theta2)
+
+    def stop_run(self):
+        """Stop the animation, integrator and flip map job of the current run."""
+        if self.anim is not None:
+            # Pause stops the timer and un-animates the blitted artists. The
+            # draw, resize and close handlers the animation connected would
+            # otherwise outlive it on the shared canvas and restart its timer
+            if self.anim.event_source is not None:
+                self.anim.pause()
+            for cid in canvas_callback_ids(self.canvas) - self.callbacks_before_anim:
+                self.canvas.mpl_disconnect(cid)
+            self.anim = None
+        if self.stream is not None:
+            self.stream.stop()
+            self.stream = None
+        if self.flip_job is not None:
+            self.flip_job.cancel()
+            self.flip_job = None
+        if self.flip_poll is not None:
+            self.root.after_cancel(self.flip_poll)
+            self.flip_poll = None
+
+    def show_view(self, mode):
+        """Build the mode's view on first use and make it the only visible one."""
+        if mode not in self.views:
+            build = {MODES[0]: self.build_single_view, MODES[1]: self.build_fan_view,
+                     MODES[2]: self.build_flip_view, MODES[3]: self.build_poincare_view}[mode]
+            self.views[mode] = build()
+        for name, view in self.views.items():
+            for ax in view.axes:
+                ax.set_visible(name == mode)
+        return self.views[mode]
+
+    def animate(self, func, interval):
+        """Run func as the open-ended, blitted animation of the current view."""
+        # Any canvas callback not connected before this point is the animation's
+        self.callbacks_before_anim = canvas_callback_ids(self.canvas)
+        self.anim = FuncAnimation(self.fig, func, frames=None, interval=interval,
+                                  blit=True, cache_frame_data=False)
+        # The animation already asked for a redraw; this one coalesces with it
+        self.canvas.draw_idle()
+
+    def build_single_view(self):
+        gs = self.fig.add_gridspec(2, 2, left=0.07, right=0.97, bottom=0.06, top=0.95,
+                                   wspace=0.25, hspace=0.3)
         
         # Main animation plot
-        ax_main = fig.add_subplot(gs[:, 0])
-        ax_main.set_facecolor('#E5E5E5')  # Light grey background
+        ax_main = self.fig.add_subplot(gs[:, 0])
+        style_axes(ax_main, 'Double Pendulum Motion', 'X Position (m)', 'Y Position (m)')
         ax_main.set_xlim(-2.5, 2.5)
         ax_main.set_ylim(-2.5, 2.5)
         ax_main.set_aspect('equal')
-        ax_main.set_title('Double Pendulum Motion', color='white')
-        ax_main.grid(True, color='#CCCCCC')
-        ax_main.set_xlabel('X Position (m)', color='white')
-        ax_main.set_ylabel('Y Position (m)', color='white')
-        ax_main.tick_params(colors='white')
-        for spine in ax_main.spines.values():
-            spine.set_color('white')
         
         line, = ax_main.plot([], [], 'o-', lw=2, color='#1f77b4', label='Pendulum')
-        trace, = ax_main.plot([], [], '-', lw=1, alpha=0.5, color='#ff7f0e', label='Path')
+        trace = FadingTrail(ax_main, '#ff7f0e', linewidths=1)
+        ax_main.plot([], [], '-', lw=1, color='#ff7f0e', label='Path')  # legend entry for the trail
         ax_main.legend(facecolor='#242424', labelcolor='white')
         
         # Phase space plot for first pendulum
-        ax_phase1 = fig.add_subplot(gs[0, 1])
-        ax_phase1.set_facecolor('#E5E5E5')  # Light grey background
-        ax_phase1.plot(theta1_vals, sol.y[1], color='#1f77b4', lw=1)
-        ax_phase1.set_title('Phase Space: θ₁ vs dθ₁/dt', color='white')
-        ax_phase1.set_xlabel('θ₁ (rad)', color='white')
-        ax_phase1.set_ylabel('dθ₁/dt (rad/s)', color='white')
-        ax_phase1.grid(True, color='#CCCCCC')
-        ax_phase1.tick_params(colors='white')
-        for spine in ax_phase1.spines.values():
-            spine.set_color('white')
+        ax_phase1 = self.fig.add_subplot(gs[0, 1])
+        style_axes(ax_phase1, 'Phase Space: θ₁ vs dθ₁/dt', 'θ₁ (rad)', 'dθ₁/dt (rad/s)')
+        phase1 = FadingTrail(ax_phase1, '#1f77b4', linewidths=1)
+        point1, = ax_phase1.plot([], [], 'o', color='#1f77b4')
         
         # Phase space plot for second pendulum
-        ax_phase2 = fig.add_subplot(gs[1, 1])
-        ax_phase2.set_facecolor('#E5E5E5')  # Light grey background
-        ax_phase2.plot(theta2_vals, sol.y[3], color='#2ca02c', lw=1)
-        ax_phase2.set_title('Phase Space: θ₂ vs dθ₂/dt', color='white')
-        ax_phase2.set_xlabel('θ₂ (rad)', color='white')
-        ax_phase2.set_ylabel('dθ₂/dt (rad/s)', color='white')
-        ax_phase2.grid(True, color='#CCCCCC')
-        ax_phase2.tick_params(colors='white')
-        for spine in ax_phase2.spines.values():
-            spine.set_color('white')
-        
-        # Adjust layout
-        fig.tight_layout()
-        
-        # Create canvas
-        self.canvas = FigureCanvasTkAgg(fig, master=self.plot_frame)
-        self.canvas.draw()
-        self.canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=1)
-        
-        # Animation update function
+        ax_phase2 = self.fig.add_subplot(gs[1, 1])
+        style_axes(ax_phase2, 'Phase Space: θ₂ vs dθ₂/dt', 'θ₂ (rad)', 'dθ₂/dt (rad/s)')
+        phase2 = FadingTrail(ax_phase2, '#2ca02c', linewidths=1)
+        point2, = ax_phase2.plot([], [], 'o', color='#2ca02c')
+
+        return SimpleNamespace(axes=(ax_main, ax_phase1, ax_phase2), line=line, trace=trace,
+                               phase1=phase1, phase2=phase2, point1=point1, point2=point2)
+
+    def start_single(self, params, theta1, theta2):
+        """Animate one pendulum streamed from the background integrator."""
+        L1, L2 = params[:2]
+        view = self.show_view(MODES[0])
+        _, ax_phase1, ax_phase2 = view.axes
+        for trail in (view.trace, view.phase1, view.phase2):
+            trail.reset()
+        for ax in (ax_phase1, ax_phase2):
+            ax.set_xlim(-np.pi, np.pi)
+            ax.set_ylim(-5, 5)
+
+        # Initial conditions
+        y0 = [theta1, 0, theta2, 0]
+
+        # Integrate ahead of the animation on a background thread
+        self.stream = PendulumStream(y0, params)
+
+        # Animation update function; the work per frame doesn't grow with the run
+        artists = (view.line, view.trace.collection, view.phase1.collection, view.phase2.collection,
+                   view.point1, view.point2)
+
         def animate(frame):
-            line.set_data([0, x1[frame], x2[frame]], [0, y1[frame], y2[frame]])
-            trace.set_data(x2[:frame], y2[:frame])
-            return line, trace
-        
-        # Create animation
-        self.anim = FuncAnimation(fig, animate, frames=len(t), 
-                                interval=dt*1000, blit=True)
-        
-        # Update canvas
-        self.canvas.draw()
+            state = self.stream.get()
+            if state is None:
+                # The integrator is behind; hold the current frame
+                return artists
+            _, theta1, omega1, theta2, omega2 = state
+            x1, y1 = L1 * np.sin(theta1), -L1 * np.cos(theta1)
+            x2, y2 = x1 + L2 * np.sin(theta2), y1 - L2 * np.cos(theta2)
+
+            view.line.set_data([0, x1, x2], [0, y1, y2])
+            view.trace.append(x2, y2)
+            view.phase1.append(theta1, omega1)
+            view.phase2.append(theta2, omega2)
+            view.point1.set_data([theta1], [omega1])
+            view.point2.set_data([theta2], [omega2])
+
+            # Grow the phase plot limits when the motion leaves them
+            rescaled = False
+            for ax, angle, rate in ((ax_phase1, theta1, omega1), (ax_phase2, theta2, omega2)):
+                (x_lo, x_hi), (y_lo, y_hi) = ax.get_xlim(), ax.get_ylim()
+                if not (x_lo <= angle <= x_hi and y_lo <= rate <= y_hi):
+                    ax.set_xlim(min(x_lo, 1.5 * angle), max(x_hi, 1.5 * angle))
+                    ax.set_ylim(min(y_lo, 1.5 * rate), max(y_hi, 1.5 * rate))
+                    rescaled = True
+            if rescaled:
+                self.canvas.draw()
+            return artists
+
+        # Create an open-ended animation fed by the integrator
+        self.animate(animate, FRAME_DT * 1000)
+
+    def build_fan_view(self):
+        gs = self.fig.add_gridspec(2, 2, left=0.07, right=0.97, bottom=0.06, top=0.95,
+                                   wspace=0.25, hspace=0.3)
+
+        # The fan, colored by perturbation
+        ax_main = self.fig.add_subplot(gs[:, 0])
+        style_axes(ax_main, 'Chaos Fan', 'X Position (m)', 'Y Position (m)')
+        ax_main.set_xlim(-2.5, 2.5)
+        ax_main.set_ylim(-2.5, 2.5)
+        ax_main.set_aspect('equal')
+        lines = LineCollection([], linewidths=1, antialiaseds=False)
+        ax_main.add_collection(lines, autolim=False)
+
+        # Divergence statistics over time
+        ax_spread = self.fig.add_subplot(gs[0, 1])
+        style_axes(ax_spread, 'Spread of the Fan', 'Time (s)', 'RMS |Δθ| (rad)')
+        ax_spread.set_yscale('log')
+        spread_line, = ax_spread.plot([], [], color='#ff7f0e', lw=1)
+
+        ax_lyapunov = self.fig.add_subplot(gs[1, 1])
+        style_axes(ax_lyapunov, 'Largest Lyapunov Exponent', 'Time (s)', 'λ estimate (1/s)')
+        lyapunov_line, = ax_lyapunov.plot([], [], color='#2ca02c', lw=1)
+
+        return SimpleNamespace(axes=(ax_main, ax_spread, ax_lyapunov), lines=lines,
+                               spread_line=spread_line, lyapunov_line=lyapunov_line)
+
+    def start_fan(self, params, theta1, theta2):
+        """Animate a fan of perturbed pendulums diverging from one another."""
+        L1, L2 = params[:2]
+        count = int(self.fan_count_var.get())
+        fan = ChaosFan(params, theta1, theta2, count, 10 ** self.fan_perturbation_var.get(),
+                       h=1 / (FAN_FPS * FAN_SUBSTEPS))
+        drawn = np.unique(np.linspace(0, count - 1, min(count, int(self.fan_drawn_var.get()))).astype(int))
+        segments = np.zeros((len(drawn), 3, 2))
+        history = deque(maxlen=int(FAN_WINDOW * FAN_FPS))
+
+        view = self.show_view(MODES[1])
+        ax_main, ax_spread, ax_lyapunov = view.axes
+        ax_main.set_title(f'Chaos Fan: {count} Pendulums, {len(drawn)} Drawn', color='white')
+        colors = plt.cm.plasma(np.linspace(0, 1, len(drawn)))
+        colors[:, 3] = min(1.0, 50 / len(drawn)) ** 0.5
+        view.lines.set_segments(segments)
+        view.lines.set_color(colors)
+        view.spread_line.set_data([], [])
+        view.lyapunov_line.set_data([], [])
+        for ax in (ax_spread, ax_lyapunov):
+            ax.set_xlim(0, FAN_WINDOW)
+        ax_spread.set_ylim(10 ** self.fan_perturbation_var.get() / 10, 10)
+        ax_lyapunov.set_ylim(-1, 5)
+
+        # Large fans integrate slower than real time; the display keeps its
+        # frame rate and shows the latest state
+        self.stream = fan
+        fan.start(drawn)
+        started = time.perf_counter()
+
+        def animate(frame):
+            t, angles, spread, lyapunov = fan.latest
+            theta1, theta2 = angles[:, 0], angles[:, 1]
+            segments[:, 1, 0] = L1 * np.sin(theta1)
+            segments[:, 1, 1] = -L1 * np.cos(theta1)
+            segments[:, 2, 0] = segments[:, 1, 0] + L2 * np.sin(theta2)
+            segments[:, 2, 1] = segments[:, 1, 1] - L2 * np.cos(theta2)
+            view.lines.set_segments(segments)
+
+            if not history or history[-1][0] != t:
+                history.append((t, spread, lyapunov))
+            series = np.array(history)
+            view.spread_line.set_data(series[:, 0], series[:, 1])
+            view.lyapunov_line.set_data(series[:, 0], series[:, 2])
+            speed = t / max(time.perf_counter() - started, 1e-9)
+            self.stats_var.set(f"t = {t:.1f} s ({min(speed, 1.0):.2f}× real time)\n"
+                               f"Spread = {spread:.2e} rad\n"
+                               f"λ ≈ {lyapunov:.2f} 1/s")
+
+            # Scroll the time axes and grow the exponent axis when needed
+            rescaled = False
+            if t > ax_spread.get_xlim()[1]:
+                for ax in (ax_spread, ax_lyapunov):
+                    ax.set_xlim(t - FAN_WINDOW / 2, t + FAN_WINDOW / 2)
+                rescaled = True
+            lo, hi = ax_lyapunov.get_ylim()
+            if not lo <= lyapunov <= hi:
+                ax_lyapunov.set_ylim(min(lo, 1.5 * lyapunov), max(hi, 1.5 * lyapunov))
+                rescaled = True
+            if rescaled:
+                self.canvas.draw()
+            return view.lines, view.spread_line, view.lyapunov_line
+
+        self.animate(animate, 1000 / FAN_FPS)
+
+    def build_flip_view(self):
+        gs = self.fig.add_gridspec(1, 2, width_ratios=(24, 1), left=0.07, right=0.93, bottom=0.08,
+                                   top=0.94, wspace=0.05)
+        ax = self.fig.add_subplot(gs[0, 0])
+        style_axes(ax, 'Time Until Either Arm Flips (white: no flip within '
+                   f'{FLIP_T_MAX:g} s) - click to watch', 'θ₁ (°)', 'θ₂ (°)')
+        ax.grid(False)
+        cmap = plt.get_cmap('magma').with_extremes(bad='white')
+        image = ax.imshow(np.ma.masked_all((2, 2)), origin='lower', cmap=cmap,
+                          norm=LogNorm(vmin=0.1, vmax=FLIP_T_MAX), interpolation='nearest')
+        cax = self.fig.add_subplot(gs[0, 1])
+        colorbar = self.fig.colorbar(image, cax=cax)
+        colorbar.set_label('Flip time (s)', color='white')
+        cax.tick_params(colors='white')
+        return SimpleNamespace(axes=(ax, cax), ax=ax, image=image)
+
+    def start_flip_map(self, params):
+        """Show the flip-time map, computing whatever isn't cached."""
+        # Round to the slider precision so revisits hit the cache
+        params = tuple(round(p, 2) for p in params)
+        if self.flip_pool is None:
+            self.flip_pool = ProcessPoolExecutor()
+        resolution = int(self.flip_resolution_var.get())
+        self.flip_job = FlipMapJob(self.flip_pool, params, resolution)
+
+        view = self.show_view(MODES[2])
+        half = 180 / resolution
+        view.image.set_data(np.ma.masked_invalid(self.flip_job.times))
+        view.image.set_extent((-180 - half, 180 - half, -180 - half, 180 - half))
+        self.canvas.draw_idle()
+        started = time.perf_counter()
+
+        def poll():
+            job = self.flip_job
+            if job.poll():
+                view.image.set_data(np.ma.masked_invalid(job.times))
+                self.canvas.draw_idle()
+            coarsest = job.level.max()
+            if job.done:
+                self.stats_var.set(f"Flip map {resolution}×{resolution} ready "
+                                   f"({time.perf_counter() - started:.1f} s)")
+                self.flip_poll = None
+            else:
+                shown = f"1/{coarsest}" if coarsest <= FLIP_STRIDES[0] else "no"
+                self.stats_var.set(f"Flip map: {len(job.pending)} batches left, "
+                                   f"{shown} resolution everywhere")
+                self.flip_poll = self.root.after(FLIP_POLL_MS, poll)
+
+        poll()
+
+    def build_poincare_view(self):
+        gs = self.fig.add_gridspec(1, 2, width_ratios=(24, 1), left=0.07, right=0.93, bottom=0.08,
+                                   top=0.94, wspace=0.05)
+        ax = self.fig.add_subplot(gs[0, 0])
+        style_axes(ax, 'Poincaré Section θ₁ = 0, dθ₁/dt > 0', 'θ₂ (rad)', 'dθ₂/dt (rad/s)')
+        ax.grid(False)
+        # The histogram is colored through a byte lookup table and handed over
+        # as RGBA, which halves the cost of drawing it; the colorbar therefore
+        # shows density relative to the current peak
+        image = ax.imshow(np.zeros((2, 2, 4), dtype=np.uint8), origin='lower', aspect='auto',
+                          interpolation='nearest')
+        cmap = plt.get_cmap('inferno')
+        cax = self.fig.add_subplot(gs[0, 1])
+        colorbar = self.fig.colorbar(plt.cm.ScalarMappable(Normalize(0, 1), cmap), cax=cax)
+        colorbar.set_label('log(1 + crossings), relative to peak', color='white')
+        cax.tick_params(colors='white')
+        return SimpleNamespace(axes=(ax, cax), ax=ax, image=image,
+                               lut=cmap(np.linspace(0, 1, 256), bytes=True))
+
+    def start_poincare(self, params, theta1, theta2):
+        """Accumulate the Poincaré section of an ensemble around the chosen angles."""
+        section = PoincareSection(params, theta1, theta2)
+        view = self.show_view(MODES[3])
+        view.image.set_data(view.lut[np.zeros((section.bins, section.bins), dtype=np.uint8)])
+        view.image.set_extent((-np.pi, np.pi, -section.omega_max, section.omega_max))
+
+        self.stream = section
+        section.start()
+        started = time.perf_counter()
+
+        def animate(frame):
+            histogram, crossings, t = section.snapshot()
+            density = np.log1p(histogram)
+            density *= 255 / max(density.max(), 1)
+            view.image.set_data(view.lut[density.astype(np.uint8)])
+            elapsed = time.perf_counter() - started
+            self.stats_var.set(f"{crossings:,} crossings ({crossings / max(elapsed, 1e-9):,.0f}/s)\n"
+                               f"{section.state.shape[0]} pendulums × {t:.0f} s")
+            return (view.image,)
+
+        self.animate(animate, POINCARE_REFRESH_MS)
+
+    def on_click(self, event):
+        # Watch the starting angles clicked on the flip map as a single pendulum
+        view = self.views.get(MODES[2])
+        if view is not None and event.inaxes is view.ax and event.xdata is not None:
+            self.theta1_var.set(round(event.xdata, 1))
+            self.theta2_var.set(round(event.ydata, 1))
+            self.mode_var.set(MODES[0])
+            self.start_simulation()
+
+    def on_closing(self):
+        # Stop the animation, the integrator thread and the flip map workers
+        self.stop_run()
+        if self.flip_pool is not None:
+            self.flip_pool.shutdown(wait=False, cancel_futures=True)
+        self.root.quit()
+        self.root.destroy()
+
+def benchmark_restarts(repeat=10):
+    """Time restarts of each mode against building a fresh figure and canvas."""
+    root = tk.Tk()
+    app = DoublePendulumGUI(root)
+    app.flip_resolution_var.set(FLIP_RESOLUTIONS[0])
+    root.update()
+    print(f"Restart latency, median of {repeat}, including the first redraw")
+    for mode in MODES:
+        app.mode_var.set(mode)
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            app.start_simulation()
+            root.update()
+            timings.append(time.perf_counter() - start)
+        print(f"  {mode:<38} {np.median(timings) * 1000:8.1f} ms")
+
+    # What every restart used to do: a new figure, layout pass and canvas widget
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        frame = ctk.CTkFrame(root)
+        fig = plt.Figure(figsize=(12, 12))
+        gs = fig.add_gridspec(2, 2)
+        for spec in (gs[:, 0], gs[0, 1], gs[1, 1]):
+            style_axes(fig.add_subplot(spec), '', '', '')
+        fig.tight_layout()
+        canvas = FigureCanvasTkAgg(fig, master=frame)
+        canvas.draw()
+        canvas.get_tk_widget().pack()
+        root.update()
+        frame.destroy()
+        timings.append(time.perf_counter() - start)
+    print(f"  {'Fresh figure and canvas (before)':<38} {np.median(timings) * 1000:8.1f} ms")
+    app.on_closing()
+
 
 def main():
+    parser = argparse.ArgumentParser(description="Interactive Double Pendulum Simulation")
+    parser.add_argument("--benchmark", action="store_true",
+                        help="compare the RK4 engine against solve_ivp and exit")
+    parser.add_argument("--benchmark-restart", action="store_true",
+                        help="time restarting each mode in the GUI and exit")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        benchmark_integrators()
+        return
+    if args.benchmark_restart:
+        benchmark_restarts()
+        return
+
     root = tk.Tk()
     app = DoublePendulumGUI(root)
     root.mainloop()
@@ -1,14 +1,456 @@
+import argparse
+import json
+import struct
+import time
+from functools import lru_cache
+
 import numpy as np
+import scipy.fft
 import matplotlib.pyplot as plt
+from matplotlib.colors import PowerNorm
 from matplotlib.animation import FuncAnimation
 import customtkinter as ctk
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import tkinter as tk
+from tkinter import filedialog
 
 # Set CustomTkinter appearance
 ctk.set_appearance_mode("dark")
 ctk.set_default_color_theme("dark-blue")
 
+# Size of the preallocated detection buffer, and the seed of the per-slot
+# y jitter (fixed so replays look exactly like the recording)
+MAX_DETECTIONS = 5_000_000
+JITTER_SEED = 0
+
+# Ways of showing the detections, and the (x, y) bins of the histogram image
+DISPLAY_MODES = ["Scatter", "Histogram"]
+HIST_BINS = (512, 60)
+
+# Histogram columns with less theoretical probability than this (the exact
+# zeros of dark fringes) are left out of χ² and KL
+STATS_MIN_P = 1e-12
+
+# Diffraction engine: propagation models, minimum FFT size and the largest one allowed
+PROPAGATIONS = ["Fraunhofer (far field)", "Fresnel (near field)"]
+MIN_SAMPLES = 4096
+MAX_SAMPLES = 2**20
+SAMPLES_PER_SLIT = 8
+
+# Where detections come from: the stationary pattern or a simulated wave packet
+SOURCES = ["Diffraction pattern", "Wave packet"]
+
+# Wave packet simulation: grid size, time step and steps per frame (ħ = m = 1,
+# lengths in grid cells), absorbing border width, shortest wavelength in cells
+# aimed for and the shortest accepted, and expected detections from a whole
+# packet
+WAVE_GRID = 256
+WAVE_DT = 0.5
+WAVE_STEPS_PER_FRAME = 6
+WAVE_ABSORB = 24
+WAVE_MIN_WAVELENGTH = 6
+WAVE_MIN_RESOLVED = 3
+WAVE_DETECTIONS_PER_PACKET = 20000
+
+# Event log: file signature, event record layout, when a chunk of buffered
+# events is written, how many chunks share an index block, and the most
+# events replay reads per frame
+LOG_MAGIC = b"DSLOG\x00\x01\x00"
+EVENT_DTYPE = np.dtype([("position", "<f4"), ("time", "<f8")])
+LOG_CHUNK_EVENTS = 65536
+LOG_FLUSH_SECONDS = 1.0
+LOG_INDEX_EVERY = 64
+REPLAY_READ_EVENTS = 20000
+
+
+def _fft_size(n):
+    """Smallest power of two of at least n samples, within [MIN_SAMPLES, MAX_SAMPLES]."""
+    return int(min(MAX_SAMPLES, max(MIN_SAMPLES, 2 ** int(np.ceil(np.log2(n))))))
+
+
+def slit_mask(n_samples, spacing, n_slits, width, separation):
+    """Transmission of n_slits slits of the given width, centered on sample n_samples // 2.
+
+    Each sample holds the fraction of its cell that is open, so slit edges
+    between samples are not rounded to the grid.
+    """
+    mask = np.zeros(n_samples)
+    for center in (np.arange(n_slits) - (n_slits - 1) / 2) * separation:
+        lo, hi = center - width / 2, center + width / 2
+        first = max(int(np.floor(lo / spacing)) + n_samples // 2 - 1, 0)
+        last = min(int(np.ceil(hi / spacing)) + n_samples // 2 + 1, n_samples - 1)
+        xi = (np.arange(first, last + 1) - n_samples // 2) * spacing
+        mask[first:last + 1] += np.clip(np.minimum(xi + spacing / 2, hi) - np.maximum(xi - spacing / 2, lo), 0, None)
+    # Overlapping slits are simply open, not more than fully transmitting
+    return np.minimum(mask / spacing, 1)
+
+
+@lru_cache(maxsize=32)
+def aperture_spectrum(n_slits, width, separation, spacing, n_samples):
+    """FFT of the slit mask sampled at n_samples points spacing apart."""
+    spectrum = np.fft.fft(np.fft.ifftshift(slit_mask(n_samples, spacing, n_slits, width, separation)))
+    spectrum.setflags(write=False)
+    return spectrum
+
+
+@lru_cache(maxsize=64)
+def diffraction_pattern(propagation, n_slits, width, separation, wavelength, distance, x_max, n_points):
+    """Intensity on the screen points linspace(-x_max, x_max, n_points).
+
+    The far field is the Fraunhofer pattern |T(x / (λD))|², with T the Fourier
+    transform of the aperture. The near field propagates the aperture over
+    distance D with the angular spectrum method, band-limited so the
+    transfer function is never undersampled. Both are cached; the aperture
+    spectrum is cached separately, so in the near field changing λ or D
+    reuses it.
+    """
+    screen = np.linspace(-x_max, x_max, n_points)
+    extent = (n_slits - 1) * separation + width
+    if propagation == PROPAGATIONS[0]:
+        # Sample finely enough to resolve a slit and to reach the screen edge
+        # (x = λD f); zero padding to 8x the aperture puts 8 samples on the
+        # finest fringe
+        spacing = min(width / SAMPLES_PER_SLIT, wavelength * distance / (2 * x_max))
+        n_samples = _fft_size(8 * extent / spacing)
+        spectrum = aperture_spectrum(n_slits, width, separation, spacing, n_samples)
+        x = np.fft.fftshift(np.fft.fftfreq(n_samples, spacing)) * wavelength * distance
+        intensity = np.abs(np.fft.fftshift(spectrum)) ** 2
+    else:
+        # The window holds the screen plus the aperture with room to spread
+        window = max(4 * x_max, 2 * (extent + x_max))
+        spacing = min(width / SAMPLES_PER_SLIT, window / MIN_SAMPLES)
+        n_samples = _fft_size(window / spacing)
+        spacing = window / n_samples
+        spectrum = aperture_spectrum(n_slits, width, separation, spacing, n_samples)
+        f = np.fft.fftfreq(n_samples, spacing)
+        kz = np.sqrt(np.maximum(1 / wavelength ** 2 - f ** 2, 0))
+        f_limit = 1 / (wavelength * np.sqrt((2 * distance / window) ** 2 + 1))
+        transfer = np.where(np.abs(f) < f_limit, np.exp(2j * np.pi * distance * kz), 0)
+        x = (np.arange(n_samples) - n_samples // 2) * spacing
+        intensity = np.abs(np.fft.fftshift(np.fft.ifft(spectrum * transfer))) ** 2
+    pattern = np.interp(screen, x, intensity)
+    pattern.setflags(write=False)
+    return pattern
+
+
+class WavePacket:
+    """Split-operator solver for a 2D wave packet passing a slit barrier.
+
+    Units are ħ = m = 1 with lengths in grid cells. The packet travels along
+    +x (columns) towards a wall at column wall_x with openings at the given
+    rows, and the detection screen is column screen_x. A complex absorbing
+    layer on every edge removes the outgoing waves instead of wrapping them
+    around the periodic FFT grid.
+
+    Each step is exp(-iV dt/2) exp(-iT dt) exp(-iV dt/2). The potential and
+    kinetic propagators are computed once per geometry, ψ lives in a single
+    complex64 buffer, and the FFTs reuse scipy's cached plans for that shape.
+    """
+
+    def __init__(self, n, slits, wavelength, wall_x, screen_x, dt=WAVE_DT):
+        self.n = n
+        self.dt = dt
+        self.wall_x = wall_x
+        self.screen_x = screen_x
+        self.k0 = 2 * np.pi / wavelength
+        energy = self.k0 ** 2 / 2
+
+        # Wall of height 20x the packet energy, open at the slits
+        rows = np.arange(n)[:, np.newaxis]
+        cols = np.arange(n)[np.newaxis, :]
+        thickness = max(2, int(wavelength / 2))
+        wall = np.zeros((n, n), dtype=bool)
+        wall[:, wall_x:wall_x + thickness] = True
+        for lo, hi in slits:
+            wall[max(lo, 0):max(hi, 0), :] = False
+        self.wall = wall
+        potential = 20 * energy * self.wall
+
+        # Absorbing layer: quadratic ramp of -iW towards every edge
+        edge = np.minimum(np.minimum(rows, n - 1 - rows), np.minimum(cols, n - 1 - cols))
+        absorb = energy * np.clip((WAVE_ABSORB - edge) / WAVE_ABSORB, 0, None) ** 2
+        self.half_potential = np.exp((-1j * potential - absorb) * dt / 2).astype(np.complex64)
+
+        k = 2 * np.pi * np.fft.fftfreq(n)
+        self.kinetic = np.exp(-0.5j * dt * (k[:, np.newaxis] ** 2 + k[np.newaxis, :] ** 2)).astype(np.complex64)
+
+        self.psi = np.empty((n, n), dtype=np.complex64)
+        self.launch()
+
+    def launch(self):
+        """Start a fresh packet between the absorbing layer and the wall."""
+        n = self.n
+        sigma_x = min(3 * 2 * np.pi / self.k0, (self.wall_x - WAVE_ABSORB) / 4)
+        x0 = self.wall_x - 2 * sigma_x
+        x = np.arange(n)[np.newaxis, :]
+        y = np.arange(n)[:, np.newaxis] - n / 2
+        psi = np.exp(-((x - x0) / (2 * sigma_x)) ** 2 - (y / (n / 4)) ** 2 + 1j * self.k0 * x)
+        self.psi[:] = psi / np.sqrt(np.sum(np.abs(psi) ** 2))
+
+    def step(self, steps):
+        """Advance steps time steps; returns the flux through the screen per row."""
+        psi = self.psi
+        c = self.screen_x
+        flux = np.zeros(self.n)
+        for _ in range(steps):
+            psi *= self.half_potential
+            psi[:] = scipy.fft.ifft2(scipy.fft.fft2(psi, workers=-1) * self.kinetic, workers=-1, overwrite_x=True)
+            psi *= self.half_potential
+            # Probability current j_x = Im(ψ* ∂ψ/∂x) through the screen column
+            current = np.imag(np.conj(psi[:, c]) * (psi[:, c + 1] - psi[:, c - 1]) / 2)
+            flux += np.clip(current, 0, None) * self.dt
+        return flux
+
+    def norm(self):
+        """Probability still on the grid."""
+        return float(np.sum(np.abs(self.psi) ** 2))
+
+
+def wave_geometry(n, n_slits, width, separation, wavelength, distance):
+    """Map the slider geometry onto a WavePacket grid.
+
+    The aperture is scaled to about half the grid height, unless that would
+    make the wavelength shorter than WAVE_MIN_WAVELENGTH cells, but never
+    beyond the rows between the absorbing layers. Returns the constructor
+    arguments and the scale in cells per unit length; raises ValueError when
+    the aperture only fits with a wavelength under WAVE_MIN_RESOLVED cells.
+    """
+    extent = (n_slits - 1) * separation + width
+    scale = max(0.5 * n / extent, WAVE_MIN_WAVELENGTH / wavelength)
+    # Leave a cell or two for the slit edges being rounded outwards
+    scale = min(scale, n / (8 * wavelength), (n - 2 * WAVE_ABSORB - 4) / extent)
+    if wavelength * scale < WAVE_MIN_RESOLVED:
+        raise ValueError(f"λ = {wavelength:.2f} is too short to resolve across this aperture "
+                         f"on the {n}×{n} wave grid")
+    half_width = max(1.0, width * scale / 2)
+    centers = n / 2 + (np.arange(n_slits) - (n_slits - 1) / 2) * separation * scale
+    slits = [(int(round(c - half_width)), int(round(c + half_width))) for c in centers]
+    wall_x = int(0.35 * n)
+    screen_x = int(min(wall_x + max(distance * scale, 4), n - WAVE_ABSORB - 2))
+    return dict(n=n, slits=slits, wavelength=wavelength * scale, wall_x=wall_x, screen_x=screen_x), scale
+
+
+class EventLog:
+    """Append-only binary log of detection events.
+
+    The file is LOG_MAGIC followed by records of a one-byte tag, a uint32
+    payload length and the payload (little-endian throughout):
+
+    P  parameters: int64 number of the next event, float64 time, JSON
+       parameters. Every P record also marks a reset of the screen.
+    E  events: int64 number of the first event, int64 offset of the P record
+       in effect, then EVENT_DTYPE records (position, seconds since start).
+    I  index: int64 offset of the previous I record (-1 for none), int64
+       number of E records since that index and one int64 triple (first
+       event, E offset, P offset) for each, then the int64 offsets of the P
+       records written since that index.
+    T  trailer: int64 offset of the last I record; written on close.
+
+    Nothing is ever rewritten, so a log cut short by a crash loses at most
+    the buffered events and can still be read by scanning.
+    """
+
+    def __init__(self, path):
+        self.file = open(path, "wb")
+        self.file.write(LOG_MAGIC)
+        self.start = time.perf_counter()
+        self.n_events = 0
+        self.params_offset = -1
+        self.buffer = []
+        self.buffered = 0
+        self.last_flush = self.start
+        self.pending_index = []
+        self.pending_params = []
+        self.last_index = -1
+
+    def now(self):
+        """Seconds since the log was started."""
+        return time.perf_counter() - self.start
+
+    def _record(self, tag, payload):
+        offset = self.file.tell()
+        self.file.write(struct.pack("<cI", tag, len(payload)) + payload)
+        return offset
+
+    def set_params(self, params):
+        """Record a reset of the screen with new parameters."""
+        self.flush()
+        payload = struct.pack("<qd", self.n_events, self.now()) + json.dumps(params).encode()
+        self.params_offset = self._record(b"P", payload)
+        self.pending_params.append(self.params_offset)
+
+    def append(self, positions):
+        """Record detections made now."""
+        events = np.empty(len(positions), dtype=EVENT_DTYPE)
+        events["position"] = positions
+        events["time"] = self.now()
+        self.buffer.append(events)
+        self.buffered += len(events)
+        self.n_events += len(events)
+        if self.buffered >= LOG_CHUNK_EVENTS or time.perf_counter() - self.last_flush > LOG_FLUSH_SECONDS:
+            self.flush()
+
+    def flush(self):
+        """Write the buffered events as one E record."""
+        self.last_flush = time.perf_counter()
+        if not self.buffered:
+            return
+        first = self.n_events - self.buffered
+        payload = struct.pack("<qq", first, self.params_offset) + np.concatenate(self.buffer).tobytes()
+        self.pending_index.append((first, self._record(b"E", payload), self.params_offset))
+        self.buffer, self.buffered = [], 0
+        if len(self.pending_index) >= LOG_INDEX_EVERY:
+            self._write_index()
+        self.file.flush()
+
+    def _write_index(self):
+        if self.pending_index or self.pending_params:
+            payload = (struct.pack("<qq", self.last_index, len(self.pending_index))
+                       + np.array(self.pending_index, dtype="<i8").tobytes()
+                       + np.array(self.pending_params, dtype="<i8").tobytes())
+            self.last_index = self._record(b"I", payload)
+            self.pending_index, self.pending_params = [], []
+
+    def close(self):
+        """Flush everything and write the final index and trailer."""
+        self.flush()
+        self._write_index()
+        self._record(b"T", struct.pack("<q", self.last_index))
+        self.file.close()
+
+
+class EventLogReader:
+    """Random access to an EventLog by event number.
+
+    The chunk table comes from the index blocks when the log was closed
+    cleanly, or from one pass over the record headers otherwise.
+    """
+
+    def __init__(self, path):
+        self.file = open(path, "rb")
+        if self.file.read(len(LOG_MAGIC)) != LOG_MAGIC:
+            raise ValueError(f"{path} is not a double-slit event log")
+        entries, params_offsets = self._read_index() or self._scan()
+        self.first, self.offsets, self.params_offsets = np.reshape(entries, (-1, 3)).T
+        # A slider drag writes several P records before the next detection;
+        # the last one written for an event number is the one in effect
+        self.params = {}
+        for offset in sorted(params_offsets):
+            payload = self._read_record(int(offset))[1]
+            first, t = struct.unpack_from("<qd", payload)
+            self.params[first] = (json.loads(payload[16:]), first, t)
+        self.epoch_starts = np.array(sorted(self.params), dtype=np.int64)
+        self._cached = (None, None)
+        self.total = 0
+        if len(self.first):
+            self.total = int(self.first[-1]) + len(self._read_chunk(len(self.first) - 1))
+
+    def _read_record(self, offset):
+        self.file.seek(offset)
+        header = self.file.read(5)
+        if len(header) < 5:
+            return None, None
+        tag, length = struct.unpack("<cI", header)
+        payload = self.file.read(length)
+        return (tag, payload) if len(payload) == length else (None, None)
+
+    def _read_index(self):
+        """Follow the index chain back from the trailer; None without a trailer."""
+        self.file.seek(0, 2)
+        size = self.file.tell()
+        if size < len(LOG_MAGIC) + 13:
+            return None
+        tag, payload = self._read_record(size - 13)
+        if tag != b"T":
+            return None
+        entries, params = [], []
+        offset = struct.unpack("<q", payload)[0]
+        while offset >= 0:
+            payload = self._read_record(offset)[1]
+            offset, n_chunks = struct.unpack_from("<qq", payload)
+            block = np.frombuffer(payload, dtype="<i8", offset=16)
+            entries.append(block[:3 * n_chunks])
+            params.append(block[3 * n_chunks:])
+        if not entries:
+            return None
+        return np.concatenate(entries[::-1]), np.concatenate(params[::-1])
+
+    def _scan(self):
+        """Rebuild the tables from the record headers, ignoring a torn last record."""
+        entries, params = [], []
+        self.file.seek(0, 2)
+        size = self.file.tell()
+        offset = len(LOG_MAGIC)
+        while offset + 5 <= size:
+            self.file.seek(offset)
+            tag, length = struct.unpack("<cI", self.file.read(5))
+            if offset + 5 + length > size:
+                break
+            if tag == b"E":
+                first, params_offset = struct.unpack("<qq", self.file.read(16))
+                entries.append((first, offset, params_offset))
+            elif tag == b"P":
+                params.append(offset)
+            offset += 5 + length
+        return np.array(entries, dtype=np.int64).ravel(), np.array(params, dtype=np.int64)
+
+    def _read_chunk(self, i):
+        if self._cached[0] == i:
+            return self._cached[1]
+        payload = self._read_record(int(self.offsets[i]))[1]
+        events = np.frombuffer(payload, dtype=EVENT_DTYPE, offset=16)
+        self._cached = (i, events)
+        return events
+
+    def epoch(self, k):
+        """Return (params, first event, start time) of the reset that event k belongs to."""
+        if not len(self.epoch_starts):
+            raise ValueError("log has no parameter records")
+        start = self.epoch_starts[max(np.searchsorted(self.epoch_starts, k, side="right") - 1, 0)]
+        return self.params[int(start)]
+
+    def epoch_end(self, k):
+        """First event after k that starts a new reset, or total."""
+        i = np.searchsorted(self.epoch_starts, k, side="right")
+        return int(self.epoch_starts[i]) if i < len(self.epoch_starts) else self.total
+
+    def events(self, start, stop):
+        """Return events start..stop-1, reading only the chunks that hold them."""
+        stop = min(stop, self.total)
+        if start >= stop:
+            return np.empty(0, dtype=EVENT_DTYPE)
+        i0 = np.searchsorted(self.first, start, side="right") - 1
+        i1 = np.searchsorted(self.first, stop, side="left")
+        events = [self._read_chunk(i) for i in range(i0, i1)]
+        events = events[0] if len(events) == 1 else np.concatenate(events)
+        return events[start - self.first[i0]:stop - self.first[i0]]
+
+    def chunks(self):
+        """Yield the events chunk by chunk."""
+        for i in range(len(self.first)):
+            yield self._read_chunk(i)
+
+    def close(self):
+        self.file.close()
+
+
+def export_histogram(log_path, output, bins=HIST_BINS[0], x_max=10.0):
+    """Bin every event of a log into a CSV histogram, one chunk at a time.
+
+    Returns the number of events binned.
+    """
+    reader = EventLogReader(log_path)
+    counts = np.zeros(bins, dtype=np.int64)
+    for events in reader.chunks():
+        index = np.floor((events["position"] + x_max) * (bins / (2 * x_max))).astype(np.intp)
+        counts += np.bincount(index[(index >= 0) & (index < bins)], minlength=bins)
+    reader.close()
+    centers = -x_max + (np.arange(bins) + 0.5) * (2 * x_max / bins)
+    np.savetxt(output, np.c_[centers, counts], fmt=["%.6f", "%d"], delimiter=",", header="position,count",
+               comments="")
+    return int(counts.sum())
+
+
 class DoubleSlitGUI:
     def __init__(self, root):
         self.root = root
@@ -34,7 +476,7 @@ class DoubleSlitGUI:
         # Explanation
         explanation_text = ctk.CTkTextbox(main_frame, height=100, wrap="word")
         explanation_text.grid(row=1, column=0, columnspan=2, sticky="ew", padx=5, pady=5)
-        explanation_text.insert("1.0", """The double-slit experiment demonstrates the wave-particle duality of quantum mechanics. Even when particles are sent one by one, they build up an interference pattern characteristic of waves. Adjust the slit separation (d) and wavelength (λ) to see how the pattern changes.""")
+        explanation_text.insert("1.0", """The double-slit experiment demonstrates the wave-particle duality of quantum mechanics. Even when particles are sent one by one, they build up an interference pattern characteristic of waves. Adjust the slit separation (d) and wavelength (λ) to see how the pattern changes. The slit width, number of slits and screen distance (D) shape the single-slit envelope and grating peaks; switch to the Fresnel model to see the near-field pattern close to the slits.""")
         explanation_text.configure(state="disabled")
 
         # Content frame
@@ -58,7 +500,7 @@ class DoubleSlitGUI:
             fg_color="#4c3b99",
             hover_color="#5c4aad"
         )
-        back_button.grid(row=2, column=0, padx=5, pady=20)
+        back_button.grid(row=15, column=0, padx=5, pady=20)
 
         # Sliders
         self.d_var = tk.DoubleVar(value=1.0)
@@ -66,6 +508,60 @@ class DoubleSlitGUI:
         self.create_slider(control_frame, "Slit Separation (d):", self.d_var, 0.1, 5.0, 0)
         self.create_slider(control_frame, "Wavelength (λ):", self.lambda_var, 0.1, 5.0, 1)
 
+        # Aperture and screen geometry
+        self.width_var = tk.DoubleVar(value=0.1)
+        self.slits_var = tk.IntVar(value=2)
+        self.D_var = tk.DoubleVar(value=1.0)
+        self.create_slider(control_frame, "Slit Width (a):", self.width_var, 0.01, 1.0, 2, fmt="{:.2f}")
+        self.create_slider(control_frame, "Slit Count:", self.slits_var, 1, 10, 3, fmt="{:.0f}", steps=9)
+        self.create_slider(control_frame, "Screen Distance (D):", self.D_var, 0.2, 10.0, 4)
+
+        # Propagation model
+        self.propagation_var = tk.StringVar(value=PROPAGATIONS[0])
+        ctk.CTkOptionMenu(control_frame, variable=self.propagation_var, values=PROPAGATIONS,
+                          command=lambda *args: self.update_P()).grid(row=5, column=0, padx=5, pady=5)
+
+        # Detection rate (does not reset the screen)
+        self.rate_var = tk.IntVar(value=100)
+        self.create_slider(control_frame, "Particles/Frame:", self.rate_var, 10, 10000, 6,
+                           command=lambda: None, fmt="{:.0f}")
+
+        # Detection counter
+        self.count_var = tk.StringVar()
+        ctk.CTkLabel(control_frame, textvariable=self.count_var).grid(row=7, column=0, padx=5, pady=5)
+
+        # Display mode: individual points, or counts accumulated into an image
+        self.mode_var = tk.StringVar(value=DISPLAY_MODES[0])
+        ctk.CTkOptionMenu(control_frame, variable=self.mode_var, values=DISPLAY_MODES,
+                          command=self.change_mode).grid(row=8, column=0, padx=5, pady=5)
+
+        # Convergence of the detections towards the theoretical pattern
+        self.stats_var = tk.StringVar()
+        ctk.CTkLabel(control_frame, textvariable=self.stats_var).grid(row=9, column=0, padx=5, pady=5)
+
+        # Detection source: sample the pattern, or simulate the wave packet
+        self.source_var = tk.StringVar(value=SOURCES[0])
+        ctk.CTkOptionMenu(control_frame, variable=self.source_var, values=SOURCES,
+                          command=self.change_source).grid(row=10, column=0, padx=5, pady=5)
+
+        # Recording and replay of the detection events
+        log_frame = ctk.CTkFrame(control_frame)
+        log_frame.grid(row=11, column=0, padx=5, pady=5)
+        self.record_button = ctk.CTkButton(log_frame, text="Record…", width=100, command=self.toggle_record)
+        self.record_button.grid(row=0, column=0, padx=5, pady=5)
+        self.replay_button = ctk.CTkButton(log_frame, text="Replay…", width=100, command=self.toggle_replay)
+        self.replay_button.grid(row=0, column=1, padx=5, pady=5)
+        self.replay_slider = ctk.CTkSlider(control_frame, from_=0, to=1, command=self.seek_replay_fraction,
+                                           state="disabled")
+        self.replay_slider.set(0)
+        self.replay_slider.grid(row=12, column=0, sticky="ew", padx=5, pady=3)
+        self.replay_var = tk.StringVar()
+        ctk.CTkLabel(control_frame, textvariable=self.replay_var).grid(row=13, column=0, padx=5, pady=5)
+        ctk.CTkButton(control_frame, text="Export Histogram…",
+                      command=self.export_log_histogram).grid(row=14, column=0, padx=5, pady=5)
+        self.log = None
+        self.replay = None
+
         # Plot frame
         self.plot_frame = ctk.CTkFrame(content_frame)
         self.plot_frame.grid(row=0, column=1, sticky="nsew", padx=5, pady=5)
@@ -73,24 +569,58 @@ class DoubleSlitGUI:
 
         # Parameters
         self.x_max = 10  # Screen half-width
-        self.N = 1000    # Number of points
+        self.N = 4096    # Number of points
         self.x = np.linspace(-self.x_max, self.x_max, self.N)
-        self.D = 1.0     # Distance to screen
-        self.particles = []  # List of particle positions
+
+        # Detections live in a preallocated buffer; each slot gets its y
+        # jitter once, so earlier points never move
+        self.rng = np.random.default_rng()
+        self.positions = np.empty(MAX_DETECTIONS, dtype=np.float32)
+        jitter_rng = np.random.default_rng(JITTER_SEED)
+        self.jitter = jitter_rng.uniform(-0.05, 0.05, MAX_DETECTIONS).astype(np.float32)
+        self.count = 0
+        self.background = None
+        self.clean_background = None
+
+        # Histogram bins cover the grid cells the samples are spread over,
+        # a whole number of cells per x bin
+        dx = self.x[1] - self.x[0]
+        self.hist_range = (self.x[0] - dx / 2, self.x[-1] + dx / 2)
+        self.counts = np.zeros(HIST_BINS, dtype=np.int64)
 
         # Matplotlib setup
         plt.style.use('dark_background')
         self.fig, self.ax = plt.subplots(figsize=(8, 6))
         self.line, = self.ax.plot(self.x, np.zeros(self.N), label='Theoretical Pattern', color='cyan')
-        self.scat = self.ax.scatter([], [], c='red', alpha=0.1, s=1, label='Particle Detections')
+        self.scat = self.ax.scatter([], [], c='red', alpha=0.1, s=1, label='Particle Detections',
+                                    animated=True)
+        self.hist_image = self.ax.imshow(np.zeros(HIST_BINS[::-1]), cmap='inferno', origin='lower',
+                                         aspect='auto', interpolation='nearest', extent=(*self.hist_range, 0, 1.1),
+                                         animated=True)
         self.ax.set_xlim(-self.x_max, self.x_max)
         self.ax.set_ylim(0, 1.1)
         self.ax.set_xlabel('Position on Screen')
         self.ax.set_ylabel('Intensity')
         self.ax.legend()
+        self.screen_position = self.ax.get_position()
+
+        # Wave packet view above the screen, shown only for the wave packet source
+        self.wave = None
+        self.wave_background = None
+        self.ax_wave = self.fig.add_axes([0.1, 0.45, 0.85, 0.5])
+        self.wave_image = self.ax_wave.imshow(np.zeros((WAVE_GRID, WAVE_GRID)), cmap='magma', origin='lower',
+                                              norm=PowerNorm(0.5, vmin=0, vmax=1), interpolation='nearest',
+                                              animated=True)
+        self.wall_image = self.ax_wave.imshow(np.zeros((WAVE_GRID, WAVE_GRID, 4)), origin='lower',
+                                              interpolation='nearest', animated=True)
+        self.screen_marker = self.ax_wave.axvline(0, color='cyan', linestyle='--', linewidth=1, animated=True)
+        self.ax_wave.set_title('|ψ|²')
+        self.ax_wave.set_axis_off()
+        self.ax_wave.set_visible(False)
 
         self.canvas = FigureCanvasTkAgg(self.fig, master=self.plot_frame)
         self.canvas.get_tk_widget().pack(fill="both", expand=True)
+        self.canvas.mpl_connect("draw_event", self.on_draw)
 
         # Initial update
         self.update_P()
@@ -99,57 +629,372 @@ class DoubleSlitGUI:
         self.is_animating = True
         self.animate_frame()
 
-    def create_slider(self, parent, label, variable, min_val, max_val, row):
+    def create_slider(self, parent, label, variable, min_val, max_val, row, command=None, fmt="{:.1f}",
+                      steps=100):
+        """Create a labelled slider; command (default update_P) runs on every change."""
+        command = command or self.update_P
         frame = ctk.CTkFrame(parent)
         frame.grid(row=row, column=0, sticky="ew", padx=5, pady=3)
         ctk.CTkLabel(frame, text=label, font=ctk.CTkFont(size=12), width=100, anchor="w").grid(row=0, column=0, padx=(5, 0))
-        slider = ctk.CTkSlider(frame, from_=min_val, to=max_val, variable=variable, number_of_steps=100, width=150)
+        slider = ctk.CTkSlider(frame, from_=min_val, to=max_val, variable=variable, number_of_steps=steps, width=150)
         slider.grid(row=0, column=1, sticky="ew", padx=5)
-        value_label = ctk.CTkLabel(frame, text=f"{variable.get():.1f}", font=ctk.CTkFont(size=12), width=30)
+        value_label = ctk.CTkLabel(frame, text=fmt.format(variable.get()), font=ctk.CTkFont(size=12), width=30)
         value_label.grid(row=0, column=2, padx=(0, 5))
 
         def update_label_and_P(*args):
-            value_label.configure(text=f"{variable.get():.1f}")
-            self.update_P()
+            value_label.configure(text=fmt.format(variable.get()))
+            command()
         variable.trace_add("write", update_label_and_P)
         frame.columnconfigure(1, weight=1)
         return slider
 
+    def current_params(self):
+        """The parameters in effect, as recorded in event logs."""
+        return {
+            "d": self.d_var.get(), "wavelength": self.lambda_var.get(), "width": self.width_var.get(),
+            "slits": self.slits_var.get(), "distance": self.D_var.get(),
+            "propagation": self.propagation_var.get(), "source": self.source_var.get(),
+        }
+
     def update_P(self):
-        d = self.d_var.get()
-        lambda_ = self.lambda_var.get()
-        # Compute intensity
-        I = np.cos(np.pi * d * self.x / (lambda_ * self.D))**2
+        # Parameter changes end a replay
+        if self.replay is not None:
+            self.stop_replay()
+        params = self.current_params()
+        self.show_pattern(params)
+        # Rebuild the wave packet simulation for the new geometry
+        self.wave = None
+        wave_error = None
+        if self.source_var.get() == SOURCES[1]:
+            try:
+                kwargs, _ = wave_geometry(
+                    WAVE_GRID, self.slits_var.get(), self.width_var.get(), self.d_var.get(),
+                    self.lambda_var.get(), self.D_var.get())
+            except ValueError as e:
+                wave_error = f"No wave packet: {e}"
+            else:
+                self.wave = WavePacket(**kwargs)
+                self.flux_scale = 0.0
+                wall = np.zeros((WAVE_GRID, WAVE_GRID, 4))
+                wall[self.wave.wall] = 1.0
+                self.wall_image.set_data(wall)
+                self.screen_marker.set_xdata([self.wave.screen_x])
+        if self.log is not None:
+            self.log.set_params(params)
+        self.reset_detections()
+        if wave_error:
+            self.stats_var.set(wave_error)
+
+    def show_pattern(self, params):
+        """Compute P and the theoretical curve for a set of parameters."""
+        # Compute intensity (cached per aperture and screen geometry)
+        I = diffraction_pattern(params["propagation"], params["slits"], params["width"], params["d"],
+                                params["wavelength"], params["distance"], self.x_max, self.N)
         # Normalize for probability
         self.P = I / np.sum(I)
+        # Cumulative distribution for inverse-transform sampling
+        self.cdf = np.cumsum(self.P)
+        # Theoretical probability of each histogram column
+        self.P_bins = self.P.reshape(HIST_BINS[0], -1).sum(axis=1)
+        self.pattern_source = params["source"]
         # Update theoretical curve (normalized to max=1)
         self.line.set_ydata(I / np.max(I))
-        # Reset particles
-        self.particles = []
-        self.scat.set_offsets(np.empty((0, 2)))  # Create empty 2D array with shape (0,2)
+        # The stationary theory doesn't describe a finite packet at this distance
+        self.line.set_visible(params["source"] == SOURCES[0])
+
+    def reset_detections(self):
+        """Clear the screen."""
+        self.count = 0
+        self.counts[:] = 0
+        self.count_var.set("Detections: 0")
+        self.stats_var.set("")
         self.canvas.draw()
 
+    def sample(self, n):
+        """Draw n screen positions from P by inverting its CDF."""
+        u = self.rng.random(n) * self.cdf[-1]
+        indices = np.minimum(np.searchsorted(self.cdf, u, side="right"), self.N - 1)
+        # Spread each sample over its grid cell so detections don't stack on grid points
+        dx = self.x[1] - self.x[0]
+        return self.x[indices] + (self.rng.random(n) - 0.5) * dx
+
+    def accumulate(self, positions, jitter):
+        """Add detections to the histogram counts."""
+        nx, ny = HIST_BINS
+        x0, x1 = self.hist_range
+        ix = np.floor((positions - x0) * (nx / (x1 - x0))).astype(np.intp)
+        iy = np.clip(((jitter + 0.05) * (ny / 0.1)).astype(np.intp), 0, ny - 1)
+        # Wave packet detections can land beyond the plotted screen
+        inside = (ix >= 0) & (ix < nx)
+        ix, iy = ix[inside], iy[inside]
+        self.counts += np.bincount(ix * ny + iy, minlength=nx * ny).reshape(HIST_BINS)
+
+    def update_stats(self):
+        """Show how far the detected distribution still is from theory."""
+        if self.wave is not None:
+            self.stats_var.set(f"Packet left on grid: {self.wave.norm():.0%}")
+            return
+        # Wave packet detections (live or replayed) weren't drawn from the stationary pattern
+        if self.pattern_source == SOURCES[1]:
+            self.stats_var.set("χ²/KL: not applicable to wave packet detections")
+            return
+        support = self.P_bins > STATS_MIN_P
+        theory = self.P_bins[support]
+        observed = self.counts.sum(axis=1)[support]
+        expected = theory * self.count
+        chi2 = np.sum((observed - expected) ** 2 / expected)
+        dof = max(np.count_nonzero(support) - 1, 1)
+        q = observed / self.count
+        seen = q > 0
+        kl = np.sum(q[seen] * np.log(q[seen] / theory[seen]))
+        self.stats_var.set(f"χ²/dof = {chi2 / dof:.3f}\nKL(data‖theory) = {kl:.2e} nats")
+
+    def draw_histogram(self):
+        """Blit the count image with the theoretical curve on top."""
+        self.hist_image.set_data(self.counts.T)
+        self.hist_image.set_clim(0, max(self.counts.max(), 1))
+        self.canvas.restore_region(self.clean_background)
+        self.ax.draw_artist(self.hist_image)
+        self.ax.draw_artist(self.line)
+        self.canvas.blit(self.ax.bbox)
+
+    def change_mode(self, *args):
+        """Switch display mode; both modes share the same detections."""
+        self.canvas.draw()
+
+    def change_source(self, *args):
+        """Show or hide the wave packet view and restart the detections."""
+        self.layout()
+        self.update_P()
+
+    def layout(self):
+        """Show the wave packet view above the screen while it is simulated."""
+        wave = self.source_var.get() == SOURCES[1] and self.replay is None
+        self.ax_wave.set_visible(wave)
+        self.ax.set_position([0.1, 0.08, 0.85, 0.28] if wave else self.screen_position)
+
+    def wave_detections(self):
+        """Advance the wave packet one frame and sample detections from the flux through the screen.
+
+        The frame with the largest flux so far yields about Particles/Frame
+        detections; the others scale with their share of it. The grid height
+        is spread over the whole plotted screen.
+        """
+        flux = self.wave.step(WAVE_STEPS_PER_FRAME)
+        if self.wave.norm() < 0.02:
+            self.wave.launch()
+        total = flux.sum()
+        self.flux_scale = max(self.flux_scale, total)
+        if total <= 0:
+            return np.empty(0)
+        n = self.rng.poisson(self.rate_var.get() * total / self.flux_scale)
+        cdf = np.cumsum(flux)
+        rows = np.minimum(np.searchsorted(cdf, self.rng.random(n) * cdf[-1], side="right"), WAVE_GRID - 1)
+        return (rows + self.rng.random(n) - WAVE_GRID / 2) * (2 * self.x_max / WAVE_GRID)
+
+    def draw_wave(self):
+        """Blit |ψ|² with the wall and screen on top."""
+        density = np.abs(self.wave.psi) ** 2
+        self.wave_image.set_data(density)
+        self.wave_image.set_clim(0, max(density.max(), 1e-12))
+        self.canvas.restore_region(self.wave_background)
+        self.ax_wave.draw_artist(self.wave_image)
+        self.ax_wave.draw_artist(self.wall_image)
+        self.ax_wave.draw_artist(self.screen_marker)
+        self.canvas.blit(self.ax_wave.bbox)
+
+    def on_draw(self, event):
+        """Rebuild the blit backgrounds after a full redraw (reset, resize or mode change)."""
+        if self.ax_wave.get_visible():
+            self.wave_background = self.canvas.copy_from_bbox(self.ax_wave.bbox)
+        self.clean_background = self.canvas.copy_from_bbox(self.ax.bbox)
+        if self.mode_var.get() == "Histogram":
+            self.ax.draw_artist(self.hist_image)
+            self.ax.draw_artist(self.line)
+        elif self.count:
+            self.scat.set_offsets(np.c_[self.positions[:self.count], self.jitter[:self.count]])
+            self.ax.draw_artist(self.scat)
+        self.background = self.canvas.copy_from_bbox(self.ax.bbox)
+
     def animate_frame(self):
         if not hasattr(self, 'is_animating') or not self.is_animating:
             return
-            
-        if len(self.particles) < 10000:  # Limit total particles
-            # Sample 10 particles per frame
-            indices = np.random.choice(self.N, size=10, p=self.P)
-            new_xs = self.x[indices]
-            self.particles.extend(new_xs)
-            # Add small random y for visibility
-            y_rand = np.random.uniform(-0.05, 0.05, len(self.particles))
-            self.scat.set_offsets(np.c_[self.particles, y_rand])
-            self.canvas.draw()
-        
+
+        if self.background is not None:
+            if self.replay is not None:
+                new = self.replay_detections()
+            elif self.source_var.get() == SOURCES[1]:
+                # Nothing is detected while the geometry can't be simulated
+                new = np.empty(0)
+                if self.wave is not None:
+                    new = self.wave_detections()
+                    self.draw_wave()
+            else:
+                new = self.sample(self.rate_var.get())
+            self.add_detections(new[:MAX_DETECTIONS - self.count])
+
         # Schedule next frame
         if hasattr(self, 'is_animating') and self.is_animating:
             self.root.after(50, self.animate_frame)
 
+    def add_detections(self, new):
+        """Store new detections and draw them."""
+        n = len(new)
+        if n == 0:
+            return
+        if self.log is not None:
+            self.log.append(new)
+        start, end = self.count, self.count + n
+        self.positions[start:end] = new
+        self.count = end
+        self.accumulate(self.positions[start:end], self.jitter[start:end])
+
+        if self.mode_var.get() == "Histogram":
+            self.draw_histogram()
+        else:
+            # Draw only the new points on top of the previous frame
+            self.scat.set_offsets(np.c_[self.positions[start:end], self.jitter[start:end]])
+            self.canvas.restore_region(self.background)
+            self.ax.draw_artist(self.scat)
+            self.canvas.blit(self.ax.bbox)
+            self.background = self.canvas.copy_from_bbox(self.ax.bbox)
+        self.count_var.set(f"Detections: {self.count:,}")
+        self.update_stats()
+
+    def toggle_record(self):
+        """Start recording detections to a log from a cleared screen, or stop recording."""
+        if self.log is not None:
+            self.log.close()
+            self.log = None
+            self.record_button.configure(text="Record…")
+            self.replay_var.set("Recording saved")
+            return
+        path = filedialog.asksaveasfilename(title="Record Detections", defaultextension=".dslog",
+                                            filetypes=[("Double-slit event log", "*.dslog")])
+        if not path:
+            return
+        try:
+            self.log = EventLog(path)
+        except OSError as e:
+            self.replay_var.set(f"Cannot record: {e.strerror}")
+            return
+        self.record_button.configure(text="Stop Recording")
+        self.replay_var.set("Recording…")
+        self.update_P()
+
+    def toggle_replay(self):
+        """Replay a recorded log, or stop the replay and resume the simulation."""
+        if self.replay is not None:
+            self.stop_replay()
+            self.update_P()
+            return
+        path = filedialog.askopenfilename(title="Replay Detections",
+                                          filetypes=[("Double-slit event log", "*.dslog")])
+        if not path:
+            return
+        if self.log is not None:
+            self.toggle_record()
+        try:
+            self.replay = EventLogReader(path)
+            self.replay.epoch(0)
+        except (OSError, ValueError) as e:
+            self.replay = None
+            self.replay_var.set(f"Cannot replay: {e}")
+            return
+        self.wave = None
+        self.layout()
+        self.replay_button.configure(text="Stop Replay")
+        self.replay_slider.configure(state="normal")
+        self.seek_replay(0)
+
+    def stop_replay(self):
+        """Close the replayed log."""
+        self.replay.close()
+        self.replay = None
+        self.replay_button.configure(text="Replay…")
+        self.replay_slider.configure(state="disabled")
+        self.replay_var.set("")
+        self.layout()
+
+    def seek_replay_fraction(self, value):
+        """Seek from the replay slider."""
+        self.seek_replay(int(round(float(value) * self.replay.total)))
+
+    def seek_replay(self, k):
+        """Show the screen exactly as it was after the first k events of the log.
+
+        Only the events since the last reset before k are read, a chunk at a
+        time; nothing is re-simulated.
+        """
+        params, first, t = self.replay.epoch(k)
+        self.show_pattern(params)
+        self.counts[:] = 0
+        self.count = 0
+        for start in range(first, min(k, first + MAX_DETECTIONS), LOG_CHUNK_EVENTS):
+            events = self.replay.events(start, min(start + LOG_CHUNK_EVENTS, k, first + MAX_DETECTIONS))
+            n = len(events)
+            self.positions[self.count:self.count + n] = events["position"]
+            self.accumulate(events["position"], self.jitter[self.count:self.count + n])
+            self.count += n
+        self.replay_epoch = first
+        self.replay_cursor = k
+        self.replay_clock = self.replay.events(k - 1, k)["time"][0] if k > first else t
+        self.replay_wall = time.perf_counter()
+        self.count_var.set(f"Detections: {self.count:,}")
+        self.stats_var.set("")
+        if self.count:
+            self.update_stats()
+        self.update_replay_label()
+        self.canvas.draw()
+
+    def replay_detections(self):
+        """Return the logged detections made up to the advancing replay clock."""
+        now = time.perf_counter()
+        self.replay_clock += now - self.replay_wall
+        self.replay_wall = now
+        k = self.replay_cursor
+        if k >= self.replay.total:
+            return np.empty(0)
+        # The recording reset the screen here
+        if self.replay.epoch(k)[1] != self.replay_epoch:
+            self.seek_replay(k)
+        events = self.replay.events(k, min(self.replay.epoch_end(k), k + REPLAY_READ_EVENTS))
+        n = np.searchsorted(events["time"], self.replay_clock, side="right")
+        self.replay_cursor = k + n
+        self.update_replay_label()
+        return events["position"][:n]
+
+    def update_replay_label(self):
+        total = self.replay.total
+        self.replay_slider.set(self.replay_cursor / total if total else 0)
+        self.replay_var.set(f"Replay: {self.replay_cursor:,} / {total:,} events")
+
+    def export_log_histogram(self):
+        """Bin every event of a log into a CSV histogram."""
+        log_path = filedialog.askopenfilename(title="Log to Export",
+                                              filetypes=[("Double-slit event log", "*.dslog")])
+        if not log_path:
+            return
+        output = filedialog.asksaveasfilename(title="Export Histogram", defaultextension=".csv",
+                                              filetypes=[("CSV file", "*.csv")])
+        if not output:
+            return
+        try:
+            n = export_histogram(log_path, output, x_max=self.x_max)
+        except (OSError, ValueError) as e:
+            self.replay_var.set(f"Export failed: {e}")
+        else:
+            self.replay_var.set(f"Exported {n:,} events")
+
     def on_closing(self):
         # Stop the animation
         self.is_animating = False
+
+        # Finish the recording and close the replayed log
+        if self.log is not None:
+            self.log.close()
+        if self.replay is not None:
+            self.replay.close()
         
         # Close matplotlib figure
         plt.close(self.fig)
@@ -160,8 +1005,24 @@ class DoubleSlitGUI:
     def __del__(self):
         self.is_animating = False
 
-# Run the application
-if __name__ == "__main__":
+
+def main():
+    parser = argparse.ArgumentParser(description="Double-Slit Experiment Simulation")
+    parser.add_argument("--export-histogram", nargs=2, metavar=("LOG", "CSV"),
+                        help="bin every event of a recorded log into a CSV histogram and exit")
+    parser.add_argument("--bins", type=int, default=HIST_BINS[0], help="number of histogram bins")
+    args = parser.parse_args()
+
+    if args.export_histogram:
+        n = export_histogram(*args.export_histogram, bins=args.bins)
+        print(f"Binned {n:,} events into {args.export_histogram[1]}")
+        return
+
     root = ctk.CTk()
     app = DoubleSlitGUI(root)
-    root.mainloop()
\ No newline at end of file
+    root.mainloop()
+
+
+# Run the application
+if __name__ == "__main__":
+    main()
\ No newline at end of file
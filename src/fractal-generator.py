@@ -1,19 +1,953 @@
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import struct
+import sys
+import tempfile
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from functools import partial
 import numpy as np
+import matplotlib
 import matplotlib.pyplot as plt
 import customtkinter as ctk
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import tkinter as tk
+from tkinter import filedialog
+from PIL import Image, ImageTk
 
 # Set CustomTkinter appearance mode and theme
 ctk.set_appearance_mode("dark")
 ctk.set_default_color_theme("blue")
 
+ALGORITHMS = ["Standard", "Mariani–Silver"]
+COLORINGS = ["Smooth", "Escape time", "Histogram"]
+FAMILIES = ["Mandelbrot", "Julia", "Burning Ship", "Tricorn", "Multibrot"]
+
+# Initial view center for each family
+FAMILY_CENTERS = {
+    "Mandelbrot": (-0.5, 0.0),
+    "Julia": (0.0, 0.0),
+    "Burning Ship": (-0.5, -0.5),
+    "Tricorn": (-0.3, 0.0),
+    "Multibrot": (0.0, 0.0),
+}
+
+# Poster exports render strips of about this many pixels at a time
+STRIP_PIXELS = 2**20
+POSTER_ROWS_PER_TIFF_STRIP = 16
+POSTER_SIZES = {
+    "Poster 20000×15000": (20000, 15000),
+    "Print 8000×6000": (8000, 6000),
+    "4K 3840×2880": (3840, 2880),
+}
+
+# The linked Julia preview adapts its resolution to stay within this budget
+PREVIEW_BUDGET = 0.030
+PREVIEW_SIZE = (160, 120)
+
+# Views are assembled from square tiles on a fixed pixel lattice per zoom
+# level, so panning only computes newly exposed tiles and revisited views
+# come straight from the cache. Level 0 is 3 units wide at 800 pixels.
+TILE_SIZE = 64
+TILE_BASE_PIXEL = 3.0 / 800
+
+# The kernel compacts its active set once this fraction of it has retired
+COMPACT_FRACTION = 0.25
+
+# Pixels at least this large are rendered in float32; deeper views need float64
+FLOAT32_MIN_PIXEL = 1e-4
+
+# Quiet period before a GUI render starts, and how often its result is polled
+RENDER_DEBOUNCE = 0.05
+RENDER_POLL_MS = 20
+
+
+class RenderCancelled(Exception):
+    """Raised inside a render whose cancel callback reported true."""
+
+
+def in_main_cardioid_or_bulb(x, y):
+    """Return a mask of the points x + iy inside the main cardioid or the period-2 bulb."""
+    y2 = y ** 2
+    q = (x - 0.25) ** 2 + y2
+    cardioid = q * (q + (x - 0.25)) <= 0.25 * y2
+    bulb = (x + 1) ** 2 + y2 <= 0.0625
+    return cardioid | bulb
+
+
+def precision_for(pixel_size):
+    """Pick float32 while a pixel is much larger than single-precision spacing, else float64."""
+    return np.float32 if pixel_size >= FLOAT32_MIN_PIXEL else np.float64
+
+
+class KernelWorkspace:
+    """Preallocated work buffers for escape_time_kernel, reused across renders.
+
+    Buffers grow to the largest request seen and are handed out as views, so
+    repeated renders of similar size allocate nothing in the iteration loop.
+    A workspace must not be shared between threads.
+    """
+
+    def __init__(self):
+        self.buffers = {}
+
+    def get(self, name, size, dtype):
+        """Return a buffer view of the given size and dtype."""
+        key = (name, np.dtype(dtype))
+        buffer = self.buffers.get(key)
+        if buffer is None or buffer.size < size:
+            buffer = np.empty(size, dtype=dtype)
+            self.buffers[key] = buffer
+        return buffer[:size]
+
+
+def _iterate(zr, zi, cr, ci, family, power, ws):
+    """Apply one step of the family's escape-time map to the planes zr, zi in place."""
+    n = zr.size
+    dtype = zr.dtype
+    if family == "Multibrot":
+        wr, wi = ws.get("wr", n, dtype), ws.get("wi", n, dtype)
+        t1, t2 = ws.get("t1", n, dtype), ws.get("t2", n, dtype)
+        np.copyto(wr, zr)
+        np.copyto(wi, zi)
+        for _ in range(power - 1):
+            np.multiply(wr, zi, out=t1)
+            np.multiply(wi, zr, out=t2)
+            np.multiply(wr, zr, out=wr)
+            np.multiply(wi, zi, out=wi)
+            np.subtract(wr, wi, out=wr)
+            np.add(t1, t2, out=wi)
+        np.add(wr, cr, out=zr)
+        np.add(wi, ci, out=zi)
+        return
+
+    zr2, zi2 = ws.get("zr2", n, dtype), ws.get("zi2", n, dtype)
+    np.multiply(zr, zr, out=zr2)
+    np.multiply(zi, zi, out=zi2)
+    np.multiply(zr, zi, out=zi)
+    if family == "Burning Ship":
+        np.abs(zi, out=zi)
+    zi *= -2 if family == "Tricorn" else 2
+    zi += ci
+    np.subtract(zr2, zi2, out=zr)
+    zr += cr
+
+
+def escape_time_kernel(c, max_iter, family="Mandelbrot", power=2, julia_c=None,
+                       interior_checks=True, cycle_tolerance=1e-12, dtype=np.float64,
+                       workspace=None, cancel=None):
+    """Compute escape times and normalized iteration counts for an array of points.
+
+    c is a complex array, or a pair (real, imag) of real arrays of the same
+    shape, which avoids building a complex grid. The iteration runs on
+    separate real and imaginary planes of the given dtype; float32 halves the
+    memory traffic and is accurate enough for shallow views (see
+    precision_for). Work buffers come from workspace, or a temporary one.
+
+    family selects the map: z² + c for "Mandelbrot" and "Julia", the
+    absolute-value fold of "Burning Ship", the conjugate of "Tricorn" or
+    z^power + c for "Multibrot". Without julia_c the points are the parameter
+    c and iteration starts from z = 0; with julia_c they are the starting
+    values z and c = julia_c is fixed, which gives the Julia set of the map.
+
+    Returns (escape_time, smooth). escape_time is the integer escape iteration
+    (0 for points that never escape) and smooth is the float32 normalized
+    iteration count n + 1 - log_d(log2|z|) for a map of degree d, which varies
+    continuously across the escape bands and is 0 for interior points.
+
+    Only the points that are still iterating are kept in the working arrays, so
+    every iteration gets cheaper as points escape. With interior_checks enabled,
+    points in the main cardioid and period-2 bulb are skipped entirely, and
+    orbits that return to a previously saved value (an attracting cycle) are
+    retired early as interior points.
+
+    cancel is polled once per iteration; when it returns true the kernel
+    raises RenderCancelled.
+    """
+    if isinstance(c, tuple):
+        real, imag = np.broadcast_arrays(*c)
+    else:
+        c = np.asarray(c)
+        real, imag = c.real, c.imag
+    shape = real.shape
+    real = np.ascontiguousarray(real, dtype=dtype).ravel()
+    imag = np.ascontiguousarray(imag, dtype=dtype).ravel()
+    ws = workspace if workspace is not None else KernelWorkspace()
+    escape_time = np.zeros(real.size, dtype=np.int32)
+    smooth = np.zeros(real.size, dtype=np.float32)
+
+    degree = power if family == "Multibrot" else 2
+
+    if interior_checks and family == "Mandelbrot" and julia_c is None:
+        idx = np.flatnonzero(~in_main_cardioid_or_bulb(real, imag))
+    else:
+        idx = np.arange(real.size)
+    n = idx.size
+
+    # The active set lives in ping-pong buffers: compaction copies the points
+    # that keep iterating from one set into the other without allocating
+    names = ["idx", "zr", "zi", "sr", "si"] + (["cr", "ci"] if julia_c is None else [])
+    sets = [{name: ws.get(name + suffix, real.size, np.intp if name == "idx" else dtype)
+             for name in names} for suffix in ("_a", "_b")]
+    active = sets[0]
+    active["idx"][:n] = idx
+    if julia_c is None:
+        np.take(real, idx, out=active["cr"][:n])
+        np.take(imag, idx, out=active["ci"][:n])
+        active["zr"][:n] = 0
+        active["zi"][:n] = 0
+        cr = ci = None
+    else:
+        np.take(real, idx, out=active["zr"][:n])
+        np.take(imag, idx, out=active["zi"][:n])
+        cr, ci = dtype(julia_c.real), dtype(julia_c.imag)
+
+    # Brent-style cycle detection: compare against a snapshot taken at
+    # power-of-two iterations so cycles of any period are eventually caught
+    active["sr"][:n] = active["zr"][:n]
+    active["si"][:n] = active["zi"][:n]
+    next_snapshot = 1
+    tolerance2 = cycle_tolerance ** 2
+
+    # Retired points stay in the active set (masked out by alive) until
+    # enough of them pile up to make a compaction pass worthwhile
+    alive = ws.get("alive", real.size, bool)
+    alive[:n] = True
+
+    with np.errstate(over="ignore", invalid="ignore"):
+        for i in range(max_iter):
+            if n == 0:
+                break
+            if cancel is not None and cancel():
+                raise RenderCancelled
+            zr, zi = active["zr"][:n], active["zi"][:n]
+            _iterate(zr, zi, active["cr"][:n] if cr is None else cr,
+                     active["ci"][:n] if ci is None else ci, family, degree, ws)
+
+            abs2, t = ws.get("abs2", n, dtype), ws.get("t1", n, dtype)
+            np.multiply(zr, zr, out=abs2)
+            np.multiply(zi, zi, out=t)
+            abs2 += t
+            escaped = np.greater_equal(abs2, 4.0, out=ws.get("escaped", n, bool))
+            escaped &= alive[:n]
+            if escaped.any():
+                escaped_idx = active["idx"][:n][escaped]
+                escape_time[escaped_idx] = i + 1
+                log_abs = 0.5 * np.log2(abs2[escaped].astype(np.float64))
+                smooth[escaped_idx] = i + 2 - np.log(log_abs) / np.log(degree)
+                alive[:n] &= ~escaped
+            if interior_checks:
+                t2 = ws.get("t2", n, dtype)
+                np.subtract(zr, active["sr"][:n], out=t)
+                t *= t
+                np.subtract(zi, active["si"][:n], out=t2)
+                t2 *= t2
+                t += t2
+                alive[:n] &= np.greater(t, tolerance2, out=ws.get("moving", n, bool))
+
+            m = np.count_nonzero(alive[:n])
+            if m <= n - COMPACT_FRACTION * n:
+                target = sets[1] if active is sets[0] else sets[0]
+                survivors = np.flatnonzero(alive[:n])
+                for name in names:
+                    np.take(active[name][:n], survivors, out=target[name][:m])
+                active, n = target, m
+                alive[:n] = True
+            if interior_checks and i + 1 == next_snapshot:
+                active["sr"][:n] = active["zr"][:n]
+                active["si"][:n] = active["zi"][:n]
+                next_snapshot *= 2
+
+    # Points that didn't escape get value 0
+    interior = escape_time == max_iter
+    escape_time[interior] = 0
+    smooth[interior] = 0
+    return escape_time.reshape(shape), smooth.reshape(shape)
+
+
+def kernel_for(fractal_type):
+    """Return an escape-time kernel bound to a fractal type from a tile key.
+
+    fractal_type is ("Mandelbrot",), ("Burning Ship",), ("Tricorn",),
+    ("Multibrot", power) or ("Julia", family, power, julia_c).
+    """
+    family = fractal_type[0]
+    if family == "Julia":
+        _, julia_family, power, julia_c = fractal_type
+        return partial(escape_time_kernel, family=julia_family, power=power, julia_c=julia_c)
+    if family == "Multibrot":
+        return partial(escape_time_kernel, family=family, power=fractal_type[1])
+    return partial(escape_time_kernel, family=family)
+
+
+def masked_escape_time(c, max_iter):
+    """Original full-grid kernel, kept as the reference for benchmarks."""
+    z = np.zeros_like(c)
+    escape_time = np.zeros(c.shape, dtype=int)
+    for i in range(max_iter):
+        mask = np.abs(z) < 2
+        z[mask] = z[mask]**2 + c[mask]
+        escape_time += mask
+    escape_time[escape_time == max_iter] = 0
+    return escape_time
+
+
+def _ranges(starts, counts):
+    """Concatenation of arange(start, start + count) for each start and count."""
+    ends = np.cumsum(counts)
+    if not ends.size or not ends[-1]:
+        return np.empty(0, dtype=np.int64)
+    return np.arange(ends[-1]) + np.repeat(starts - (ends - counts), counts)
+
+
+def _rect_borders(rects, width, height):
+    """Flat border pixel indices of inclusive rectangles and the rectangle of each."""
+    k, x0, x1, y0, y1 = rects
+    offset = k * width * height
+    xs, ys = x1 - x0 + 1, y1 - y0 - 1
+    ids = np.arange(len(k))
+    columns = _ranges(x0, xs) * height
+    rows = _ranges(y0 + 1, ys)
+    x_owner = np.repeat(ids, xs)
+    y_owner = np.repeat(ids, ys)
+    pixels = np.concatenate([np.repeat(offset, xs) + columns + np.repeat(y0, xs),
+                             np.repeat(offset, xs) + columns + np.repeat(y1, xs),
+                             np.repeat(offset + x0 * height, ys) + rows,
+                             np.repeat(offset + x1 * height, ys) + rows])
+    return pixels, np.concatenate([x_owner, x_owner, y_owner, y_owner])
+
+
+def _rect_interiors(rects, width, height):
+    """Flat interior pixel indices of inclusive rectangles, with (owner, x, y)."""
+    k, x0, x1, y0, y1 = rects
+    ids = np.repeat(np.arange(len(k)), x1 - x0 - 1)
+    x = _ranges(x0 + 1, x1 - x0 - 1)
+    ys = (y1 - y0 - 1)[ids]
+    owner = np.repeat(ids, ys)
+    x = np.repeat(x, ys)
+    y = _ranges(y0[ids] + 1, ys)
+    return k[owner] * width * height + x * height + y, owner, x, y
+
+
+def mariani_silver(real, imag, max_iter, kernel=escape_time_kernel, min_size=16, block=64):
+    """Compute escape times on the real x imag grid by rectangle subdivision.
+
+    The grid is cut into blocks of about block pixels and the border of each
+    block is computed first. If every border pixel has the same escape time,
+    the interior is filled without iterating it (the smooth iteration count is
+    interpolated from the border); otherwise the rectangle is split into four
+    and the process repeats until it is min_size pixels across, when its
+    interior is simply computed. Rectangles are processed level by level with
+    array operations, and each level is a single kernel call over the pending
+    border pixels and the interiors of the previous level's leaves.
+
+    real and imag may also be stacks of shape (n, width) and (n, height), in
+    which case the n tiles are subdivided together and the results have shape
+    (n, width, height). Returns (escape_time, smooth) like the kernel.
+    """
+    batched = np.ndim(real) == 2
+    real = np.atleast_2d(real)
+    imag = np.atleast_2d(imag)
+    n, width = real.shape
+    height = imag.shape[1]
+    result = np.full((n, width, height), -1, dtype=np.int32)
+    smooth = np.zeros((n, width, height), dtype=np.float32)
+    flat = result.ravel()
+    smooth_flat = smooth.ravel()
+
+    pending = np.zeros(flat.size, dtype=bool)
+
+    def evaluate(*indices):
+        for index in indices:
+            pending[index] = True
+        np.logical_and(pending, flat < 0, out=pending)
+        todo = np.flatnonzero(pending)
+        pending[todo] = False
+        if todo.size:
+            k, pixel = np.divmod(todo, width * height)
+            ix, iy = np.divmod(pixel, height)
+            flat[todo], smooth_flat[todo] = kernel((real[k, ix], imag[k, iy]), max_iter)
+
+    # Neighbouring blocks share their edges so that no pixel is left out
+    xs = np.linspace(0, width - 1, max(2, round(width / block) + 1)).astype(np.int64)
+    ys = np.linspace(0, height - 1, max(2, round(height / block) + 1)).astype(np.int64)
+    k, x, y = np.meshgrid(np.arange(n), np.arange(xs.size - 1), np.arange(ys.size - 1),
+                          indexing="ij")
+    k, x, y = k.ravel(), x.ravel(), y.ravel()
+    rects = (k, xs[x], xs[x + 1], ys[y], ys[y + 1])
+    leaves = np.empty(0, dtype=np.int64)
+    while rects[0].size:
+        border, owner = _rect_borders(rects, width, height)
+        evaluate(border, leaves)
+        k, x0, x1, y0, y1 = rects
+        values = flat[border]
+        first = flat[k * width * height + x0 * height + y0]
+        uniform = np.bincount(owner, values != first[owner], len(k)) == 0
+        hollow = (x1 - x0 >= 2) & (y1 - y0 >= 2)
+
+        filled = tuple(a[uniform & hollow] for a in rects)
+        pixels, inside, x, y = _rect_interiors(filled, width, height)
+        k, x0, x1, y0, y1 = filled
+        flat[pixels] = flat[k * width * height + x0 * height + y0][inside]
+        # Transfinite (Coons) interpolation of the border smooth counts
+        escaped = flat[pixels] != 0
+        pixels, inside, x, y = pixels[escaped], inside[escaped], x[escaped], y[escaped]
+        k, x0, x1, y0, y1 = (a[inside] for a in filled)
+        u = (x - x0) / (x1 - x0)
+        v = (y - y0) / (y1 - y0)
+        tile = k * width * height
+
+        def at(px, py):
+            return smooth_flat[tile + px * height + py]
+
+        smooth_flat[pixels] = ((1 - v) * at(x, y0) + v * at(x, y1)
+                               + (1 - u) * at(x0, y) + u * at(x1, y)
+                               - (1 - u) * (1 - v) * at(x0, y0) - u * (1 - v) * at(x1, y0)
+                               - (1 - u) * v * at(x0, y1) - u * v * at(x1, y1))
+
+        k, x0, x1, y0, y1 = rects
+        split = ~uniform & hollow
+        small = (x1 - x0 <= min_size) | (y1 - y0 <= min_size)
+        leaves = _rect_interiors(tuple(a[split & small] for a in rects), width, height)[0]
+        k, x0, x1, y0, y1 = (a[split & ~small] for a in rects)
+        xm = (x0 + x1) // 2
+        ym = (y0 + y1) // 2
+        rects = (np.tile(k, 4), np.concatenate([x0, xm, x0, xm]), np.concatenate([xm, x1, xm, x1]),
+                 np.concatenate([y0, y0, ym, ym]), np.concatenate([ym, ym, y1, y1]))
+    evaluate(leaves)
+    if not batched:
+        return result[0], smooth[0]
+    return result, smooth
+
+
+def colorize(escape_time, smooth, cmap, mode="Smooth", offset=0.0, reference=None):
+    """Map iteration data to an RGBA image without touching the kernel.
+
+    mode selects the value that is colored: "Smooth" uses the normalized
+    iteration count, "Escape time" the integer count and "Histogram" the rank
+    of each smooth value among all escaped points (histogram equalization).
+    offset shifts the palette of the escaped points, for palette cycling.
+    Interior points always get the bottom color of the map.
+
+    reference is an optional (escape_time, smooth) pair, usually a small
+    render of the same view, used for the normalization instead of the data
+    itself so that separately colored strips or frames match each other.
+    """
+    ref_escape, ref_smooth = reference if reference is not None else (escape_time, smooth)
+    ref_escaped = ref_escape > 0
+    escaped = escape_time > 0
+    values = np.zeros(escape_time.shape, dtype=np.float32)
+    if escaped.any() and ref_escaped.any():
+        if mode == "Escape time":
+            data = escape_time[escaped] / np.float32(ref_escape[ref_escaped].max())
+        elif mode == "Histogram":
+            ref = np.sort(ref_smooth[ref_escaped])
+            data = np.searchsorted(ref, smooth[escaped], side="right") / np.float32(ref.size)
+        else:
+            data = smooth[escaped] / ref_smooth[ref_escaped].max()
+        data = np.minimum(data, 1.0)
+        if offset:
+            data = (data + offset) % 1.0
+        values[escaped] = data
+    return matplotlib.colormaps[cmap](values, bytes=True)
+
+
+class TileCache:
+    """Memory-bounded LRU cache of rendered tiles with optional spill to disk.
+
+    Each tile is a tuple of arrays. When the memory budget is exceeded the
+    least recently used tiles are evicted; if spilling is enabled they are
+    written to a temporary directory and reloaded from there on the next hit
+    instead of being recomputed.
+    """
+
+    def __init__(self, max_bytes=128 * 2**20, max_disk_bytes=1024 * 2**20):
+        self.max_bytes = max_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.tiles = OrderedDict()
+        self.nbytes = 0
+        self.spill_dir = None
+        self.spilled = OrderedDict()  # key -> (path, nbytes)
+        self.disk_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.RLock()  # The GUI renders on a worker thread
+
+    def get(self, key):
+        """Return the cached tile for key, or None if it has to be computed."""
+        with self.lock:
+            return self._get(key)
+
+    def _get(self, key):
+        tile = self.tiles.get(key)
+        if tile is not None:
+            self.tiles.move_to_end(key)
+            self.hits += 1
+            return tile
+        if key in self.spilled:
+            path, nbytes = self.spilled.pop(key)
+            self.disk_bytes -= nbytes
+            with np.load(path) as data:
+                tile = tuple(data[name] for name in data.files)
+            os.remove(path)
+            self.hits += 1
+            self._put(key, tile)
+            return tile
+        self.misses += 1
+        return None
+
+    def put(self, key, tile):
+        """Store a tile, evicting the least recently used ones over budget."""
+        with self.lock:
+            self._put(key, tile)
+
+    def _put(self, key, tile):
+        if key in self.tiles:
+            self.nbytes -= sum(a.nbytes for a in self.tiles.pop(key))
+        self.tiles[key] = tile
+        self.nbytes += sum(a.nbytes for a in tile)
+        while self.nbytes > self.max_bytes and len(self.tiles) > 1:
+            old_key, old_tile = self.tiles.popitem(last=False)
+            nbytes = sum(a.nbytes for a in old_tile)
+            self.nbytes -= nbytes
+            if self.spill_dir is not None:
+                self._spill(old_key, old_tile, nbytes)
+
+    def _spill(self, key, tile, nbytes):
+        """Write an evicted tile to disk, keeping the spill directory within budget."""
+        name = hashlib.sha1(repr(key).encode()).hexdigest() + ".npz"
+        path = os.path.join(self.spill_dir, name)
+        np.savez(path, *tile)
+        self.spilled[key] = (path, nbytes)
+        self.disk_bytes += nbytes
+        while self.disk_bytes > self.max_disk_bytes:
+            _, (old_path, old_nbytes) = self.spilled.popitem(last=False)
+            os.remove(old_path)
+            self.disk_bytes -= old_nbytes
+
+    def set_spill(self, enabled):
+        """Enable or disable spilling evicted tiles to a temporary directory."""
+        with self.lock:
+            self._set_spill(enabled)
+
+    def _set_spill(self, enabled):
+        if enabled and self.spill_dir is None:
+            self.spill_dir = tempfile.mkdtemp(prefix="mandelbrot-tiles-")
+        elif not enabled and self.spill_dir is not None:
+            shutil.rmtree(self.spill_dir, ignore_errors=True)
+            self.spill_dir = None
+            self.spilled.clear()
+            self.disk_bytes = 0
+
+    def clear(self):
+        """Drop every cached tile, in memory and on disk."""
+        with self.lock:
+            self.tiles.clear()
+            self.nbytes = 0
+            self._set_spill(False)
+
+
+class RenderWorker:
+    """Background thread that only ever renders the most recent request.
+
+    submit() replaces the pending request and cancels the render in progress,
+    so a burst of parameter changes (a slider drag) is coalesced into a single
+    render that starts once submissions have been quiet for debounce seconds.
+    render(request, cancel) runs on the worker thread and should raise
+    RenderCancelled when cancel() becomes true. Finished results are collected
+    with poll() from the Tk thread, which also says whether to keep polling.
+    """
+
+    def __init__(self, render, debounce=RENDER_DEBOUNCE):
+        self.render = render
+        self.debounce = debounce
+        self.condition = threading.Condition()
+        self.cancel = threading.Event()
+        self.pending = None
+        self.submitted = 0.0
+        self.running = False
+        self.result = None
+        self.closed = False
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    @property
+    def busy(self):
+        """True while a request is waiting or being rendered."""
+        with self.condition:
+            return self.running or self.pending is not None
+
+    def submit(self, request):
+        """Queue request in place of any older one and abort the current render."""
+        with self.condition:
+            self.pending = request
+            self.submitted = time.perf_counter()
+            self.cancel.set()
+            self.condition.notify()
+
+    def poll(self):
+        """Return (finished, busy): the (request, result) of a finished render or None, and busy.
+
+        result is the exception instead if the render failed. Both are read
+        under one lock, so a render that finishes between the two can never
+        leave busy false with its result still uncollected.
+        """
+        with self.condition:
+            finished, self.result = self.result, None
+            return finished, self.running or self.pending is not None
+
+    def close(self):
+        """Stop the worker, aborting the render in progress."""
+        with self.condition:
+            self.closed = True
+            self.cancel.set()
+            self.condition.notify()
+        self.thread.join(timeout=1.0)
+
+    def _run(self):
+        while True:
+            with self.condition:
+                # Wait for a request, then until requests stop arriving
+                while not self.closed:
+                    if self.pending is None:
+                        self.condition.wait()
+                        continue
+                    quiet = time.perf_counter() - self.submitted
+                    if quiet >= self.debounce:
+                        break
+                    self.condition.wait(self.debounce - quiet)
+                if self.closed:
+                    return
+                request, self.pending = self.pending, None
+                self.cancel.clear()
+                self.running = True
+
+            try:
+                result = self.render(request, self.cancel.is_set)
+            except RenderCancelled:
+                result = None
+            except Exception as e:
+                result = e
+
+            with self.condition:
+                self.running = False
+                # A render superseded after it finished is still worth showing
+                if result is not None:
+                    self.result = (request, result)
+
+
+def _tiff_header(width, height, rows_per_strip):
+    """Build the header of an uncompressed 8-bit RGB TIFF with contiguous strips.
+
+    Returns (header bytes, offset of the pixel data).
+    """
+    n_strips = -(-height // rows_per_strip)
+    strip_bytes = rows_per_strip * width * 3
+    n_entries = 10
+    ifd_end = 8 + 2 + 12 * n_entries + 4
+    bits_offset = ifd_end
+    # A single strip offset and byte count fit in the IFD entry itself, and
+    # readers then take the value field as the value, not as a pointer
+    array_bytes = 4 * n_strips if n_strips > 1 else 0
+    offsets_offset = bits_offset + 6
+    counts_offset = offsets_offset + array_bytes
+    data_offset = counts_offset + array_bytes
+    data_offset += -data_offset % 16
+    offsets = [data_offset + i * strip_bytes for i in range(n_strips)]
+    last_rows = height - (n_strips - 1) * rows_per_strip
+    counts = [strip_bytes] * (n_strips - 1) + [last_rows * width * 3]
+
+    def entry(tag, kind, count, value):
+        if kind == 3 and count == 1:
+            return struct.pack("<HHIHH", tag, kind, count, value, 0)
+        return struct.pack("<HHII", tag, kind, count, value)
+
+    header = b"II*\0" + struct.pack("<I", 8) + struct.pack("<H", n_entries)
+    header += b"".join([
+        entry(256, 4, 1, width),                    # ImageWidth
+        entry(257, 4, 1, height),                   # ImageLength
+        entry(258, 3, 3, bits_offset),              # BitsPerSample
+        entry(259, 3, 1, 1),                        # Compression: none
+        entry(262, 3, 1, 2),                        # Photometric: RGB
+        entry(273, 4, n_strips, offsets_offset if array_bytes else offsets[0]),  # StripOffsets
+        entry(277, 3, 1, 3),                        # SamplesPerPixel
+        entry(278, 4, 1, rows_per_strip),           # RowsPerStrip
+        entry(279, 4, n_strips, counts_offset if array_bytes else counts[0]),  # StripByteCounts
+        entry(284, 3, 1, 1),                        # PlanarConfiguration: chunky
+    ])
+    header += struct.pack("<I", 0)
+    header += struct.pack("<3H", 8, 8, 8)
+    if array_bytes:
+        header += struct.pack(f"<{n_strips}I", *offsets)
+        header += struct.pack(f"<{n_strips}I", *counts)
+    header += b"\0" * (data_offset - len(header))
+    return header, data_offset
+
+
+def _png_chunk(kind, data):
+    """Encode one PNG chunk."""
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+
+def stream_png(path, pixels, rows_per_chunk=64):
+    """Write an (height, width, 3) uint8 array, e.g. a memmap, to PNG chunk by chunk."""
+    height, width, _ = pixels.shape
+    compressor = zlib.compressobj(6)
+    with open(path, "wb") as f:
+        f.write(b"\x89PNG\r\n\x1a\n")
+        f.write(_png_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)))
+        for row in range(0, height, rows_per_chunk):
+            block = np.asarray(pixels[row:row + rows_per_chunk])
+            # Every scanline starts with filter type 0 (none)
+            scanlines = np.zeros((block.shape[0], width * 3 + 1), dtype=np.uint8)
+            scanlines[:, 1:] = block.reshape(block.shape[0], -1)
+            data = compressor.compress(scanlines.tobytes())
+            if data:
+                f.write(_png_chunk(b"IDAT", data))
+        f.write(_png_chunk(b"IDAT", compressor.flush()))
+        f.write(_png_chunk(b"IEND", b""))
+
+
+def export_poster(path, width, height, view, max_iter, fractal_type=("Mandelbrot",),
+                  cmap="viridis", mode="Smooth", algorithm="Standard",
+                  progress=None, cancel=None):
+    """Render a large image in bounded-memory strips straight to disk.
+
+    view is (real_min, real_max, imag_min, imag_max). The output format
+    follows the extension: ".tif"/".tiff" writes an uncompressed RGB TIFF
+    whose pixel data is memory-mapped and filled strip by strip, ".raw"
+    writes a memory-mapped RGB buffer with a JSON header next to it, and
+    ".png" renders into a ".raw" scratch buffer that is streamed to PNG at
+    the end. Only one strip of about STRIP_PIXELS pixels is in memory at a
+    time.
+
+    The number of finished rows is recorded in path + ".progress.json", so
+    calling again with the same settings after an interruption resumes at
+    the first unfinished strip. progress(rows_done, height) is called after
+    each strip, and rendering stops early (resumable) when cancel() is true.
+    Returns True when the export finished.
+    """
+    real_min, real_max, imag_min, imag_max = view
+    kernel = partial(kernel_for(fractal_type), workspace=KernelWorkspace(),
+                     dtype=precision_for((real_max - real_min) / width))
+    settings = {
+        "width": width, "height": height, "view": list(view), "max_iter": max_iter,
+        "fractal_type": repr(fractal_type), "cmap": cmap, "mode": mode, "algorithm": algorithm,
+    }
+    extension = os.path.splitext(path)[1].lower()
+    target = path + ".raw" if extension == ".png" else path
+    progress_path = path + ".progress.json"
+
+    # Resume only if a previous run with identical settings left its state behind
+    start_row = 0
+    if os.path.exists(progress_path) and os.path.exists(target):
+        with open(progress_path) as f:
+            state = json.load(f)
+        if state["settings"] == settings:
+            start_row = state["rows_done"]
+
+    if extension in (".tif", ".tiff"):
+        header, data_offset = _tiff_header(width, height, POSTER_ROWS_PER_TIFF_STRIP)
+        if start_row == 0:
+            with open(target, "wb") as f:
+                f.write(header)
+                f.truncate(data_offset + width * height * 3)
+    else:
+        data_offset = 0
+        if start_row == 0:
+            with open(target, "wb") as f:
+                f.truncate(width * height * 3)
+            if extension == ".raw":
+                with open(path + ".json", "w") as f:
+                    json.dump(dict(settings, dtype="uint8", channels=3), f)
+    pixels = np.memmap(target, dtype=np.uint8, mode="r+", offset=data_offset, shape=(height, width, 3))
+
+    # A small render of the same view fixes the color normalization for every strip
+    preview_width = 400
+    preview_height = max(1, preview_width * height // width)
+    reference = kernel((np.linspace(real_min, real_max, preview_width)[:, np.newaxis],
+                        np.linspace(imag_min, imag_max, preview_height)[np.newaxis, :]), max_iter)
+
+    real = np.linspace(real_min, real_max, width)
+    rows_per_strip = max(1, STRIP_PIXELS // width)
+    for row in range(start_row, height, rows_per_strip):
+        if cancel is not None and cancel():
+            pixels.flush()
+            return False
+        # Image rows run from the top (imag_max) down
+        rows = np.arange(row, min(row + rows_per_strip, height))
+        imag = imag_max - (imag_max - imag_min) * rows / max(height - 1, 1)
+        if algorithm == "Mariani–Silver":
+            escape_time, smooth = mariani_silver(real, imag, max_iter, kernel=kernel)
+        else:
+            escape_time, smooth = kernel((real[:, np.newaxis], imag[np.newaxis, :]), max_iter)
+        rgba = colorize(escape_time, smooth, cmap, mode=mode, reference=reference)
+        pixels[row:row + len(rows)] = rgba[:, :, :3].transpose(1, 0, 2)
+
+        # Flush the strip before recording it as done so a resume never skips it
+        pixels.flush()
+        with open(progress_path + ".tmp", "w") as f:
+            json.dump({"settings": settings, "rows_done": int(rows[-1] + 1)}, f)
+        os.replace(progress_path + ".tmp", progress_path)
+        if progress is not None:
+            progress(int(rows[-1] + 1), height)
+
+    if extension == ".png":
+        stream_png(path, pixels)
+        del pixels
+        os.remove(target)
+    else:
+        del pixels
+    os.remove(progress_path)
+    return True
+
+
+def _resample_coords(fraction, n_out, n_in):
+    """Source indices and weights for linearly resampling the central fraction of an axis."""
+    position = (fraction * np.linspace(-1, 1, n_out) + 1) / 2 * (n_in - 1)
+    index = np.clip(np.floor(position).astype(int), 0, n_in - 2)
+    return index, (position - index).astype(np.float32)
+
+
+def render_zoom_video(output, center, start_scale, end_scale, frame_size=(800, 600),
+                      frames_per_octave=30, max_iter=500, fractal_type=("Mandelbrot",),
+                      cmap="viridis", mode="Histogram", supersample=2, algorithm="Standard",
+                      progress=None, cancel=None):
+    """Render a zoom into center from start_scale down to end_scale.
+
+    Keyframes are rendered once per halving of the scale (an octave), at
+    supersample times the frame resolution. Every frame between keyframe k
+    and the next one shows the central part of keyframe k's view, so it is
+    synthesized by resampling keyframe k instead of being rendered; only one
+    keyframe is held in memory. A low resolution render of every keyframe
+    view is made first and used as a common color reference, so colors do
+    not jump between octaves.
+
+    output is a directory for a PNG sequence, or a file name / "-" (stdout)
+    for raw rgb24 frames that can be piped into a video encoder. progress is
+    called as progress(frames_done, total_frames) and rendering stops early
+    when cancel() is true. Returns the average frames per second. Raises
+    ValueError unless 0 < end_scale < start_scale.
+    """
+    if not 0 < end_scale < start_scale:
+        raise ValueError(f"end scale {end_scale:g} must be positive and smaller than "
+                         f"the start scale {start_scale:g}")
+    width, height = frame_size
+    aspect = height / width
+    octaves = np.log2(start_scale / end_scale)
+    total_frames = int(np.floor(octaves * frames_per_octave)) + 1
+    n_keyframes = -(-total_frames // frames_per_octave)
+    kernel = partial(kernel_for(fractal_type), workspace=KernelWorkspace())
+    center_x, center_y = center
+
+    def view_points(scale, n_x, n_y):
+        real = np.linspace(center_x - scale, center_x + scale, n_x)
+        imag = np.linspace(center_y - scale * aspect, center_y + scale * aspect, n_y)
+        return real, imag
+
+    # Common color reference from small renders of every keyframe view
+    samples = []
+    for k in range(n_keyframes):
+        real, imag = view_points(start_scale * 2.0 ** -k, 160, max(1, int(160 * aspect)))
+        samples.append([a.ravel() for a in kernel((real[:, np.newaxis], imag[np.newaxis, :]), max_iter)])
+    reference = (np.concatenate([e for e, _ in samples]), np.concatenate([s for _, s in samples]))
+
+    if output == "-":
+        stream = sys.stdout.buffer
+    elif os.path.splitext(output)[1]:
+        stream = open(output, "wb")
+    else:
+        os.makedirs(output, exist_ok=True)
+        stream = None
+
+    start = time.perf_counter()
+    frames_done = 0
+    try:
+        for k in range(n_keyframes):
+            key_scale = start_scale * 2.0 ** -k
+            key_width, key_height = width * supersample, height * supersample
+            real, imag = view_points(key_scale, key_width, key_height)
+            key_kernel = partial(kernel, dtype=precision_for(2 * key_scale / key_width))
+            if algorithm == "Mariani–Silver":
+                escape_time, smooth = mariani_silver(real, imag, max_iter, kernel=key_kernel)
+            else:
+                escape_time, smooth = key_kernel((real[:, np.newaxis], imag[np.newaxis, :]), max_iter)
+            keyframe = colorize(escape_time, smooth, cmap, mode=mode, reference=reference)[:, :, :3]
+            keyframe = keyframe.astype(np.float32)
+
+            for i in range(k * frames_per_octave, min((k + 1) * frames_per_octave, total_frames)):
+                if cancel is not None and cancel():
+                    return frames_done / (time.perf_counter() - start)
+                fraction = start_scale * 2.0 ** (-i / frames_per_octave) / key_scale
+                x, wx = _resample_coords(fraction, width, key_width)
+                y, wy = _resample_coords(fraction, height, key_height)
+                columns = (keyframe[x] * (1 - wx)[:, np.newaxis, np.newaxis]
+                           + keyframe[x + 1] * wx[:, np.newaxis, np.newaxis])
+                frame = (columns[:, y] * (1 - wy)[np.newaxis, :, np.newaxis]
+                         + columns[:, y + 1] * wy[np.newaxis, :, np.newaxis])
+                # Image rows run from the top (largest imaginary part) down
+                frame = np.ascontiguousarray(frame.transpose(1, 0, 2)[::-1] + 0.5, dtype=np.uint8)
+                if stream is None:
+                    Image.fromarray(frame).save(os.path.join(output, f"frame_{i:05d}.png"))
+                else:
+                    stream.write(frame.tobytes())
+                frames_done += 1
+                if progress is not None:
+                    progress(frames_done, total_frames)
+    finally:
+        if stream is not None and output != "-":
+            stream.close()
+    return frames_done / (time.perf_counter() - start)
+
+
+def benchmark_kernels(width=800, height=600, max_iter=500, repeat=3):
+    """Time the rendering algorithms against the original kernel."""
+    views = [
+        ("Default view", -0.5, 0.0, 1.5),
+        ("Period-3 minibrot", -1.7549, 0.0, 0.03),
+    ]
+    for view_name, center_x, center_y, scale in views:
+        real = np.linspace(center_x - scale, center_x + scale, width)
+        imag = np.linspace(center_y - scale * height / width, center_y + scale * height / width, height)
+        c = real[:, np.newaxis] + 1j * imag[np.newaxis, :]
+        planes = (real[:, np.newaxis], imag[np.newaxis, :])
+        workspace = KernelWorkspace()
+        kernel = partial(escape_time_kernel, workspace=workspace)
+
+        cases = [
+            ("Original masked kernel", lambda: (masked_escape_time(c, max_iter),)),
+            ("Active-set kernel", lambda: kernel(planes, max_iter, interior_checks=False)),
+            ("Active-set + interior checks", lambda: kernel(planes, max_iter)),
+            ("Interior checks, float32", lambda: kernel(planes, max_iter, dtype=np.float32)),
+            ("Mariani–Silver", lambda: mariani_silver(real, imag, max_iter, kernel=kernel)),
+            ("Mariani–Silver, float32",
+             lambda: mariani_silver(real, imag, max_iter, kernel=partial(kernel, dtype=np.float32))),
+        ]
+        reference = masked_escape_time(c, max_iter)
+        print(f"{view_name}: {width}x{height}, max_iter={max_iter}, best of {repeat}")
+        for name, run in cases:
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                escape_time = run()[0]
+                timings.append(time.perf_counter() - start)
+            mismatch = np.mean(escape_time != reference) * 100
+            print(f"  {name:<30} {min(timings) * 1000:8.1f} ms   {mismatch:6.3f}% pixels differ")
+
 class FractalGUI:
     def __init__(self, root):
         self.root = root
         self.root.title("Interactive Mandelbrot Set Explorer")
         self.root.geometry("1200x800")
 
+        # Protocol for window close button
+        self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
+
         # Main frame setup
         main_frame = ctk.CTkFrame(root)
         main_frame.pack(fill="both", expand=True, padx=10, pady=10)
@@ -30,7 +964,7 @@ class FractalGUI:
         explanation_text.pack(fill="x", padx=5, pady=5)
         explanation_text.insert("1.0", """The Mandelbrot Set is a famous fractal named after Benoît Mandelbrot. It is defined as the set of complex numbers c for which the function f(z) = z² + c does not diverge when iterated from z=0.
 
-Explore the fractal by zooming in and out, panning, and adjusting the maximum number of iterations. Observe the intricate patterns and self-similarity at different scales.""")
+Explore the fractal by zooming in and out, panning, and adjusting the maximum number of iterations. Observe the intricate patterns and self-similarity at different scales. Other families (Burning Ship, Tricorn, z^n Multibrot) use the same escape-time idea; hover over the view to preview the matching Julia set and click to open it.""")
         explanation_text.configure(state="disabled")
 
         # Content frame
@@ -38,7 +972,7 @@ Explore the fractal by zooming in and out, panning, and adjusting the maximum nu
         content_frame.pack(fill="both", expand=True, padx=5, pady=5)
 
         # Control frame
-        control_frame = ctk.CTkFrame(content_frame)
+        control_frame = ctk.CTkScrollableFrame(content_frame, width=280)
         control_frame.pack(side="left", fill="y", padx=5, pady=5)
 
         # Plot frame
@@ -62,40 +996,149 @@ Explore the fractal by zooming in and out, panning, and adjusting the maximum nu
         # Reset button
         ctk.CTkButton(control_frame, text="Reset", command=self.reset_view).pack(fill="x", padx=5, pady=5)
 
+        # Fractal family selection
+        self.family_var = tk.StringVar(value=FAMILIES[0])
+        ctk.CTkLabel(control_frame, text="Fractal Family:").pack(pady=5)
+        ctk.CTkOptionMenu(control_frame, variable=self.family_var, values=FAMILIES,
+                          command=self.change_family).pack(fill="x", padx=5, pady=5)
+
+        # Multibrot power slider
+        self.power_var = tk.IntVar(value=3)
+        self.create_slider(control_frame, "Power (n):", self.power_var, 2, 8, 0)
+
         # Max iterations slider
         self.max_iter_var = tk.IntVar(value=100)
         self.create_slider(control_frame, "Max Iterations:", self.max_iter_var, 10, 500, 0)
 
+        # Rendering algorithm selection
+        self.algorithm_var = tk.StringVar(value=ALGORITHMS[0])
+        ctk.CTkLabel(control_frame, text="Algorithm:").pack(pady=5)
+        ctk.CTkOptionMenu(control_frame, variable=self.algorithm_var, values=ALGORITHMS,
+                          command=self.update_plot).pack(fill="x", padx=5, pady=5)
+
         # Color map selection
         self.cmap_var = tk.StringVar(value="viridis")
         cmap_options = ["viridis", "plasma", "inferno", "magma", "cividis"]
         ctk.CTkLabel(control_frame, text="Color Map:").pack(pady=5)
         ctk.CTkOptionMenu(control_frame, variable=self.cmap_var, values=cmap_options,
-                          command=self.update_plot).pack(fill="x", padx=5, pady=5)
+                          command=self.redraw).pack(fill="x", padx=5, pady=5)
+
+        # Coloring mode selection (post-processing only, no recompute)
+        self.coloring_var = tk.StringVar(value=COLORINGS[0])
+        ctk.CTkLabel(control_frame, text="Coloring:").pack(pady=5)
+        ctk.CTkOptionMenu(control_frame, variable=self.coloring_var, values=COLORINGS,
+                          command=self.redraw).pack(fill="x", padx=5, pady=5)
+
+        # Palette shift slider and cycling toggle
+        self.palette_shift_var = tk.IntVar(value=0)
+        self.create_slider(control_frame, "Palette Shift:", self.palette_shift_var, 0, 100, 1,
+                           command=self.redraw)
+        self.cycle_switch = ctk.CTkSwitch(control_frame, text="Cycle palette",
+                                          command=self.toggle_cycle)
+        self.cycle_switch.pack(fill="x", padx=5, pady=5)
+        self._cycle_job = None
+
+        # Tile cache spill toggle
+        self.spill_switch = ctk.CTkSwitch(control_frame, text="Spill tiles to disk",
+                                          command=self.toggle_spill)
+        self.spill_switch.pack(fill="x", padx=5, pady=5)
+
+        # Show renders in a plain Tk image instead of the matplotlib axes
+        self.direct_switch = ctk.CTkSwitch(control_frame, text="Direct Tk display",
+                                           command=self.toggle_direct)
+        self.direct_switch.pack(fill="x", padx=5, pady=5)
 
         # View label
         self.view_label_var = tk.StringVar()
         ctk.CTkLabel(control_frame, textvariable=self.view_label_var).pack(pady=5)
 
+        # Tile cache statistics label
+        self.cache_label_var = tk.StringVar()
+        ctk.CTkLabel(control_frame, textvariable=self.cache_label_var).pack(pady=5)
+
+        # Render status label
+        self.render_status_var = tk.StringVar()
+        ctk.CTkLabel(control_frame, textvariable=self.render_status_var).pack(pady=5)
+
+        # Poster export
+        ctk.CTkLabel(control_frame, text="Poster Export:").pack(pady=(10, 0))
+        self.poster_size_var = tk.StringVar(value=list(POSTER_SIZES)[0])
+        ctk.CTkOptionMenu(control_frame, variable=self.poster_size_var,
+                          values=list(POSTER_SIZES)).pack(fill="x", padx=5, pady=5)
+        self.export_button = ctk.CTkButton(control_frame, text="Export Poster…", command=self.toggle_export)
+        self.export_button.pack(fill="x", padx=5, pady=5)
+
+        # Zoom video from the initial view into the current center
+        self.video_button = ctk.CTkButton(control_frame, text="Zoom Video…", command=self.toggle_zoom_video)
+        self.video_button.pack(fill="x", padx=5, pady=5)
+
+        # Progress of the running export or video job
+        self.job_progress = ctk.CTkProgressBar(control_frame)
+        self.job_progress.set(0)
+        self.job_progress.pack(fill="x", padx=5, pady=5)
+        self.job_status_var = tk.StringVar()
+        ctk.CTkLabel(control_frame, textvariable=self.job_status_var).pack(pady=5)
+        self._job_thread = None
+        self._job_cancel = threading.Event()
+        self._job_state = None
+
+        # Linked Julia preview, rendered straight into a Tk image
+        ctk.CTkLabel(control_frame, text="Julia Preview (hover over the view):").pack(pady=(10, 0))
+        self.preview_image = ImageTk.PhotoImage(Image.new("RGBA", PREVIEW_SIZE))
+        tk.Label(control_frame, image=self.preview_image, bg="#1c1c1c").pack(padx=5, pady=5)
+        self.preview_info_var = tk.StringVar()
+        ctk.CTkLabel(control_frame, textvariable=self.preview_info_var).pack(pady=5)
+        self.preview_scale = 0.5  # Render resolution relative to PREVIEW_SIZE
+
         # Initialize Matplotlib plot
         self.fig, self.ax = plt.subplots(figsize=(8, 6))
         self.fig.patch.set_facecolor('#242424')
         self.ax.set_facecolor('#1c1c1c')
         self.canvas = FigureCanvasTkAgg(self.fig, master=self.plot_frame)
         self.canvas.get_tk_widget().pack(fill="both", expand=True)
+        self.canvas.mpl_connect("motion_notify_event", self.on_motion)
+        self.canvas.mpl_connect("button_press_event", self.on_click)
+        self.ax.set_xlabel('Re', color='white')
+        self.ax.set_ylabel('Im', color='white')
+        self.image = None  # Single AxesImage, updated in place by redraw
+
+        # Direct display: colored buffers are pasted straight into a Tk image
+        self.direct_image = None
+        self.direct_label = tk.Label(self.plot_frame, bg="#1c1c1c")
+        self.direct_label.bind("<Motion>", self.on_direct_motion)
+        self.direct_label.bind("<Button-1>", self.on_direct_click)
+        self.compute_time = 0.0
 
         # Initial view parameters
         self.center_x = -0.5
         self.center_y = 0
-        self.scale = 1.5  # Half the width of the view
+        self.base_scale = 1.5
+        self.scale = self.base_scale  # Half the width of the view
         self.zoom_factor = 0.5
         self.pan_factor = 0.1
 
+        # Map and constant used by the Julia family
+        self.julia_family = "Mandelbrot"
+        self.julia_c = complex(-0.8, 0.156)
+
+        # Rendered tiles shared by every view
+        self.tile_cache = TileCache()
+        self.workspace = KernelWorkspace()
+        self.preview_workspace = KernelWorkspace()
+
+        # Renders run on a worker thread; the old image stays up until they finish
+        self.renderer = RenderWorker(self.render_view)
+        self._render_poll = None
+
         # Draw initial plot
         self.update_plot()
 
-    def create_slider(self, parent, label, variable, min_val, max_val, row):
-        """Create a slider with label and value display."""
+    def create_slider(self, parent, label, variable, min_val, max_val, row, command=None):
+        """Create a slider with label and value display.
+
+        command is called when the value changes; it defaults to update_plot.
+        """
+        command = command or self.update_plot
         frame = ctk.CTkFrame(parent)
         frame.pack(fill="x", padx=5, pady=3)
 
@@ -118,53 +1161,196 @@ Explore the fractal by zooming in and out, panning, and adjusting the maximum nu
 
         def update_label_and_plot(*args):
             value_label.configure(text=f"{variable.get()}")
-            self.update_plot()
+            command()
 
         variable.trace_add("write", update_label_and_plot)
         return slider
 
-    def compute_mandelbrot(self, width, height, max_iter):
-        """Compute the Mandelbrot Set for the current view."""
-        real_min = self.center_x - self.scale
-        real_max = self.center_x + self.scale
-        imag_min = self.center_y - self.scale * height / width
-        imag_max = self.center_y + self.scale * height / width
+    def zoom_level(self):
+        """Return the tile lattice level matching the current scale."""
+        return int(round(np.log2(self.base_scale / self.scale)))
 
-        real = np.linspace(real_min, real_max, width)
-        imag = np.linspace(imag_min, imag_max, height)
-        c = real[:, np.newaxis] + 1j * imag[np.newaxis, :]
+    def fractal_type(self):
+        """Return the hashable description of the current family used in tile keys."""
+        family = self.family_var.get()
+        if family == "Julia":
+            power = self.power_var.get() if self.julia_family == "Multibrot" else 2
+            return (family, self.julia_family, power, self.julia_c)
+        if family == "Multibrot":
+            return (family, self.power_var.get())
+        return (family,)
 
-        z = np.zeros_like(c)
-        escape_time = np.zeros(c.shape, dtype=int)
+    def render_request(self):
+        """Snapshot everything a render of the current view depends on."""
+        return {
+            "width": 800, "height": 600, "max_iter": self.max_iter_var.get(),
+            "center": (self.center_x, self.center_y), "level": self.zoom_level(),
+            "fractal_type": self.fractal_type(), "algorithm": self.algorithm_var.get(),
+        }
 
-        for i in range(max_iter):
-            mask = np.abs(z) < 2
-            z[mask] = z[mask]**2 + c[mask]
-            escape_time += mask
+    def compute_tiles(self, keys, pixel, max_iter, cancel=None):
+        """Render a batch of missing tiles with a single kernel call."""
+        offsets = np.arange(TILE_SIZE)
+        real = np.array([(tx * TILE_SIZE + offsets) * pixel for _, tx, *_ in keys])
+        imag = np.array([(ty * TILE_SIZE + offsets) * pixel for _, _, ty, *_ in keys])
+        kernel = partial(kernel_for(keys[0][4]), dtype=precision_for(pixel),
+                         workspace=self.workspace, cancel=cancel)
+
+        if keys[0][5] == "Mariani–Silver":
+            escape_time, smooth = mariani_silver(real, imag, max_iter, kernel=kernel)
+        else:
+            escape_time, smooth = kernel((real[:, :, np.newaxis], imag[:, np.newaxis, :]), max_iter)
+        return list(zip(escape_time, smooth))
+
+    def compute_mandelbrot(self, request, cancel=None):
+        """Compute the fractal for a render request, reusing cached tiles.
+
+        Runs on the render worker, so it reads only the request and never
+        touches Tk. Returns (escape_time, smooth, extent, (computed, cached)).
+        """
+        width, height, max_iter = request["width"], request["height"], request["max_iter"]
+        center_x, center_y = request["center"]
+        level = request["level"]
+        pixel = TILE_BASE_PIXEL * 2.0 ** -level
+
+        # Pixel range of the view on this level's lattice
+        ix0 = int(np.floor(center_x / pixel)) - width // 2
+        iy0 = int(np.floor(center_y / pixel)) - height // 2
+        tx0, ty0 = ix0 // TILE_SIZE, iy0 // TILE_SIZE
+        tx1 = (ix0 + width - 1) // TILE_SIZE
+        ty1 = (iy0 + height - 1) // TILE_SIZE
+
+        # Mariani–Silver tiles are not exact, so they never stand in for Standard ones
+        fractal_type = request["fractal_type"]
+        keys = [(level, tx, ty, max_iter, fractal_type, request["algorithm"])
+                for tx in range(tx0, tx1 + 1) for ty in range(ty0, ty1 + 1)]
+        tiles = {key: self.tile_cache.get(key) for key in keys}
+        missing = [key for key, tile in tiles.items() if tile is None]
+        if missing:
+            computed = self.compute_tiles(missing, pixel, max_iter, cancel)
+            for key, tile in zip(missing, computed):
+                self.tile_cache.put(key, tile)
+                tiles[key] = tile
 
-        # Points that didn't escape get value 0
-        escape_time[escape_time == max_iter] = 0
-        return escape_time, real_min, real_max, imag_min, imag_max
+        shape = ((tx1 - tx0 + 1) * TILE_SIZE, (ty1 - ty0 + 1) * TILE_SIZE)
+        escape_mosaic = np.empty(shape, dtype=np.int32)
+        smooth_mosaic = np.empty(shape, dtype=np.float32)
+        for (_, tx, ty, *_), (escape_time, smooth) in tiles.items():
+            x = (tx - tx0) * TILE_SIZE
+            y = (ty - ty0) * TILE_SIZE
+            escape_mosaic[x:x + TILE_SIZE, y:y + TILE_SIZE] = escape_time
+            smooth_mosaic[x:x + TILE_SIZE, y:y + TILE_SIZE] = smooth
+
+        x = ix0 - tx0 * TILE_SIZE
+        y = iy0 - ty0 * TILE_SIZE
+        escape_time = escape_mosaic[x:x + width, y:y + height]
+        smooth = smooth_mosaic[x:x + width, y:y + height]
+
+        real_min, real_max = ix0 * pixel, (ix0 + width - 1) * pixel
+        imag_min, imag_max = iy0 * pixel, (iy0 + height - 1) * pixel
+        extent = (real_min, real_max, imag_min, imag_max)
+        return escape_time, smooth, extent, (len(missing), len(keys) - len(missing))
+
+    def render_view(self, request, cancel):
+        """Render worker entry point; adds the compute time to the result."""
+        start = time.perf_counter()
+        result = self.compute_mandelbrot(request, cancel)
+        return result + (time.perf_counter() - start,)
 
     def update_plot(self, *args):
-        """Update the fractal plot based on current parameters."""
-        width, height = 800, 600
-        max_iter = self.max_iter_var.get()
-        cmap = self.cmap_var.get()
+        """Request a render of the current parameters without blocking the UI.
+
+        Rapid changes are coalesced by the render worker and the previous
+        image stays on screen until the newest render is ready.
+        """
+        self.renderer.submit(self.render_request())
+        self.render_status_var.set("Rendering…")
+        if self._render_poll is None:
+            self._render_poll = self.root.after(RENDER_POLL_MS, self.poll_render)
 
-        escape_time, real_min, real_max, imag_min, imag_max = self.compute_mandelbrot(width, height, max_iter)
+    def poll_render(self):
+        """Show a finished render and keep polling while the worker is busy."""
+        finished, busy = self.renderer.poll()
+        if finished is not None:
+            self.show_render(*finished)
+        if busy:
+            self._render_poll = self.root.after(RENDER_POLL_MS, self.poll_render)
+        else:
+            self._render_poll = None
 
-        # Update view label
+    def show_render(self, request, result):
+        """Install a finished render as the current image."""
+        if isinstance(result, Exception):
+            self.render_status_var.set(f"Render failed: {result}")
+            return
+        self.escape_time, self.smooth, self.extent, (computed, cached), elapsed = result
+        real_min, real_max, imag_min, imag_max = self.extent
+
+        # Update view, cache and timing labels
         self.view_label_var.set(f"View: Re [{real_min:.2f}, {real_max:.2f}], Im [{imag_min:.2f}, {imag_max:.2f}]")
+        self.cache_label_var.set(f"Tiles: {computed} computed, {cached} cached "
+                                 f"({self.tile_cache.nbytes / 2**20:.0f} MB)")
+        self.compute_time = elapsed
+        self.redraw()
+        if self.renderer.busy:
+            self.render_status_var.set(self.render_status_var.get() + " (newer render pending)")
 
-        # Redraw plot
-        self.ax.clear()
-        self.ax.imshow(escape_time.T, origin='lower', extent=(real_min, real_max, imag_min, imag_max), cmap=cmap)
-        self.ax.set_title('Mandelbrot Set', color='white')
-        self.ax.set_xlabel('Re', color='white')
-        self.ax.set_ylabel('Im', color='white')
+    def redraw(self, *args):
+        """Recolor the cached iteration buffers; palette changes never recompute."""
+        if not hasattr(self, "escape_time"):
+            return
+        start = time.perf_counter()
+        rgba = colorize(self.escape_time, self.smooth, self.cmap_var.get(),
+                        mode=self.coloring_var.get(), offset=self.palette_shift_var.get() / 100)
+        color_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        if self.direct_switch.get():
+            self.draw_direct(rgba)
+        else:
+            self.draw_axes(rgba)
+        draw_time = time.perf_counter() - start
+        self.render_status_var.set(f"Compute {self.compute_time * 1000:.0f} ms, color {color_time * 1000:.0f} ms, "
+                                   f"draw {draw_time * 1000:.0f} ms")
+
+    def draw_axes(self, rgba):
+        """Show a colored buffer by updating the persistent AxesImage in place."""
+        data = rgba.transpose(1, 0, 2)
+        if self.image is None:
+            self.image = self.ax.imshow(data, origin='lower', extent=self.extent)
+        else:
+            self.image.set_data(data)
+            self.image.set_extent(self.extent)
+        family = self.family_var.get()
+        if family == "Julia":
+            title = f"Julia Set, c = {self.julia_c.real:.4f} {self.julia_c.imag:+.4f}i"
+        elif family == "Multibrot":
+            title = f"Multibrot Set (n = {self.power_var.get()})"
+        else:
+            title = f"{family} Set"
+        self.ax.set_title(title, color='white')
         self.canvas.draw()
 
+    def draw_direct(self, rgba):
+        """Paste a colored buffer into the Tk image, bypassing matplotlib."""
+        # Image rows run from the top (largest imaginary part) down
+        image = Image.fromarray(np.ascontiguousarray(rgba.transpose(1, 0, 2)[::-1]))
+        if self.direct_image is None or (self.direct_image.width(), self.direct_image.height()) != image.size:
+            self.direct_image = ImageTk.PhotoImage(image)
+            self.direct_label.configure(image=self.direct_image)
+        else:
+            self.direct_image.paste(image)
+
+    def toggle_direct(self):
+        """Swap between the matplotlib axes and the direct Tk display."""
+        if self.direct_switch.get():
+            self.canvas.get_tk_widget().pack_forget()
+            self.direct_label.pack(fill="both", expand=True)
+        else:
+            self.direct_label.pack_forget()
+            self.canvas.get_tk_widget().pack(fill="both", expand=True)
+        self.redraw()
+
     def zoom_in(self):
         """Zoom in by reducing the scale."""
         self.scale *= self.zoom_factor
@@ -190,12 +1376,273 @@ Explore the fractal by zooming in and out, panning, and adjusting the maximum nu
 
     def reset_view(self):
         """Reset to the initial view."""
-        self.center_x = -0.5
-        self.center_y = 0
-        self.scale = 1.5
+        self.center_x, self.center_y = FAMILY_CENTERS[self.family_var.get()]
+        self.scale = self.base_scale
         self.update_plot()
 
+    def change_family(self, *args):
+        """Switch fractal family and show its initial view."""
+        self.reset_view()
+
+    def on_click(self, event):
+        """Open the Julia set of the clicked point of a parameter-plane view."""
+        if event.inaxes is not self.ax or event.button != 1:
+            return
+        self.open_julia(complex(event.xdata, event.ydata))
+
+    def on_motion(self, event):
+        """Update the linked Julia preview for the point under the mouse."""
+        if event.inaxes is not self.ax or self.family_var.get() == "Julia":
+            return
+        self.update_preview(complex(event.xdata, event.ydata))
+
+    def direct_point(self, event):
+        """Map a Tk event on the direct display to a point of the plane, or None."""
+        if self.direct_image is None:
+            return None
+        # The image is centered in the label
+        width, height = self.direct_image.width(), self.direct_image.height()
+        x = event.x - (self.direct_label.winfo_width() - width) / 2
+        y = event.y - (self.direct_label.winfo_height() - height) / 2
+        if not (0 <= x < width and 0 <= y < height):
+            return None
+        real_min, real_max, imag_min, imag_max = self.extent
+        return complex(real_min + (real_max - real_min) * x / max(width - 1, 1),
+                       imag_max - (imag_max - imag_min) * y / max(height - 1, 1))
+
+    def on_direct_click(self, event):
+        """Open the Julia set of the point clicked on the direct display."""
+        c = self.direct_point(event)
+        if c is not None:
+            self.open_julia(c)
+
+    def on_direct_motion(self, event):
+        """Update the Julia preview for the point under the mouse on the direct display."""
+        c = self.direct_point(event)
+        if c is not None and self.family_var.get() != "Julia":
+            self.update_preview(c)
+
+    def open_julia(self, c):
+        """Switch to the Julia set of c for the current parameter-plane family."""
+        if self.family_var.get() == "Julia":
+            return
+        self.julia_family = self.family_var.get()
+        self.julia_c = c
+        self.family_var.set("Julia")
+        self.change_family()
+
+    def update_preview(self, c):
+        """Render the Julia set of c, adapting the resolution to the time budget."""
+        start = time.perf_counter()
+        width = max(16, int(PREVIEW_SIZE[0] * self.preview_scale))
+        height = width * PREVIEW_SIZE[1] // PREVIEW_SIZE[0]
+        real = np.linspace(-1.6, 1.6, width)
+        imag = np.linspace(-1.2, 1.2, height)
+
+        escape_time, smooth = escape_time_kernel(
+            (real[:, np.newaxis], imag[np.newaxis, :]), min(self.max_iter_var.get(), 200),
+            family=self.family_var.get(), power=self.power_var.get(), julia_c=c,
+            dtype=np.float32, workspace=self.preview_workspace)
+        rgba = colorize(escape_time, smooth, self.cmap_var.get(), mode=self.coloring_var.get())
+        image = Image.fromarray(rgba.transpose(1, 0, 2)[::-1]).resize(PREVIEW_SIZE, Image.NEAREST)
+        self.preview_image.paste(image)
+
+        # Adapt the resolution so the next preview stays within budget
+        elapsed = time.perf_counter() - start
+        if elapsed > PREVIEW_BUDGET:
+            self.preview_scale = max(0.1, self.preview_scale * 0.8)
+        elif elapsed < PREVIEW_BUDGET / 2:
+            self.preview_scale = min(1.0, self.preview_scale * 1.25)
+        self.preview_info_var.set(f"c = {c.real:.4f} {c.imag:+.4f}i ({elapsed * 1000:.0f} ms, {width}×{height})")
+
+    def toggle_cycle(self):
+        """Start or stop cycling the palette."""
+        if self.cycle_switch.get():
+            self.cycle_palette()
+        elif self._cycle_job is not None:
+            self.root.after_cancel(self._cycle_job)
+            self._cycle_job = None
+
+    def cycle_palette(self):
+        """Advance the palette shift by one step and schedule the next one."""
+        self.palette_shift_var.set((self.palette_shift_var.get() + 1) % 100)
+        self._cycle_job = self.root.after(50, self.cycle_palette)
+
+    def toggle_export(self):
+        """Start a poster export of the current view, or cancel the running job."""
+        if self._job_thread is not None:
+            self._job_cancel.set()
+            return
+        path = filedialog.asksaveasfilename(
+            title="Export Poster", defaultextension=".tiff",
+            filetypes=[("TIFF image", "*.tiff *.tif"), ("PNG image", "*.png"), ("Raw RGB buffer", "*.raw")])
+        if not path:
+            return
+
+        width, height = POSTER_SIZES[self.poster_size_var.get()]
+
+        def export(**kwargs):
+            finished = export_poster(path, width, height, self.extent, self.max_iter_var.get(), **kwargs)
+            return "Done" if finished else "Paused (export again to resume)"
+
+        self.start_job(export, "rows", height, self.export_button,
+                       algorithm=self.algorithm_var.get(), mode=self.coloring_var.get())
+
+    def toggle_zoom_video(self):
+        """Render a zoom from the initial view into the current center, or cancel the running job."""
+        if self._job_thread is not None:
+            self._job_cancel.set()
+            return
+        if self.scale >= self.base_scale:
+            self.job_status_var.set("Zoom in to choose the target first")
+            return
+        output = filedialog.askdirectory(title="Folder for the zoom video frames")
+        if not output:
+            return
+
+        center = (self.center_x, self.center_y)
+        frames_per_octave = 30
+        total = int(np.floor(np.log2(self.base_scale / self.scale) * frames_per_octave)) + 1
+
+        def render(**kwargs):
+            fps = render_zoom_video(output, center, self.base_scale, self.scale, max_iter=self.max_iter_var.get(),
+                                    frames_per_octave=frames_per_octave, **kwargs)
+            return f"{fps:.1f} frames/s"
+
+        self.start_job(render, "frames", total, self.video_button,
+                       algorithm=self.algorithm_var.get(), mode=self.coloring_var.get())
+
+    def start_job(self, func, unit, total, button, **kwargs):
+        """Run an export job on a worker thread with progress shown in the panel."""
+        kwargs.update(fractal_type=self.fractal_type(), cmap=self.cmap_var.get(),
+                      progress=self.on_job_progress, cancel=self._job_cancel.is_set)
+        self._job_cancel.clear()
+        self._job_state = (0, total, unit, time.perf_counter(), None)
+        self._job_button = button
+        self._job_button_text = button.cget("text")
+        self._job_thread = threading.Thread(target=self.run_job, args=(func,), kwargs=kwargs, daemon=True)
+        self._job_thread.start()
+        button.configure(text="Cancel")
+        self.poll_job()
+
+    def run_job(self, func, **kwargs):
+        """Job worker; the result, or the exception raised, is picked up by poll_job."""
+        try:
+            result = func(**kwargs)
+        except Exception as e:
+            result = e
+        self._job_state = self._job_state[:4] + (result,)
+
+    def on_job_progress(self, done, total):
+        """Record job progress from the worker thread."""
+        self._job_state = (done, total) + self._job_state[2:]
+
+    def poll_job(self):
+        """Show job progress; Tk widgets are only touched from the main thread."""
+        done, total, unit, start, result = self._job_state
+        self.job_progress.set(done / total)
+        elapsed = time.perf_counter() - start
+        if result is None:
+            self.job_status_var.set(f"{done}/{total} {unit}, {elapsed:.0f} s")
+            self.root.after(200, self.poll_job)
+        else:
+            if isinstance(result, Exception):
+                result = f"Failed ({getattr(result, 'strerror', None) or result})"
+            self.job_status_var.set(f"{result}: {done}/{total} {unit} in {elapsed:.0f} s")
+            self._job_button.configure(text=self._job_button_text)
+            self._job_thread = None
+
+    def toggle_spill(self):
+        """Enable or disable spilling evicted tiles to disk."""
+        self.tile_cache.set_spill(self.spill_switch.get())
+
+    def on_closing(self):
+        # Stop a running job; poster exports can be resumed later
+        self._job_cancel.set()
+
+        # Stop the render worker
+        self.renderer.close()
+        if self._render_poll is not None:
+            self.root.after_cancel(self._render_poll)
+
+        # Stop palette cycling
+        if self._cycle_job is not None:
+            self.root.after_cancel(self._cycle_job)
+
+        # Remove spilled tiles
+        self.tile_cache.clear()
+
+        # Close matplotlib figure
+        plt.close(self.fig)
+
+        # Destroy the window
+        self.root.destroy()
+
 def main():
+    parser = argparse.ArgumentParser(description="Interactive Mandelbrot Set Explorer")
+    parser.add_argument("--benchmark", action="store_true",
+                        help="time the rendering algorithms and exit")
+    parser.add_argument("--export", metavar="PATH",
+                        help="render a poster to PATH (.tiff, .png or .raw) and exit; "
+                             "rerun the same command to resume an interrupted export")
+    parser.add_argument("--zoom-video", metavar="OUTPUT",
+                        help="render a zoom from --scale down to --end-scale into --center and exit; "
+                             "OUTPUT is a folder for PNG frames, or a file or - for raw rgb24 frames")
+    parser.add_argument("--end-scale", type=float, default=1e-6, help="final half width of the zoom video")
+    parser.add_argument("--frames-per-octave", type=int, default=30,
+                        help="zoom video frames per halving of the view")
+    parser.add_argument("--size", help="poster size (default 20000x15000) or video frame size "
+                                       "(default 800x600) as WIDTHxHEIGHT")
+    parser.add_argument("--center", default="-0.5,0", help="view center as RE,IM")
+    parser.add_argument("--scale", type=float, default=1.5, help="half the width of the view")
+    parser.add_argument("--max-iter", type=int, default=500)
+    parser.add_argument("--family", default="Mandelbrot", choices=[f for f in FAMILIES if f != "Julia"])
+    parser.add_argument("--power", type=int, default=3, help="power of the Multibrot family")
+    parser.add_argument("--julia-c", metavar="RE,IM", help="render the Julia set of the family for this c")
+    parser.add_argument("--cmap", default="viridis")
+    parser.add_argument("--coloring", choices=COLORINGS,
+                        help="coloring mode (default Smooth for posters, Histogram for zoom videos)")
+    args = parser.parse_args()
+    if args.zoom_video and not 0 < args.end_scale < args.scale:
+        parser.error("--end-scale must be positive and smaller than --scale")
+
+    if args.benchmark:
+        benchmark_kernels()
+        return
+
+    center_x, center_y = (float(v) for v in args.center.split(","))
+    power = args.power if args.family == "Multibrot" else 2
+    if args.julia_c:
+        fractal_type = ("Julia", args.family, power, complex(*(float(v) for v in args.julia_c.split(","))))
+    elif args.family == "Multibrot":
+        fractal_type = (args.family, power)
+    else:
+        fractal_type = (args.family,)
+
+    start = time.perf_counter()
+
+    def report(done, total):
+        elapsed = time.perf_counter() - start
+        print(f"\r{done}/{total} ({done / total:.0%}), {elapsed:.0f} s", end="", flush=True, file=sys.stderr)
+
+    if args.export:
+        width, height = (int(v) for v in (args.size or "20000x15000").lower().split("x"))
+        half_height = args.scale * height / width
+        view = (center_x - args.scale, center_x + args.scale, center_y - half_height, center_y + half_height)
+        export_poster(args.export, width, height, view, args.max_iter, fractal_type,
+                      cmap=args.cmap, mode=args.coloring or "Smooth", progress=report)
+        print(file=sys.stderr)
+        return
+
+    if args.zoom_video:
+        frame_size = tuple(int(v) for v in (args.size or "800x600").lower().split("x"))
+        fps = render_zoom_video(args.zoom_video, (center_x, center_y), args.scale, args.end_scale,
+                                frame_size=frame_size, frames_per_octave=args.frames_per_octave,
+                                max_iter=args.max_iter, fractal_type=fractal_type, cmap=args.cmap,
+                                mode=args.coloring or "Histogram", progress=report)
+        print(f"\n{fps:.1f} frames/s", file=sys.stderr)
+        return
+
     root = ctk.CTk()
     app = FractalGUI(root)
     root.mainloop()
@@ -1,5 +1,15 @@
+import argparse
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, wait
 import numpy as np
 import matplotlib.pyplot as plt
+from matplotlib.animation import FuncAnimation
+from matplotlib.colors import TwoSlopeNorm
 from scipy.integrate import odeint
 import customtkinter as ctk
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
@@ -10,11 +20,417 @@ import tkinter as tk
 ctk.set_appearance_mode("dark")
 ctk.set_default_color_theme("blue")
 
+MODES = ["Static", "Live", "Ensemble", "Atlas"]
+
+# Static mode: trajectories are sampled every TRAJECTORY_DT so a longer t_max
+# only adds points, and solved in whole TRAJECTORY_SEGMENT stretches of model
+# time; slider values are rounded to TRAJECTORY_QUANTUM before solving, and
+# solved trajectories are kept up to TRAJECTORY_CACHE_BYTES
+TRAJECTORY_DT = 0.005
+TRAJECTORY_SEGMENT = 10.0
+TRAJECTORY_QUANTUM = 0.01
+TRAJECTORY_CACHE_BYTES = 64 * 2**20
+
+# Live mode: RK4 step in model time units, model time advanced per second of
+# wall clock, ring buffer capacity (a trail as long as the largest t_max) and
+# milliseconds between frames
+LIVE_DT = 0.01
+LIVE_SPEED = 2.0
+LIVE_CAPACITY = 10000
+LIVE_INTERVAL_MS = 33
+
+# Ensemble mode: RK4 step, steps per published snapshot and milliseconds
+# between frames (a full 3D redraw of 10⁵ points takes about 60 ms)
+ENSEMBLE_DT = 0.01
+ENSEMBLE_SUBSTEPS = 4
+ENSEMBLE_INTERVAL_MS = 50
+
+# Atlas: the swept (σ, β, ρ) grid, where every cell starts, RK4 step,
+# transient and measuring time, steps between Lyapunov renormalizations
+# (also the thumbnail stride), thumbnail points, shadow separation, cells
+# per pool task, milliseconds between progress polls and the cache
+ATLAS_SIGMAS = np.linspace(0.5, 20, 40)
+ATLAS_BETAS = np.array([1.0, 2.0, 8 / 3, 4.0])
+ATLAS_RHOS = np.linspace(1, 50, 50)
+ATLAS_START = (1.0, 1.0, 1.0)
+ATLAS_DT = 0.01
+ATLAS_TRANSIENT = 20.0
+ATLAS_T = 50.0
+ATLAS_SAMPLE_STEPS = 5
+ATLAS_THUMBNAIL_POINTS = 256
+ATLAS_D0 = 1e-8
+ATLAS_BATCH = 1000
+ATLAS_POLL_MS = 100
+ATLAS_CACHE_DIR = os.path.join(tempfile.gettempdir(), "lorenz-atlas")
+
+# Largest Lyapunov exponents above this count as chaotic, below its negative
+# as settling on a fixed point, and in between as periodic
+ATLAS_CHAOS_THRESHOLD = 0.05
+
+class LorenzEngine:
+    """Classic RK4 for a batch of Lorenz states, advanced in place.
+
+    States are stored component-major, shape (3, M), so x, y and z are each
+    contiguous; that makes the batched derivative about three times faster
+    than an (M, 3) layout. σ, β and ρ may be changed between steps.
+    """
+
+    def __init__(self, sigma, beta, rho, h):
+        self.sigma, self.beta, self.rho = sigma, beta, rho
+        self.h = h
+        self._buffers = None
+
+    def derivatives(self, state, out, scratch):
+        x, y, z = state
+        dx, dy, dz = out
+        np.subtract(y, x, out=dx)
+        dx *= self.sigma
+        np.subtract(self.rho, z, out=dy)
+        dy *= x
+        dy -= y
+        np.multiply(x, y, out=dz)
+        np.multiply(z, self.beta, out=scratch)
+        dz -= scratch
+
+    def step(self, state, steps=1):
+        """Advance state by steps RK4 steps."""
+        if self._buffers is None or self._buffers[0].shape != state.shape:
+            self._buffers = [np.empty_like(state) for _ in range(5)] + [np.empty_like(state[0])]
+        k1, k2, k3, k4, stage, scratch = self._buffers
+        h = self.h
+        for _ in range(steps):
+            self.derivatives(state, k1, scratch)
+            np.multiply(k1, h / 2, out=stage)
+            stage += state
+            self.derivatives(stage, k2, scratch)
+            np.multiply(k2, h / 2, out=stage)
+            stage += state
+            self.derivatives(stage, k3, scratch)
+            np.multiply(k3, h, out=stage)
+            stage += state
+            self.derivatives(stage, k4, scratch)
+            k2 += k3
+            k2 *= 2
+            k1 += k2
+            k1 += k4
+            k1 *= h / 6
+            state += k1
+
+class TrajectoryCache:
+    """Least recently used cache of solved trajectories under a memory budget.
+
+    Entries are keyed by the quantized (σ, β, ρ, x₀, y₀, z₀) and hold the
+    longest trajectory solved for them so far, sampled every dt. A shorter
+    t_max is a slice of it; a longer one carries on from its last point, so
+    only the new stretch is solved.
+
+    Restarting the solver changes the solution after the restart point (its
+    step sizes start over), and on a chaotic attractor that difference
+    grows. Trajectories are therefore always solved in whole segments,
+    restarted at the same multiples of segment whatever t_max values were
+    asked for before, so an entry is the same for its key however it was
+    built. It is not the single solve from 0 to t_max, which is no closer
+    to the true trajectory than this one.
+    """
+
+    def __init__(self, rhs, dt=TRAJECTORY_DT, quantum=TRAJECTORY_QUANTUM, budget=TRAJECTORY_CACHE_BYTES,
+                 segment=TRAJECTORY_SEGMENT):
+        self.rhs = rhs
+        self.dt = dt
+        self.segment_points = max(1, int(round(segment / dt)))
+        self.quantum = quantum
+        self.budget = budget
+        self.entries = OrderedDict()
+        self.nbytes = 0
+        self.last = None  # "hit", "extended" or "solved", for the most recent get()
+
+    def get(self, params, state, t_max):
+        """Trajectory from state up to t_max, shape (n, 3), solved at the quantized values."""
+        key = tuple(round(v / self.quantum) for v in (*params, *state))
+        sigma, beta, rho, x0, y0, z0 = (k * self.quantum for k in key)
+        n = int(round(t_max / self.dt)) + 1
+        states = self.entries.pop(key, None)
+        if states is None:
+            states = np.array([[x0, y0, z0]])
+            self.last = "solved"
+        else:
+            self.nbytes -= states.nbytes
+            self.last = "hit" if len(states) >= n else "extended"
+        segments = [states]
+        length = len(states)
+        while length < n:
+            t = np.arange(length - 1, length + self.segment_points) * self.dt
+            segments.append(odeint(self.rhs, segments[-1][-1], t, args=(sigma, beta, rho))[1:])
+            length += self.segment_points
+        if len(segments) > 1:
+            states = np.concatenate(segments)
+        self.entries[key] = states
+        self.nbytes += states.nbytes
+
+        # Evict the least recently used, never the entry just asked for
+        while self.nbytes > self.budget and len(self.entries) > 1:
+            _, evicted = self.entries.popitem(last=False)
+            self.nbytes -= evicted.nbytes
+        return states[:n]
+
+class LorenzStream:
+    """Integrates one Lorenz trajectory on a background thread into a ring buffer.
+
+    The thread keeps pace with the wall clock at LIVE_SPEED model time units
+    per second. Parameters and the current state can be changed while it runs,
+    and the display reads the most recent points with trail().
+    """
+
+    def __init__(self, state, params, dt=LIVE_DT, capacity=LIVE_CAPACITY):
+        self.engine = LorenzEngine(*params, h=dt)
+        self.buffer = np.empty((capacity, 3))
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.thread = None
+        self.t = 0.0
+        self.reset(state)
+
+    def set_params(self, sigma, beta, rho):
+        """Change σ, β, ρ for the steps still to come."""
+        with self.lock:
+            self.engine.sigma, self.engine.beta, self.engine.rho = sigma, beta, rho
+
+    def reset(self, state):
+        """Carry on from a new state, dropping the trail."""
+        with self.lock:
+            self.state = np.array(state, dtype=float).reshape(3, 1)
+            self.buffer[0] = self.state[:, 0]
+            self.count = 1  # points written since the last reset
+
+    def trail(self, n):
+        """Return up to the last n points, oldest first."""
+        with self.lock:
+            n = min(n, self.count, len(self.buffer))
+            end = self.count % len(self.buffer)
+            if n <= end:
+                return self.buffer[end - n:end].copy()
+            return np.concatenate((self.buffer[end - n:], self.buffer[:end]))
+
+    def start(self):
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        clock = time.perf_counter()
+        while not self.stopped.wait(0.01):
+            steps = int((time.perf_counter() - clock) * LIVE_SPEED / self.engine.h)
+            clock += steps * self.engine.h / LIVE_SPEED
+            with self.lock:
+                for _ in range(steps):
+                    self.engine.step(self.state)
+                    self.buffer[self.count % len(self.buffer)] = self.state[:, 0]
+                    self.count += 1
+                self.t += steps * self.engine.h
+
+    def stop(self):
+        """Stop the integrator thread."""
+        self.stopped.set()
+        if self.thread is not None:
+            self.thread.join(timeout=1.0)
+
+class LorenzEnsemble:
+    """Many Lorenz trajectories seeded in a small ball, advanced as one batch.
+
+    start() advances the ensemble on a background thread, never ahead of
+    LIVE_SPEED times real time, and publishes a copy of the positions with
+    spread statistics as latest after every few steps, so the display can
+    sample them at its own frame rate.
+    """
+
+    def __init__(self, center, params, count, radius, h=ENSEMBLE_DT):
+        self.engine = LorenzEngine(*params, h=h)
+        self.count = count
+        self.radius = radius
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.thread = None
+        self.latest = None
+        self.reset(center)
+
+    def set_params(self, sigma, beta, rho):
+        """Change σ, β, ρ for the steps still to come."""
+        with self.lock:
+            self.engine.sigma, self.engine.beta, self.engine.rho = sigma, beta, rho
+
+    def reset(self, center):
+        """Reseed the ensemble uniformly in a ball around center."""
+        rng = np.random.default_rng(0)
+        direction = rng.normal(size=(3, self.count))
+        direction /= np.linalg.norm(direction, axis=0)
+        distance = self.radius * rng.random(self.count) ** (1 / 3)
+        with self.lock:
+            self.state = np.array(center, dtype=float)[:, np.newaxis] + direction * distance
+            self.t = 0.0
+            self.spread0 = self.spread()
+            self.publish()
+
+    def spread(self):
+        """RMS distance of the trajectories from their centroid."""
+        offsets = self.state - self.state.mean(axis=1, keepdims=True)
+        return np.sqrt(np.mean(np.sum(offsets * offsets, axis=0)))
+
+    def publish(self):
+        """Snapshot (t, positions, spread, growth rate, fraction with x > 0)."""
+        spread = self.spread()
+        growth = np.log(spread / self.spread0) / self.t if self.t > 0 else 0.0
+        self.latest = (self.t, self.state.copy(), spread, growth, np.mean(self.state[0] > 0))
+
+    def start(self, steps=ENSEMBLE_SUBSTEPS):
+        self.thread = threading.Thread(target=self._run, args=(steps,), daemon=True)
+        self.thread.start()
+
+    def _run(self, steps):
+        clock = time.perf_counter()
+        while not self.stopped.is_set():
+            with self.lock:
+                if self.t == 0.0:
+                    clock = time.perf_counter()
+                self.engine.step(self.state, steps)
+                self.t += steps * self.engine.h
+                self.publish()
+                ahead = self.t / LIVE_SPEED - (time.perf_counter() - clock)
+            if ahead > 0:
+                self.stopped.wait(ahead)
+
+    def stop(self):
+        """Stop the integrator thread."""
+        self.stopped.set()
+        if self.thread is not None:
+            self.thread.join(timeout=1.0)
+
+def atlas_cells(sigma, beta, rho):
+    """Largest Lyapunov exponent, attractor bounds and a thumbnail for each cell.
+
+    sigma, beta and rho are flat arrays, one entry per cell. Every cell is
+    started from ATLAS_START and run for ATLAS_TRANSIENT first; over the next
+    ATLAS_T a shadow trajectory ATLAS_D0 away is renormalized every
+    ATLAS_SAMPLE_STEPS steps (Benettin's method). Returns (lyapunov, bounds
+    as [x_min, y_min, z_min, x_max, y_max, z_max], thumbnails of the last
+    ATLAS_THUMBNAIL_POINTS samples).
+    """
+    m = len(sigma)
+    engine = LorenzEngine(np.tile(sigma, 2), np.tile(beta, 2), np.tile(rho, 2), h=ATLAS_DT)
+    state = np.empty((3, 2 * m))
+    state[:] = np.array(ATLAS_START)[:, np.newaxis]
+    engine.step(state, round(ATLAS_TRANSIENT / ATLAS_DT))
+
+    # The first m columns are the cells, the rest their shadows
+    reference, shadow = state[:, :m], state[:, m:]
+    shadow[:] = reference
+    shadow[0] += ATLAS_D0
+    log_growth = np.zeros(m)
+    low, high = reference.copy(), reference.copy()
+    thumbnails = np.empty((m, ATLAS_THUMBNAIL_POINTS, 3), dtype=np.float16)
+    samples = round(ATLAS_T / ATLAS_DT) // ATLAS_SAMPLE_STEPS
+    for sample in range(samples):
+        engine.step(state, ATLAS_SAMPLE_STEPS)
+        separation = shadow - reference
+        distance = np.maximum(np.sqrt(np.sum(separation * separation, axis=0)), 1e-300)
+        log_growth += np.log(distance / ATLAS_D0)
+        shadow[:] = reference + separation * (ATLAS_D0 / distance)
+        np.minimum(low, reference, out=low)
+        np.maximum(high, reference, out=high)
+        index = sample - (samples - ATLAS_THUMBNAIL_POINTS)
+        if index >= 0:
+            thumbnails[:, index] = reference.T
+    lyapunov = log_growth / (samples * ATLAS_SAMPLE_STEPS * ATLAS_DT)
+    return lyapunov, np.concatenate((low, high)).T, thumbnails
+
+def atlas_regime(lyapunov):
+    """Name the long-term behavior a largest Lyapunov exponent points to."""
+    if lyapunov > ATLAS_CHAOS_THRESHOLD:
+        return "chaotic"
+    if lyapunov < -ATLAS_CHAOS_THRESHOLD:
+        return "fixed point"
+    return "periodic"
+
+def atlas_cache_path():
+    """Cache file of the atlas for the current grid and integration settings."""
+    key = (tuple(np.round(ATLAS_SIGMAS, 6)), tuple(np.round(ATLAS_BETAS, 6)), tuple(np.round(ATLAS_RHOS, 6)),
+           ATLAS_START, ATLAS_DT, ATLAS_TRANSIENT, ATLAS_T, ATLAS_SAMPLE_STEPS, ATLAS_THUMBNAIL_POINTS, ATLAS_D0)
+    return os.path.join(ATLAS_CACHE_DIR, hashlib.sha1(repr(key).encode()).hexdigest() + ".npz")
+
+class AtlasJob:
+    """Computes the (σ, β, ρ) atlas across a process pool.
+
+    Arrays are indexed [β, ρ, σ]; cells not computed yet are NaN. The β
+    slice asked for first is submitted first, so the map on screen fills in
+    before the others. The finished atlas is saved to ATLAS_CACHE_DIR
+    (float32 exponents and bounds, float16 thumbnails) and loads instantly
+    next time.
+    """
+
+    def __init__(self, pool, first_beta=0):
+        shape = (len(ATLAS_BETAS), len(ATLAS_RHOS), len(ATLAS_SIGMAS))
+        self.path = atlas_cache_path()
+        self.pending = {}
+        if os.path.exists(self.path):
+            with np.load(self.path) as cache:
+                self.lyapunov = cache["lyapunov"]
+                self.bounds = cache["bounds"]
+                self.thumbnails = cache["thumbnails"]
+            return
+
+        self.lyapunov = np.full(shape, np.nan, dtype=np.float32)
+        self.bounds = np.full(shape + (6,), np.nan, dtype=np.float32)
+        self.thumbnails = np.zeros(shape + (ATLAS_THUMBNAIL_POINTS, 3), dtype=np.float16)
+        order = [first_beta] + [b for b in range(len(ATLAS_BETAS)) if b != first_beta]
+        cells = np.array(np.unravel_index(np.arange(self.lyapunov.size), shape))
+        cells = np.concatenate([cells[:, cells[0] == b] for b in order], axis=1)
+        for start in range(0, cells.shape[1], ATLAS_BATCH):
+            b, r, c = cells[:, start:start + ATLAS_BATCH]
+            future = pool.submit(atlas_cells, ATLAS_SIGMAS[c], ATLAS_BETAS[b], ATLAS_RHOS[r])
+            self.pending[future] = (b, r, c)
+
+    @property
+    def done(self):
+        return not self.pending
+
+    def poll(self):
+        """Collect finished batches; True if the atlas changed."""
+        finished = [f for f in self.pending if f.done()]
+        for future in finished:
+            cells = self.pending.pop(future)
+            self.lyapunov[cells], self.bounds[cells], self.thumbnails[cells] = future.result()
+        if finished and self.done:
+            os.makedirs(ATLAS_CACHE_DIR, exist_ok=True)
+            partial = self.path + ".part.npz"
+            np.savez_compressed(partial, lyapunov=self.lyapunov, bounds=self.bounds,
+                                thumbnails=self.thumbnails)
+            os.replace(partial, self.path)
+        return bool(finished)
+
+    def cancel(self):
+        for future in self.pending:
+            future.cancel()
+        self.pending.clear()
+
+def build_atlas():
+    """Compute the atlas on every core, save it to the cache and report the time."""
+    started = time.perf_counter()
+    with ProcessPoolExecutor() as pool:
+        job = AtlasJob(pool)
+        wait(list(job.pending))
+        job.poll()
+    chaotic = np.mean(job.lyapunov > ATLAS_CHAOS_THRESHOLD)
+    print(f"Atlas of {job.lyapunov.size} cells ({chaotic:.0%} chaotic) ready in "
+          f"{time.perf_counter() - started:.1f} s: {job.path} ({os.path.getsize(job.path) / 1e6:.1f} MB)")
+
+def canvas_callback_ids(canvas):
+    """Ids of every callback currently connected to a canvas's events."""
+    return {cid for cids in canvas.callbacks.callbacks.values() for cid in cids}
+
 class LorenzAttractorGUI:
     def __init__(self, root):
         self.root = root
         self.root.title("Interactive Lorenz Attractor Simulation")
         self.root.geometry("1200x800")
+        self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
         
         # Create main frame
         main_frame = ctk.CTkFrame(root)
@@ -60,6 +476,8 @@ class LorenzAttractorGUI:
         self.y0_var = tk.DoubleVar(value=1.0)
         self.z0_var = tk.DoubleVar(value=1.0)
         self.t_max_var = tk.DoubleVar(value=40.0)
+        self.ensemble_count_var = tk.IntVar(value=10000)
+        self.ensemble_radius_var = tk.DoubleVar(value=-3)
         
         # Add sliders
         self.create_slider(controls_frame, "σ (Sigma):", self.sigma_var, 0, 20, 0.1, 0)
@@ -70,6 +488,19 @@ class LorenzAttractorGUI:
         self.create_slider(controls_frame, "Z₀:", self.z0_var, 0, 50, 0.1, 5)
         self.create_slider(controls_frame, "t_max:", self.t_max_var, 10, 100, 1, 6)
         
+        # Static solves the whole trajectory on every change; Live and
+        # Ensemble keep integrating and let the sliders act on the running state
+        self.mode_var = tk.StringVar(value=MODES[0])
+        ctk.CTkOptionMenu(controls_frame, variable=self.mode_var, values=MODES,
+                          command=self.on_mode_change).grid(row=7, column=0, columnspan=2, pady=5)
+        self.create_slider(controls_frame, "Ensemble size:", self.ensemble_count_var, 1000, 100000, 1000, 8,
+                           fmt="{:.0f}")
+        self.create_slider(controls_frame, "log₁₀ radius:", self.ensemble_radius_var, -6, 0, 0.1, 9,
+                           fmt="{:.1f}")
+        self.stats_var = tk.StringVar()
+        ctk.CTkLabel(controls_frame, textvariable=self.stats_var, justify="left").grid(
+            row=10, column=0, columnspan=2, padx=5, pady=5)
+        
         # Add educational text
         edu_text = ctk.CTkTextbox(left_panel, height=200, wrap="word")
         edu_text.pack(fill="both", expand=True, padx=5, pady=5)
@@ -80,7 +511,9 @@ Parameters:
 • β (Beta): Related to the physical dimensions of the system
 • ρ (Rho): Drives the buoyancy in the system
 • X₀, Y₀, Z₀: Initial conditions
-• t_max: Duration of simulation
+• t_max: Duration of simulation (length of the trail in Live mode)
+• Ensemble: thousands of trajectories started in a tiny ball around X₀, Y₀, Z₀
+• Atlas: the largest Lyapunov exponent over a grid of σ, ρ for the nearest cached β; click the map or drag the sliders to jump between regimes
 
 The system demonstrates sensitive dependence on initial conditions—a hallmark of chaos theory. Small changes in parameters or initial conditions can lead to dramatically different trajectories over time.
 
@@ -94,12 +527,19 @@ Try dragging the sliders to see how small changes affect the system's behavior!"
         content_frame.columnconfigure(0, weight=1)
         
         # Initialize the plot
-        self.fig = None
-        self.canvas = None
         self._update_job = None  # For tracking delayed updates
+        self.stream = None
+        self.anim = None
+        self.callbacks_before_anim = set()
+        self.atlas_pool = None
+        self.atlas_job = None
+        self.atlas_poll = None
+        self.atlas_view = None
+        self.trajectories = TrajectoryCache(self.lorenz)
+        self.build_plot()
         self.update_plot()
     
-    def create_slider(self, parent, label, variable, min_val, max_val, step, row):
+    def create_slider(self, parent, label, variable, min_val, max_val, step, row, fmt="{:.3f}"):
         frame = ctk.CTkFrame(parent)
         frame.grid(row=row, column=0, columnspan=2, sticky="ew", padx=5, pady=2)
         
@@ -109,18 +549,27 @@ Try dragging the sliders to see how small changes affect the system's behavior!"
                              width=200, height=16)
         slider.grid(row=0, column=1, sticky="ew", padx=5)
         
-        value_label = ctk.CTkLabel(frame, text=f"{variable.get():.3f}",
+        value_label = ctk.CTkLabel(frame, text=fmt.format(variable.get()),
                                  font=ctk.CTkFont(size=12))
         value_label.grid(row=0, column=2, sticky="e", padx=(0, 5))
         
         frame.columnconfigure(1, weight=1)
         
         def update_label_and_plot(*args):
-            value_label.configure(text=f"{variable.get():.3f}")
+            value_label.configure(text=fmt.format(variable.get()))
+            if self.mode_var.get() == MODES[3]:
+                self.show_atlas_cell()
+                return
+            resize = variable in (self.ensemble_count_var, self.ensemble_radius_var)
+            if resize and self.mode_var.get() != MODES[2]:
+                return
+            if self.stream is not None and not resize:
+                self.apply_live_controls(variable)
+                return
             # Only cancel if a job is scheduled
             if self._update_job is not None:
                 self.root.after_cancel(self._update_job)
-            self._update_job = self.root.after(100, self.update_plot)
+            self._update_job = self.root.after(100, self.refresh)
         
         variable.trace_add("write", update_label_and_plot)
         return slider
@@ -133,49 +582,266 @@ Try dragging the sliders to see how small changes affect the system's behavior!"
         dzdt = x * y - beta * z
         return [dxdt, dydt, dzdt]
     
+    def parameters(self):
+        return self.sigma_var.get(), self.beta_var.get(), self.rho_var.get()
+    
+    def initial_state(self):
+        return [self.x0_var.get(), self.y0_var.get(), self.z0_var.get()]
+    
+    def build_plot(self):
+        """Create the figure, the trajectory line and the canvas once."""
+        self.fig = plt.Figure(figsize=(10, 8))
+        self.fig.patch.set_facecolor('#242424')
+        self.ax = self.fig.add_subplot(111, projection='3d')
+        self.ax.set_facecolor('#E5E5E5')
+        self.line, = self.ax.plot([], [], [], lw=0.5, color='#1f77b4')
+        self.head, = self.ax.plot([], [], [], 'o', ms=4, color='#d62728', visible=False)
+        # The ensemble is drawn as the markers of a single line artist, which
+        # renders 10⁵ points faster than a 3D scatter
+        self.cloud, = self.ax.plot([], [], [], '.', ms=1, color='#1f77b4', linestyle='none',
+                                   visible=False)
+        self.ax.set_xlabel('X', color='black')
+        self.ax.set_ylabel('Y', color='black')
+        self.ax.set_zlabel('Z', color='black')
+        self.ax.set_title('Lorenz Attractor', color='black', pad=20)
+        self.ax.tick_params(colors='black')
+        for spine in self.ax.spines.values():
+            spine.set_color('black')
+        self.ax_position = self.ax.get_position()
+        self.canvas = FigureCanvasTkAgg(self.fig, master=self.plot_frame)
+        self.canvas.mpl_connect('button_press_event', self.on_click)
+        self.canvas.get_tk_widget().pack(side="top", fill="both", expand=True)
+    
+    def fit_limits(self, points, grow_only=False):
+        """Fit the axes to points; with grow_only, only ever widen them."""
+        low, high = points.min(axis=0), points.max(axis=0)
+        margin = 0.05 * np.maximum(high - low, 1e-6)
+        low, high = low - margin, high + margin
+        for i, (get, set_) in enumerate(((self.ax.get_xlim, self.ax.set_xlim),
+                                         (self.ax.get_ylim, self.ax.set_ylim),
+                                         (self.ax.get_zlim, self.ax.set_zlim))):
+            if grow_only:
+                current = get()
+                if low[i] >= current[0] and high[i] <= current[1]:
+                    continue
+                set_(min(low[i], current[0]), max(high[i], current[1]))
+            else:
+                set_(low[i], high[i])
+    
     def update_plot(self):
-        print("Updating plot... sigma:", self.sigma_var.get(), "beta:", self.beta_var.get(), "rho:", self.rho_var.get(), "x0:", self.x0_var.get(), "y0:", self.y0_var.get(), "z0:", self.z0_var.get(), "t_max:", self.t_max_var.get())
-        sigma = self.sigma_var.get()
-        beta = self.beta_var.get()
-        rho = self.rho_var.get()
-        x0 = self.x0_var.get()
-        y0 = self.y0_var.get()
-        z0 = self.z0_var.get()
-        t_max = self.t_max_var.get()
-        t = np.linspace(0, t_max, 10000)
-        initial_state = [x0, y0, z0]
-        states = odeint(self.lorenz, initial_state, t, args=(sigma, beta, rho))
-        
-        if self.fig is None:
-            self.fig = plt.Figure(figsize=(10, 8))
-            self.fig.patch.set_facecolor('#242424')
-            self.ax = self.fig.add_subplot(111, projection='3d')
-            self.ax.set_facecolor('#E5E5E5')
-            self.ax.plot(states[:, 0], states[:, 1], states[:, 2], lw=0.5, color='#1f77b4')
-            self.ax.set_xlabel('X', color='black')
-            self.ax.set_ylabel('Y', color='black')
-            self.ax.set_zlabel('Z', color='black')
-            self.ax.set_title('Lorenz Attractor', color='black', pad=20)
-            self.ax.tick_params(colors='black')
-            for spine in self.ax.spines.values():
-                spine.set_color('black')
-            self.canvas = FigureCanvasTkAgg(self.fig, master=self.plot_frame)
-            self.canvas.draw()
-            self.canvas.get_tk_widget().pack(side="top", fill="both", expand=True)
+        self._update_job = None
+        started = time.perf_counter()
+        states = self.trajectories.get(self.parameters(), self.initial_state(), self.t_max_var.get())
+        self.stats_var.set(f"{len(states)} points, {self.trajectories.last} in "
+                           f"{(time.perf_counter() - started) * 1000:.0f} ms\n"
+                           f"Cache: {len(self.trajectories.entries)} trajectories, "
+                           f"{self.trajectories.nbytes / 2**20:.1f} MB")
+        self.line.set_data_3d(states[:, 0], states[:, 1], states[:, 2])
+        self.head.set_visible(False)
+        self.fit_limits(states)
+        self.canvas.draw_idle()
+    
+    def refresh(self):
+        """Start the current mode over with the slider values."""
+        self.on_mode_change(self.mode_var.get())
+    
+    def on_mode_change(self, mode):
+        if self._update_job is not None:
+            self.root.after_cancel(self._update_job)
+            self._update_job = None
+        self.stop_live()
+        self.stop_atlas_poll()
+        self.stats_var.set("")
+        self.line.set_visible(mode != MODES[2])
+        self.cloud.set_visible(mode == MODES[2])
+        self.show_atlas_axes(mode == MODES[3])
+        if mode == MODES[1]:
+            self.start_live()
+        elif mode == MODES[2]:
+            self.start_ensemble()
+        elif mode == MODES[3]:
+            self.start_atlas()
+        else:
+            self.update_plot()
+    
+    def start_live(self):
+        """Integrate continuously on a background thread and draw its trail."""
+        self.stream = LorenzStream(self.initial_state(), self.parameters())
+        self.stream.start()
+        self.line.set_data_3d([], [], [])
+        self.head.set_visible(True)
+        self.fit_limits(np.array([self.initial_state()]))
+        self.animate(self.animate_live, LIVE_INTERVAL_MS)
+    
+    def animate(self, func, interval):
+        """Run func as the open-ended animation of the live or ensemble view."""
+        # Any canvas callback not connected before this point is the animation's
+        self.callbacks_before_anim = canvas_callback_ids(self.canvas)
+        self.anim = FuncAnimation(self.fig, func, frames=None,
+                                  interval=interval, cache_frame_data=False)
+        self.canvas.draw_idle()
+    
+    def animate_live(self, frame):
+        points = self.stream.trail(int(self.t_max_var.get() / LIVE_DT))
+        self.line.set_data_3d(points[:, 0], points[:, 1], points[:, 2])
+        self.head.set_data_3d(points[-1:, 0], points[-1:, 1], points[-1:, 2])
+        self.fit_limits(points, grow_only=True)
+        return self.line, self.head
+    
+    def start_ensemble(self):
+        """Advance an ensemble on a background thread and draw it as a point cloud."""
+        self.stream = LorenzEnsemble(self.initial_state(), self.parameters(),
+                                     self.ensemble_count_var.get(), 10 ** self.ensemble_radius_var.get())
+        self.stream.start()
+        self.line.set_data_3d([], [], [])
+        self.head.set_visible(False)
+        self.fit_limits(self.stream.latest[1].T)
+        self.animate(self.animate_ensemble, ENSEMBLE_INTERVAL_MS)
+    
+    def animate_ensemble(self, frame):
+        t, points, spread, growth, right = self.stream.latest
+        self.cloud.set_data_3d(points[0], points[1], points[2])
+        self.fit_limits(points.T, grow_only=True)
+        self.stats_var.set(f"t = {t:.1f}\n"
+                           f"Spread = {spread:.2e}\n"
+                           f"ln(spread / spread₀) / t = {growth:.2f}\n"
+                           f"x > 0: {right:.0%}")
+        return (self.cloud,)
+    
+    def apply_live_controls(self, variable):
+        """Hand a slider change to the running integrator."""
+        if variable in (self.x0_var, self.y0_var, self.z0_var):
+            self.stream.reset(self.initial_state())
+        elif variable is not self.t_max_var:
+            self.stream.set_params(*self.parameters())
+    
+    def stop_live(self):
+        if self.anim is not None:
+            # Pause stops the timer; the draw, resize and close handlers the
+            # animation connected would otherwise outlive it on the canvas
+            # and restart its timer
+            if self.anim.event_source is not None:
+                self.anim.pause()
+            for cid in canvas_callback_ids(self.canvas) - self.callbacks_before_anim:
+                self.canvas.mpl_disconnect(cid)
+            self.anim = None
+        if self.stream is not None:
+            self.stream.stop()
+            self.stream = None
+    
+    def build_atlas_view(self):
+        """Regime map axes beside the 3D axes, created on first use."""
+        ax = self.fig.add_axes([0.07, 0.12, 0.3, 0.76])
+        ax.set_facecolor('#E5E5E5')
+        image = ax.imshow(np.full((len(ATLAS_RHOS), len(ATLAS_SIGMAS)), np.nan), origin='lower',
+                          aspect='auto', cmap=plt.get_cmap('coolwarm').with_extremes(bad='#E5E5E5'),
+                          norm=TwoSlopeNorm(0, -2, 2), interpolation='nearest',
+                          extent=(ATLAS_SIGMAS[0] - (ATLAS_SIGMAS[1] - ATLAS_SIGMAS[0]) / 2,
+                                  ATLAS_SIGMAS[-1] + (ATLAS_SIGMAS[1] - ATLAS_SIGMAS[0]) / 2,
+                                  ATLAS_RHOS[0] - (ATLAS_RHOS[1] - ATLAS_RHOS[0]) / 2,
+                                  ATLAS_RHOS[-1] + (ATLAS_RHOS[1] - ATLAS_RHOS[0]) / 2))
+        marker, = ax.plot([], [], 'o', ms=8, mfc='none', mec='black', mew=1.5)
+        ax.set_xlabel('σ', color='white')
+        ax.set_ylabel('ρ', color='white')
+        ax.tick_params(colors='white')
+        colorbar = self.fig.colorbar(image, ax=ax, orientation='horizontal', pad=0.1, fraction=0.05)
+        colorbar.set_label('Largest Lyapunov exponent', color='white')
+        colorbar.ax.tick_params(colors='white')
+        return {"ax": ax, "image": image, "marker": marker, "colorbar": colorbar, "beta": None}
+    
+    def show_atlas_axes(self, visible):
+        """Put the regime map beside the 3D axes, or give the 3D axes the whole figure."""
+        if visible and self.atlas_view is None:
+            self.atlas_view = self.build_atlas_view()
+        if self.atlas_view is not None:
+            self.atlas_view["ax"].set_visible(visible)
+            self.atlas_view["colorbar"].ax.set_visible(visible)
+        self.ax.set_position([0.42, 0.05, 0.56, 0.9] if visible else self.ax_position)
+    
+    def nearest_atlas_cell(self):
+        """Grid indices (β, ρ, σ) closest to the slider values."""
+        return (np.abs(ATLAS_BETAS - self.beta_var.get()).argmin(),
+                np.abs(ATLAS_RHOS - self.rho_var.get()).argmin(),
+                np.abs(ATLAS_SIGMAS - self.sigma_var.get()).argmin())
+    
+    def start_atlas(self):
+        """Show the regime map, computing whatever the cache does not hold."""
+        if self.atlas_job is None:
+            if self.atlas_pool is None and not os.path.exists(atlas_cache_path()):
+                self.atlas_pool = ProcessPoolExecutor()
+            self.atlas_job = AtlasJob(self.atlas_pool, first_beta=self.nearest_atlas_cell()[0])
+
+        def poll():
+            self.atlas_poll = None
+            if self.atlas_job.poll():
+                self.atlas_view["beta"] = None  # Redraw the map
+                self.show_atlas_cell()
+            if not self.atlas_job.done:
+                self.atlas_poll = self.root.after(ATLAS_POLL_MS, poll)
+
+        self.atlas_view["beta"] = None
+        self.show_atlas_cell()
+        if not self.atlas_job.done:
+            self.atlas_poll = self.root.after(ATLAS_POLL_MS, poll)
+    
+    def show_atlas_cell(self):
+        """Jump to the cached thumbnail of the cell nearest the sliders."""
+        b, r, c = self.nearest_atlas_cell()
+        view, job = self.atlas_view, self.atlas_job
+        if view["beta"] != b:
+            view["image"].set_data(job.lyapunov[b])
+            view["ax"].set_title(f'Regimes at β = {ATLAS_BETAS[b]:.3g}', color='white')
+            view["beta"] = b
+        view["marker"].set_data([ATLAS_SIGMAS[c]], [ATLAS_RHOS[r]])
+        
+        lyapunov = job.lyapunov[b, r, c]
+        computed = np.count_nonzero(~np.isnan(job.lyapunov))
+        progress = "" if job.done else f"\nAtlas: {computed}/{job.lyapunov.size} cells"
+        if np.isnan(lyapunov):
+            self.line.set_data_3d([], [], [])
+            self.stats_var.set(f"σ = {ATLAS_SIGMAS[c]:.2f}, β = {ATLAS_BETAS[b]:.3g}, "
+                               f"ρ = {ATLAS_RHOS[r]:.1f}: not computed yet{progress}")
         else:
-            self.ax.clear()
-            self.ax.set_facecolor('#E5E5E5')
-            self.ax.plot(states[:, 0], states[:, 1], states[:, 2], lw=0.5, color='#1f77b4')
-            self.ax.set_xlabel('X', color='black')
-            self.ax.set_ylabel('Y', color='black')
-            self.ax.set_zlabel('Z', color='black')
-            self.ax.set_title('Lorenz Attractor', color='black', pad=20)
-            self.ax.tick_params(colors='black')
-            for spine in self.ax.spines.values():
-                spine.set_color('black')
-            self.canvas.draw()
+            thumbnail = job.thumbnails[b, r, c].astype(float)
+            self.line.set_data_3d(thumbnail[:, 0], thumbnail[:, 1], thumbnail[:, 2])
+            self.fit_limits(job.bounds[b, r, c].reshape(2, 3))
+            self.stats_var.set(f"σ = {ATLAS_SIGMAS[c]:.2f}, β = {ATLAS_BETAS[b]:.3g}, "
+                               f"ρ = {ATLAS_RHOS[r]:.1f}\n"
+                               f"λ ≈ {lyapunov:.2f} ({atlas_regime(lyapunov)}){progress}")
+        self.canvas.draw_idle()
+    
+    def stop_atlas_poll(self):
+        if self.atlas_poll is not None:
+            self.root.after_cancel(self.atlas_poll)
+            self.atlas_poll = None
+    
+    def on_click(self, event):
+        # Clicking the regime map moves the sliders to that cell
+        if self.atlas_view is None or event.inaxes is not self.atlas_view["ax"]:
+            return
+        self.sigma_var.set(round(float(ATLAS_SIGMAS[np.abs(ATLAS_SIGMAS - event.xdata).argmin()]), 3))
+        self.rho_var.set(round(float(ATLAS_RHOS[np.abs(ATLAS_RHOS - event.ydata).argmin()]), 3))
+    
+    def on_closing(self):
+        self.stop_live()
+        self.stop_atlas_poll()
+        if self.atlas_job is not None:
+            self.atlas_job.cancel()
+        if self.atlas_pool is not None:
+            self.atlas_pool.shutdown(wait=False, cancel_futures=True)
+        self.root.quit()
+        self.root.destroy()
 
 def main():
+    parser = argparse.ArgumentParser(description="Interactive Lorenz Attractor Simulation")
+    parser.add_argument("--build-atlas", action="store_true",
+                        help="compute the (σ, β, ρ) atlas on every core, cache it and exit")
+    args = parser.parse_args()
+    
+    if args.build_atlas:
+        build_atlas()
+        return
+    
     root = ctk.CTk()
     app = LorenzAttractorGUI(root)
     root.mainloop()
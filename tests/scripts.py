@@ -0,0 +1,22 @@
+"""Import the simulation scripts, whose hyphenated file names can't be imported directly."""
+import importlib.util
+import os
+import sys
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+
+
+def load(name):
+    """Import src/<name>.py once, registered under name with underscores."""
+    module_name = name.replace("-", "_")
+    if module_name not in sys.modules:
+        spec = importlib.util.spec_from_file_location(module_name, os.path.join(SRC, f"{name}.py"))
+        module = importlib.util.module_from_spec(spec)
+        # Registered before running so process pools can pickle its functions
+        sys.modules[module_name] = module
+        spec.loader.exec_module(module)
+    return sys.modules[module_name]
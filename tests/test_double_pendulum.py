@@ -0,0 +1,234 @@
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from matplotlib.backend_bases import ResizeEvent
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from scipy.integrate import solve_ivp
+
+from tests.scripts import load
+
+dp = load("double-pendulum")
+
+
+def animated_view():
+    """The animation state of DoublePendulumGUI on an Agg canvas."""
+    fig = Figure()
+    line, = fig.add_subplot().plot([0, 1], [0, 1])
+    gui = SimpleNamespace(fig=fig, canvas=FigureCanvasAgg(fig), anim=None, callbacks_before_anim=set(),
+                          stream=None, flip_job=None, flip_poll=None)
+    gui.canvas.mpl_connect("button_press_event", print)
+    for name in ("animate", "stop_run"):
+        setattr(gui, name, getattr(dp.DoublePendulumGUI, name).__get__(gui))
+    return gui, line
+
+
+@pytest.mark.parametrize("drawn", [False, True])
+def test_stop_run_disconnects_the_animation(drawn):
+    gui, line = animated_view()
+    before = dp.canvas_callback_ids(gui.canvas)
+    for _ in range(3):
+        gui.animate(lambda frame: [line], 10)
+        assert dp.canvas_callback_ids(gui.canvas) > before
+        if drawn:
+            gui.canvas.draw()
+        anim = gui.anim
+        gui.stop_run()
+        assert gui.anim is None
+        assert dp.canvas_callback_ids(gui.canvas) == before
+        assert not line.get_animated()
+    # Nothing left on the canvas can restart the last animation's timer
+    started = []
+    anim.event_source.start = lambda *args: started.append(args)
+    gui.canvas.callbacks.process("resize_event", ResizeEvent("resize_event", gui.canvas))
+    gui.canvas.draw()
+    assert not started
+
+
+PARAMS = (1.0, 1.0, 1.0, 1.0, 9.81)
+
+
+def solve(y0, t_max, **kwargs):
+    return solve_ivp(dp.double_pendulum, (0, t_max), y0, args=PARAMS, method="DOP853",
+                     rtol=1e-11, atol=1e-11, **kwargs)
+
+
+def next_frame(stream, timeout=10.0):
+    """Poll the stream like the animation does until a frame is ready."""
+    deadline = time.perf_counter() + timeout
+    while (frame := stream.get()) is None:
+        assert time.perf_counter() < deadline
+        time.sleep(0.001)
+    return frame
+
+
+def test_stream_matches_solve_ivp():
+    # A regular orbit, so the comparison isn't dominated by chaotic error growth
+    y0 = [0.4, 0.0, -0.3, 0.0]
+    stream = dp.PendulumStream(y0, PARAMS)
+    try:
+        frames = np.array([next_frame(stream) for _ in range(250)])
+    finally:
+        stream.stop()
+    t = np.arange(250) * dp.FRAME_DT
+    np.testing.assert_allclose(frames[:, 0], t, atol=1e-12)
+    expected = solve(y0, t[-1], t_eval=t)
+    np.testing.assert_allclose(frames[:, 1:], expected.y.T, atol=1e-6)
+
+
+def test_stream_stays_a_bounded_distance_ahead(monkeypatch):
+    monkeypatch.setattr(dp, "QUEUE_FRAMES", 20)
+    monkeypatch.setattr(dp, "CHUNK_FRAMES", 50)
+    steps = []
+    engine_step = dp.PendulumEngine.step
+
+    def counted(self, state, n=1):
+        steps.append(n)
+        return engine_step(self, state, n)
+
+    monkeypatch.setattr(dp.PendulumEngine, "step", counted)
+    stream = dp.PendulumStream([2.0, 0.0, 2.5, 0.0], PARAMS)
+    try:
+        deadline = time.perf_counter() + 10
+        while stream.queue.qsize() < 20:
+            assert time.perf_counter() < deadline
+            time.sleep(0.01)
+        # With the queue full the integrator waits, at most one chunk ahead of the queue
+        computed = sum(steps)
+        time.sleep(0.3)
+        assert sum(steps) == computed
+        assert stream.queue.qsize() == 20
+        assert computed <= (20 + 50) * dp.RK4_SUBSTEPS
+
+        # Consuming frames lets it continue where it stopped, without gaps
+        times = [next_frame(stream)[0] for _ in range(100)]
+        np.testing.assert_allclose(np.diff(times), dp.FRAME_DT)
+    finally:
+        stream.stop()
+    assert not stream.thread.is_alive()
+
+
+def test_stop_ends_a_blocked_integrator(monkeypatch):
+    monkeypatch.setattr(dp, "QUEUE_FRAMES", 5)
+    stream = dp.PendulumStream([2.0, 0.0, 2.5, 0.0], PARAMS)
+    deadline = time.perf_counter() + 10
+    while not stream.queue.full():
+        assert time.perf_counter() < deadline
+        time.sleep(0.01)
+    stream.stop()
+    assert not stream.thread.is_alive()
+
+
+def test_batched_derivatives_match_the_scalar_rhs():
+    rng = np.random.default_rng(1)
+    state = rng.uniform(-8, 8, (200, 4))
+    for params in (PARAMS, (0.7, 1.3, 2.0, 0.5, 3.7)):
+        out = dp.pendulum_derivatives(state, *params, out=np.empty_like(state))
+        expected = np.array([dp.double_pendulum(0, row, *params) for row in state])
+        np.testing.assert_allclose(out, expected, rtol=1e-12, atol=1e-12)
+
+
+def test_engine_conserves_energy_and_matches_solve_ivp():
+    y0 = np.array([2.0, 0.0, 2.5, 0.0])
+    state = y0[np.newaxis].copy()
+    dp.PendulumEngine(*PARAMS, h=0.001).step(state, 2000)
+    np.testing.assert_allclose(state[0], solve(y0, 2.0).y[:, -1], atol=1e-6)
+    np.testing.assert_allclose(dp.pendulum_energy(state, *PARAMS), dp.pendulum_energy(y0[np.newaxis], *PARAMS),
+                               rtol=1e-9)
+
+
+def test_fan_spread_grows_only_from_a_chaotic_start():
+    p = 1e-6
+    offsets = np.linspace(-p, p, 100)
+    for (theta1, theta2), grows in (((2.0, 2.5), True), ((0.1, 0.1), False)):
+        fan = dp.ChaosFan(PARAMS, theta1, theta2, 100, p, h=0.005)
+        assert np.isclose(fan.spread(), np.sqrt(np.mean(2 * offsets ** 2)))
+        fan.advance(6000)
+        assert np.isclose(fan.t, 30.0)
+        if grows:
+            assert fan.spread() > 1e4 * p
+        else:
+            assert fan.spread() < 10 * p
+
+
+def test_lyapunov_estimate_separates_chaotic_from_regular_motion():
+    chaotic = dp.ChaosFan(PARAMS, 2.0, 2.5, 100, 1e-6, h=0.005)
+    regular = dp.ChaosFan(PARAMS, 0.1, 0.1, 100, 1e-6, h=0.005)
+    for fan in (chaotic, regular):
+        for _ in range(6000 // dp.FAN_SUBSTEPS):
+            fan.advance(dp.FAN_SUBSTEPS)
+    assert chaotic.lyapunov > 0.5
+    assert abs(regular.lyapunov) < 0.1
+
+
+def test_flip_times_match_solve_ivp():
+    theta = np.linspace(-3.0, 3.0, 9)
+    theta1, theta2 = (a.ravel() for a in np.meshgrid(theta, theta, indexing="ij"))
+    times = dp.flip_times(PARAMS, theta1, theta2, t_max=4.0, h=0.002)
+
+    def flip(t, y, *params):
+        return np.pi - max(abs(y[0]), abs(y[2]))
+    flip.terminal = True
+
+    for t, start in zip(times, zip(theta1, theta2)):
+        events = solve([start[0], 0.0, start[1], 0.0], 4.0, events=flip).t_events[0]
+        expected = events[0] if len(events) else np.inf
+        if np.isinf(expected):
+            assert np.isinf(t)
+        else:
+            assert expected <= t < expected + 0.002 + 1e-9
+
+
+def test_flip_times_skip_cells_without_the_energy_to_flip():
+    assert np.isinf(dp.flip_times(PARAMS, np.array([0.5, -1.0]), np.array([0.3, 1.0]), t_max=5.0)).all()
+
+
+def test_fading_trail_overwrites_its_oldest_segments():
+    trail = dp.FadingTrail(Figure().add_subplot(), "cyan")
+    points = 350
+    for i in range(points):
+        trail.append(i, -i)
+    assert trail.count == points - 1
+
+    # Every slot holds the newest segment that maps to it, from point k to k + 1
+    births = np.asarray(trail.births)
+    np.testing.assert_array_equal(np.sort(births), np.arange(points - 1 - trail.length, points - 1))
+    for slot, path in enumerate(trail.paths):
+        k = births[slot]
+        assert k % trail.length == slot
+        np.testing.assert_array_equal(path.vertices, [(k, -k), (k + 1, -k - 1)])
+
+    alpha = trail.collection.to_rgba(births)[:, 3]
+    order = np.argsort(births)
+    assert np.all(np.diff(alpha[order]) >= 0)
+    assert alpha[births.argmin()] < alpha[births.argmax()]
+    assert alpha[births.argmin()] == alpha.min()
+
+
+def test_poincare_crossings_match_solve_ivp_events():
+    section = dp.PoincareSection(PARAMS, 0.3, -0.4, count=1, spread=0.0, h=0.005)
+    section.state[0, 1] = 1.0  # Start at θ₁ = 0.3 moving, so crossings come in the first seconds
+    y0 = section.state[0].copy()
+    points = np.concatenate([section.step() for _ in range(2000)])
+
+    def crossing(t, y, *params):
+        return np.sin(y[0])
+    crossing.direction = 1
+
+    events = solve(y0, 10.0, events=crossing).y_events[0]
+    events = events[np.cos(events[:, 0]) > 0]  # θ₁ = 0 moving up, not θ₁ = π moving down
+    assert len(points) == len(events) > 5
+    np.testing.assert_allclose(points, events[:, 2:], atol=1e-7)
+
+
+def test_poincare_section_is_paced(monkeypatch):
+    monkeypatch.setattr(dp, "POINCARE_SPEED", 1.0)
+    section = dp.PoincareSection(PARAMS, 2.0, 2.5, count=10)
+    start = time.perf_counter()
+    section.start()
+    time.sleep(0.3)
+    section.stop()
+    chunk = dp.POINCARE_CHUNK_STEPS * section.engine.h
+    assert 0 < section.snapshot()[2] <= time.perf_counter() - start + chunk
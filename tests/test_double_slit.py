@@ -0,0 +1,262 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from tests.scripts import load
+
+ds = load("double-slit")
+
+
+class Var:
+    def __init__(self, value=None):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+    def set(self, value):
+        self.value = value
+
+
+def screen(monkeypatch, rate=100, capacity=1000):
+    """The detection state of DoubleSlitGUI with a small buffer, without Tk."""
+    monkeypatch.setattr(ds, "MAX_DETECTIONS", capacity)
+    rng = np.random.default_rng(0)
+    x = np.linspace(-10, 10, 4096)
+    dx = x[1] - x[0]
+    gui = SimpleNamespace(
+        is_animating=True, rate_var=Var(rate), d_var=Var(1.0), lambda_var=Var(1.0), width_var=Var(0.1),
+        slits_var=Var(2), D_var=Var(1.0), propagation_var=Var(ds.PROPAGATIONS[0]),
+        source_var=Var(ds.SOURCES[0]), wave=None, replay=None, log=None, count_var=Var(),
+        mode_var=Var(ds.DISPLAY_MODES[0]), stats_var=Var(), x_max=10, N=x.size, x=x, rng=rng,
+        count=0, counts=np.zeros(ds.HIST_BINS, dtype=np.int64), hist_range=(x[0] - dx / 2, x[-1] + dx / 2),
+        background=object(),
+        positions=np.empty(capacity, dtype=np.float32),
+        jitter=rng.uniform(-0.05, 0.05, capacity).astype(np.float32), offsets=[],
+        line=SimpleNamespace(set_ydata=lambda y: None, set_visible=lambda visible: None),
+        hist_image=SimpleNamespace(),
+        ax=SimpleNamespace(bbox=None, draw_artist=lambda artist: None),
+        ax_wave=SimpleNamespace(get_visible=lambda: False),
+        root=SimpleNamespace(after=lambda ms, f: None))
+    gui.scat = SimpleNamespace(set_offsets=gui.offsets.append)
+    # Like FigureCanvasTkAgg, a full redraw fires the draw event
+    gui.canvas = SimpleNamespace(draw=lambda: gui.on_draw(None), restore_region=lambda background: None,
+                                 blit=lambda bbox: None, copy_from_bbox=lambda bbox: object())
+    gui.hist_image.set_data = lambda data: setattr(gui.hist_image, "data", data.copy())
+    gui.hist_image.set_clim = lambda low, high: None
+    for name in ("current_params", "update_P", "show_pattern", "reset_detections", "sample", "accumulate",
+                 "update_stats", "draw_histogram", "on_draw", "animate_frame", "add_detections"):
+        setattr(gui, name, getattr(ds.DoubleSlitGUI, name).__get__(gui))
+    gui.update_P()
+    return gui
+
+
+def test_samples_follow_the_pattern(monkeypatch):
+    gui = screen(monkeypatch)
+    n = 500_000
+    samples = gui.sample(n)
+    dx = gui.x[1] - gui.x[0]
+    edges = np.append(gui.x - dx / 2, gui.x[-1] + dx / 2)
+    observed, _ = np.histogram(samples, edges)
+    assert observed.sum() == n
+    # Every cell within five standard deviations of its expected count
+    expected = n * gui.P
+    assert np.all(np.abs(observed - expected) <= 5 * np.sqrt(expected) + 1)
+
+
+def test_each_slot_keeps_its_jitter(monkeypatch):
+    gui = screen(monkeypatch)
+    jitter = gui.jitter.copy()
+    for _ in range(3):
+        gui.animate_frame()
+    assert gui.count == 300
+    # Each frame draws only its own points, at the jitter of their slots
+    for k, offsets in enumerate(gui.offsets):
+        np.testing.assert_array_equal(offsets[:, 1], jitter[100 * k:100 * (k + 1)])
+    np.testing.assert_array_equal(gui.jitter, jitter)
+
+    # A full redraw puts every earlier point back where it was drawn
+    gui.on_draw(None)
+    np.testing.assert_array_equal(gui.offsets[-1], np.concatenate(gui.offsets[:3]))
+
+    # A reset starts again from the first slot
+    first_frame = gui.offsets[0]
+    gui.update_P()
+    assert gui.count == 0
+    gui.animate_frame()
+    np.testing.assert_array_equal(gui.offsets[-1][:, 1], first_frame[:, 1])
+
+
+def test_detections_stop_when_the_buffer_is_full(monkeypatch):
+    gui = screen(monkeypatch, rate=600)
+    for _ in range(3):
+        gui.animate_frame()
+    assert gui.count == 1000
+    assert [len(offsets) for offsets in gui.offsets] == [600, 400]
+
+
+def test_histogram_counts_every_detection(monkeypatch):
+    gui = screen(monkeypatch, rate=400)
+    gui.mode_var.set("Histogram")
+    for _ in range(2):
+        gui.animate_frame()
+    assert not gui.offsets
+    expected, _, _ = np.histogram2d(gui.positions[:800], gui.jitter[:800], ds.HIST_BINS,
+                                    [gui.hist_range, (-0.05, 0.05)])
+    np.testing.assert_array_equal(gui.counts, expected)
+    np.testing.assert_array_equal(gui.hist_image.data, gui.counts.T)
+
+    # Both modes share the detections, and a reset clears the counts
+    gui.mode_var.set("Scatter")
+    gui.on_draw(None)
+    assert len(gui.offsets[-1]) == 800
+    gui.update_P()
+    assert not gui.counts.any()
+
+
+def test_stats_agree_with_theory(monkeypatch):
+    gui = screen(monkeypatch, rate=100_000, capacity=100_000)
+    gui.animate_frame()
+    chi2 = float(gui.stats_var.get().split("= ")[1].split("\n")[0])
+    assert abs(chi2 - 1) < 0.3
+
+
+def test_stats_skip_dark_fringes(monkeypatch):
+    gui = screen(monkeypatch)
+    gui.P_bins = np.zeros(ds.HIST_BINS[0])
+    gui.P_bins[::4] = 1 / len(gui.P_bins[::4])
+    gui.counts[::4, 0] = 10
+    gui.counts[1, 0] = 3  # A detection where theory has none
+    gui.count = int(gui.counts.sum())
+    gui.update_stats()
+    assert "nan" not in gui.stats_var.get() and "inf" not in gui.stats_var.get()
+    assert "χ²/dof" in gui.stats_var.get()
+
+
+def test_slit_mask_open_area():
+    spacing = 0.01
+    mask = ds.slit_mask(2000, spacing, 3, 0.25, 1.0)
+    assert mask.max() <= 1
+    assert mask.sum() * spacing == pytest.approx(3 * 0.25)
+
+
+def test_overlapping_slits_are_clipped():
+    spacing = 0.01
+    # Three slits of width 1 at 0.1 apart open [-0.6, 0.6]
+    mask = ds.slit_mask(2000, spacing, 3, 1.0, 0.1)
+    assert mask.max() == 1
+    assert mask.sum() * spacing == pytest.approx(1.2)
+
+
+@pytest.mark.parametrize("n_slits, width, separation, wavelength, distance",
+                         [(1, 0.5, 1.0, 1.0, 1.0), (2, 0.1, 1.0, 1.0, 1.0), (3, 0.2, 1.5, 0.7, 2.0),
+                          (5, 0.05, 0.5, 2.0, 3.0)])
+def test_fraunhofer_matches_analytic_pattern(n_slits, width, separation, wavelength, distance):
+    x = np.linspace(-10, 10, 4096)
+    pattern = ds.diffraction_pattern(ds.PROPAGATIONS[0], n_slits, width, separation, wavelength, distance,
+                                     10.0, len(x))
+    # sinc² single-slit envelope times the N-slit grating factor
+    u = x / (wavelength * distance)
+    s = np.sin(np.pi * separation * u)
+    dark = np.abs(s) < 1e-9
+    grating = np.where(dark, n_slits ** 2, (np.sin(n_slits * np.pi * separation * u) / np.where(dark, 1, s)) ** 2)
+    analytic = np.sinc(width * u) ** 2 * grating
+    np.testing.assert_allclose(pattern / pattern.max(), analytic / analytic.max(), atol=0.02)
+
+
+@pytest.mark.parametrize("n_slits", [1, 2, 10])
+@pytest.mark.parametrize("separation", [0.1, 1.0, 5.0])
+@pytest.mark.parametrize("wavelength", [0.1, 0.5, 1.0, 5.0])
+@pytest.mark.parametrize("width", [0.01, 1.0])
+def test_wave_geometry_keeps_the_aperture_on_the_grid(n_slits, separation, wavelength, width):
+    n = ds.WAVE_GRID
+    try:
+        kwargs, scale = ds.wave_geometry(n, n_slits, width, separation, wavelength, 1.0)
+    except ValueError:
+        # Only refused when the wavelength can't be resolved at a scale that fits
+        extent = (n_slits - 1) * separation + width
+        assert wavelength * (n - 2 * ds.WAVE_ABSORB) / extent < ds.WAVE_MIN_RESOLVED + 1
+        return
+    assert kwargs["wavelength"] == pytest.approx(wavelength * scale)
+    assert kwargs["wavelength"] >= ds.WAVE_MIN_RESOLVED
+    for lo, hi in kwargs["slits"]:
+        assert ds.WAVE_ABSORB <= lo < hi <= n - ds.WAVE_ABSORB
+    # Slit centers keep the scaled separation, up to rounding to whole cells
+    centers = np.mean(kwargs["slits"], axis=1)
+    np.testing.assert_allclose(np.diff(centers), separation * scale, atol=1)
+
+
+def test_wave_geometry_opens_the_wall():
+    kwargs, _ = ds.wave_geometry(ds.WAVE_GRID, 10, 0.1, 5.0, 1.0, 1.0)
+    wave = ds.WavePacket(**kwargs)
+    assert not wave.wall[:, kwargs["wall_x"]].all()
+
+
+def test_unresolvable_wave_packet_detects_nothing(monkeypatch):
+    gui = screen(monkeypatch)
+    gui.source_var.set(ds.SOURCES[1])
+    gui.slits_var.set(10)
+    gui.d_var.set(5.0)
+    gui.lambda_var.set(0.1)
+    gui.update_P()
+    assert gui.wave is None
+    assert gui.stats_var.get().startswith("No wave packet")
+    gui.animate_frame()
+    assert gui.count == 0
+
+
+def test_stats_not_applicable_to_wave_packets(monkeypatch):
+    gui = screen(monkeypatch)
+    gui.pattern_source = ds.SOURCES[1]
+    gui.add_detections(gui.sample(1000))
+    assert "not applicable" in gui.stats_var.get()
+
+
+PARAMS = {"d": 1.0, "wavelength": 1.0, "width": 0.1, "slits": 2, "distance": 1.0,
+          "propagation": ds.PROPAGATIONS[0], "source": ds.SOURCES[0]}
+
+
+def record(path, close=True):
+    """A log with a slider drag (three P records, no events between) and two epochs of events."""
+    log = ds.EventLog(path)
+    log.set_params(PARAMS)
+    log.append(np.linspace(-1, 1, 1000))
+    for d in (2.0, 2.5, 3.0):
+        log.set_params(dict(PARAMS, d=d))
+    log.append(np.linspace(-2, 2, 3000))
+    log.flush()
+    if close:
+        log.close()
+    else:
+        log.file.close()
+    return log
+
+
+@pytest.mark.parametrize("close", [True, False], ids=["indexed", "scanned"])
+def test_event_log_round_trip(tmp_path, close):
+    path = tmp_path / "run.dslog"
+    record(path, close)
+    reader = ds.EventLogReader(path)
+    assert reader.total == 4000
+    np.testing.assert_allclose(reader.events(0, 1000)["position"], np.linspace(-1, 1, 1000), rtol=1e-6)
+    np.testing.assert_allclose(reader.events(1500, 1600)["position"], np.linspace(-2, 2, 3000)[500:600],
+                               rtol=1e-6)
+
+    params, first, _ = reader.epoch(999)
+    assert (params["d"], first) == (1.0, 0)
+    # The events after the drag were recorded under its last value
+    params, first, _ = reader.epoch(1000)
+    assert (params["d"], first) == (3.0, 1000)
+    assert reader.epoch(3999)[0]["d"] == 3.0
+    assert reader.epoch_end(0) == 1000
+    assert reader.epoch_end(1000) == 4000
+    reader.close()
+
+
+def test_export_histogram(tmp_path):
+    path = tmp_path / "run.dslog"
+    record(path)
+    assert ds.export_histogram(path, tmp_path / "hist.csv", bins=64) == 4000
+    counts = np.loadtxt(tmp_path / "hist.csv", delimiter=",", skiprows=1)[:, 1]
+    assert counts.sum() == 4000
@@ -0,0 +1,498 @@
+import os
+import threading
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from tests.scripts import load
+
+fg = load("fractal-generator")
+
+
+def grid(center=(-0.5, 0.0), scale=1.5, width=160, height=120):
+    real = np.linspace(center[0] - scale, center[0] + scale, width)
+    aspect = scale * height / width
+    imag = np.linspace(center[1] - aspect, center[1] + aspect, height)
+    return real, imag
+
+
+VIEWS = {"default": grid(), "minibrot": grid((-1.7549, 0.0), 0.03),
+         "seahorse": grid((-0.745, 0.11), 0.01, 97, 61)}
+
+
+def points(view):
+    real, imag = VIEWS[view]
+    return real[:, np.newaxis] + 1j * imag[np.newaxis, :]
+
+
+@pytest.mark.parametrize("interior_checks", [True, False])
+@pytest.mark.parametrize("view", VIEWS)
+def test_kernel_matches_naive_loop(view, interior_checks):
+    reference = fg.masked_escape_time(points(view), 200)
+    escape_time, _ = fg.escape_time_kernel(points(view), 200, interior_checks=interior_checks)
+    # Cycle detection may retire a point that the naive loop lets escape at
+    # the last moment; anything more than a stray pixel is a bug
+    assert np.mean(escape_time != reference) < 1e-3
+
+
+@pytest.mark.parametrize("min_size, block", [(16, 64), (4, 16), (8, 1000)])
+@pytest.mark.parametrize("view", VIEWS)
+def test_mariani_silver_matches_kernel(view, min_size, block):
+    real, imag = VIEWS[view]
+    expected, expected_smooth = fg.escape_time_kernel(points(view), 200)
+    escape_time, smooth = fg.mariani_silver(real, imag, 200, min_size=min_size, block=block)
+    assert (escape_time >= 0).all()
+    assert np.mean(escape_time != expected) < 1e-3
+    same = escape_time == expected
+    np.testing.assert_allclose(smooth[same & (expected == 0)], 0)
+    assert np.median(np.abs(smooth - expected_smooth)[same]) < 1e-3
+
+
+def test_smooth_count_matches_naive_loop():
+    c = points("seahorse")
+    escape_time, smooth = fg.escape_time_kernel(c, 300)
+    z = np.zeros_like(c)
+    expected = np.zeros(c.shape)
+    for n in range(1, 301):
+        running = expected == 0
+        z[running] = z[running] ** 2 + c[running]
+        escaped = running & (np.abs(z) >= 2)
+        expected[escaped] = n + 1 - np.log2(np.log2(np.abs(z[escaped])))
+    assert np.mean((expected > 0) != (escape_time > 0)) < 1e-3
+    both = (expected > 0) & (escape_time > 0)
+    np.testing.assert_allclose(smooth[both], expected[both], rtol=1e-5)
+    # Continuous across the escape bands: within one iteration of the integer count
+    assert np.all(np.abs(smooth[both] - escape_time[both]) <= 1)
+    assert (smooth[escape_time == 0] == 0).all()
+
+
+def naive_family(start, c, max_iter, step, degree):
+    """Escape times and smooth counts of an arbitrary map, one full-array step at a time."""
+    z = start.copy()
+    escape_time = np.zeros(z.shape, dtype=int)
+    smooth = np.zeros(z.shape)
+    for n in range(1, max_iter + 1):
+        running = escape_time == 0
+        z[running] = step(z[running], c[running])
+        escaped = running & (np.abs(z) >= 2)
+        escape_time[escaped] = n
+        smooth[escaped] = n + 1 - np.log(np.log2(np.abs(z[escaped]))) / np.log(degree)
+    smooth[escape_time == max_iter] = 0
+    escape_time[escape_time == max_iter] = 0
+    return escape_time, smooth
+
+
+def burning_ship(z, c):
+    return (np.abs(z.real) + 1j * np.abs(z.imag)) ** 2 + c
+
+
+def tricorn(z, c):
+    return np.conj(z) ** 2 + c
+
+
+def multibrot(power):
+    return lambda z, c: z ** power + c
+
+
+FAMILIES = {
+    ("Mandelbrot",): (lambda z, c: z * z + c, 2),
+    ("Burning Ship",): (burning_ship, 2),
+    ("Tricorn",): (tricorn, 2),
+    ("Multibrot", 3): (multibrot(3), 3),
+    ("Multibrot", 4): (multibrot(4), 4),
+    ("Multibrot", 5): (multibrot(5), 5),
+    ("Julia", "Mandelbrot", 2, complex(-0.8, 0.156)): (lambda z, c: z * z + c, 2),
+    ("Julia", "Burning Ship", 2, complex(-1.5, -0.02)): (burning_ship, 2),
+    ("Julia", "Tricorn", 2, complex(-0.2, 0.1)): (tricorn, 2),
+    ("Julia", "Multibrot", 3, complex(0.4, 0.1)): (multibrot(3), 3),
+}
+
+
+@pytest.mark.parametrize("fractal_type", FAMILIES, ids=str)
+def test_families_match_naive_loop(fractal_type):
+    step, degree = FAMILIES[fractal_type]
+    center = (0.0, 0.0) if fractal_type[0] in ("Julia", "Multibrot") else (-0.5, -0.3)
+    real, imag = grid(center, 1.6, 96, 72)
+    grid_points = real[:, np.newaxis] + 1j * imag[np.newaxis, :]
+    if fractal_type[0] == "Julia":
+        start, c = grid_points, np.full_like(grid_points, fractal_type[3])
+    else:
+        start, c = np.zeros_like(grid_points), grid_points
+    expected, expected_smooth = naive_family(start, c, 150, step, degree)
+
+    escape_time, smooth = fg.kernel_for(fractal_type)(grid_points, 150)
+    assert 0 < np.mean(expected > 0) < 1  # The view shows both escaping and bounded points
+    # Orbits that hug the boundary for many iterations amplify the rounding
+    # differences between complex and split-plane arithmetic
+    early = (expected > 0) & (expected <= 30)
+    assert np.mean(escape_time[early] != expected[early]) < 1e-3
+    assert np.mean(escape_time != expected) < 0.02
+    same = early & (escape_time == expected)
+    np.testing.assert_allclose(smooth[same], expected_smooth[same], rtol=1e-5)
+
+
+def test_kernel_for_dispatches_on_fractal_type():
+    assert fg.kernel_for(("Tricorn",)).keywords == {"family": "Tricorn"}
+    assert fg.kernel_for(("Multibrot", 4)).keywords == {"family": "Multibrot", "power": 4}
+    julia = fg.kernel_for(("Julia", "Burning Ship", 2, 0.3j))
+    assert julia.func is fg.escape_time_kernel
+    assert julia.keywords == {"family": "Burning Ship", "power": 2, "julia_c": 0.3j}
+
+
+def test_precision_switches_to_float64_for_deep_zooms():
+    assert fg.precision_for(3 / 800) is np.float32
+    assert fg.precision_for(fg.FLOAT32_MIN_PIXEL) is np.float32
+    assert fg.precision_for(fg.FLOAT32_MIN_PIXEL / 2) is np.float64
+    assert fg.precision_for(1e-12) is np.float64
+
+
+def seahorse_planes(pixel):
+    offsets = np.arange(-80, 80) * pixel
+    return (-0.745 + offsets)[:, np.newaxis], (0.11 + offsets[:120])[np.newaxis, :]
+
+
+@pytest.mark.parametrize("pixel", [3 / 800, 1e-3, fg.FLOAT32_MIN_PIXEL])
+def test_float32_matches_float64_at_coarse_pixels(pixel):
+    planes = seahorse_planes(pixel)
+    expected, expected_smooth = fg.escape_time_kernel(planes, 300)
+    escape_time, smooth = fg.escape_time_kernel(planes, 300, dtype=np.float32)
+    assert np.mean(escape_time != expected) < 0.03
+    same = (escape_time == expected) & (expected > 0)
+    assert np.median(np.abs(smooth - expected_smooth)[same]) < 1e-4
+
+
+def test_float32_breaks_down_below_the_threshold():
+    planes = seahorse_planes(1e-7)
+    expected, _ = fg.escape_time_kernel(planes, 300)
+    escape_time, _ = fg.escape_time_kernel(planes, 300, dtype=np.float32)
+    assert np.mean(escape_time != expected) > 0.1
+
+
+def test_workspace_buffers_are_reused():
+    workspace = fg.KernelWorkspace()
+    planes = seahorse_planes(1e-3)
+    first = fg.escape_time_kernel(planes, 200, workspace=workspace)
+    buffers = dict(workspace.buffers)
+    for _ in range(2):
+        again = fg.escape_time_kernel(planes, 200, workspace=workspace)
+        np.testing.assert_array_equal(again[0], first[0])
+        np.testing.assert_array_equal(again[1], first[1])
+    assert workspace.buffers.keys() == buffers.keys()
+    assert all(workspace.buffers[key] is buffer for key, buffer in buffers.items())
+
+
+def test_mariani_silver_fills_uniform_regions_without_iterating():
+    real, imag = grid((-0.2, 0.0), 0.1)  # Inside the main cardioid
+    evaluated = []
+
+    def kernel(c, max_iter):
+        evaluated.append(c[0].size)
+        return fg.escape_time_kernel(c, max_iter)
+
+    escape_time, _ = fg.mariani_silver(real, imag, 100, kernel=kernel)
+    assert (escape_time == 0).all()
+    assert sum(evaluated) < real.size * imag.size / 4
+
+
+def test_mariani_silver_stacks():
+    real, imag = VIEWS["default"]
+    stacked = fg.mariani_silver(np.stack([real, real + 0.1]), np.stack([imag, imag]), 100)
+    for k, shift in enumerate([0, 0.1]):
+        single = fg.mariani_silver(real + shift, imag, 100)
+        np.testing.assert_array_equal(stacked[0][k], single[0])
+        np.testing.assert_allclose(stacked[1][k], single[1])
+
+
+def tile(value, n=100):
+    return np.full(n, value, dtype=np.float64), np.full(n, value, dtype=np.int32)
+
+
+TILE_BYTES = sum(a.nbytes for a in tile(0))
+
+
+def test_tile_cache_evicts_least_recently_used():
+    cache = fg.TileCache(max_bytes=3 * TILE_BYTES)
+    for key in "abc":
+        cache.put(key, tile(ord(key)))
+    assert cache.get("a") is not None  # "b" is now the oldest
+    cache.put("d", tile(0))
+    assert list(cache.tiles) == ["c", "a", "d"]
+    assert cache.get("b") is None
+    assert cache.nbytes == 3 * TILE_BYTES
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_tile_cache_spills_to_disk():
+    cache = fg.TileCache(max_bytes=2 * TILE_BYTES, max_disk_bytes=2 * TILE_BYTES)
+    cache.set_spill(True)
+    spill_dir = cache.spill_dir
+    try:
+        for value in range(5):
+            cache.put(value, tile(value))
+        # 3 and 4 in memory, 1 and 2 on disk, 0 dropped over the disk budget
+        assert list(cache.tiles) == [3, 4]
+        assert list(cache.spilled) == [1, 2]
+        assert cache.get(0) is None
+        reloaded = cache.get(1)
+        np.testing.assert_array_equal(reloaded[0], tile(1)[0])
+        assert reloaded[1].dtype == np.int32
+        assert list(cache.tiles) == [4, 1]
+        assert list(cache.spilled) == [2, 3]
+        assert len(os.listdir(spill_dir)) == 2
+    finally:
+        cache.clear()
+    assert cache.spill_dir is None and not os.path.exists(spill_dir)
+
+
+class Var:
+    def __init__(self, value=None):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+    def set(self, value):
+        self.value = value
+
+
+def explorer(**variables):
+    """The tile rendering state of FractalGUI, without Tk."""
+    gui = SimpleNamespace(tile_cache=fg.TileCache(), workspace=fg.KernelWorkspace(),
+                          center_x=-0.5, center_y=0.0, base_scale=1.5, scale=1.5,
+                          max_iter_var=Var(100), algorithm_var=Var(fg.ALGORITHMS[0]),
+                          family_var=Var("Mandelbrot"), power_var=Var(3),
+                          julia_family="Mandelbrot", julia_c=complex(-0.8, 0.156))
+    for name, value in variables.items():
+        setattr(gui, name, Var(value))
+    for name in ("zoom_level", "fractal_type", "render_request", "compute_tiles", "compute_mandelbrot"):
+        setattr(gui, name, getattr(fg.FractalGUI, name).__get__(gui))
+    return gui
+
+
+def test_tiles_are_cached_per_algorithm():
+    gui = explorer()
+    standard, _, _, (computed, cached) = gui.compute_mandelbrot(gui.render_request())
+    assert computed > 0 and cached == 0
+    assert gui.compute_mandelbrot(gui.render_request())[3] == (0, computed)
+
+    # Switching algorithm renders its own tiles instead of reusing the others
+    gui.algorithm_var.set("Mariani–Silver")
+    assert gui.compute_mandelbrot(gui.render_request())[3] == (computed, 0)
+    gui.algorithm_var.set("Standard")
+    escape_time, _, _, counts = gui.compute_mandelbrot(gui.render_request())
+    np.testing.assert_array_equal(escape_time, standard)
+    assert counts == (0, computed)
+
+
+def test_colorize_modes():
+    escape_time, smooth = fg.escape_time_kernel(points("seahorse"), 300)
+    escaped = escape_time > 0
+    cmap = fg.matplotlib.colormaps["viridis"]
+    for mode in ("Smooth", "Escape time", "Histogram"):
+        rgba = fg.colorize(escape_time, smooth, "viridis", mode=mode)
+        assert rgba.shape == escape_time.shape + (4,) and rgba.dtype == np.uint8
+        # Interior points always get the bottom color
+        assert (rgba[~escaped] == cmap(0.0, bytes=True)).all()
+    # Escape time and smooth values normalized by their maxima
+    top = np.unravel_index(np.argmax(np.where(escaped, escape_time, -1)), escape_time.shape)
+    np.testing.assert_array_equal(fg.colorize(escape_time, smooth, "viridis", mode="Escape time")[top],
+                                  cmap(1.0, bytes=True))
+    rgba = fg.colorize(escape_time, smooth, "viridis", mode="Smooth")
+    np.testing.assert_array_equal(rgba[escaped], cmap(smooth[escaped] / smooth[escaped].max(), bytes=True))
+
+
+def test_histogram_coloring_has_a_uniform_cdf():
+    escape_time, smooth = fg.escape_time_kernel(points("seahorse"), 300)
+    escaped = escape_time > 0
+    ranks = np.searchsorted(np.sort(smooth[escaped]), smooth[escaped], side="right") / escaped.sum()
+    # The colored values are the empirical CDF, so their own CDF is the identity
+    quantiles = np.sort(ranks)
+    np.testing.assert_allclose(quantiles, np.arange(1, len(quantiles) + 1) / len(quantiles), atol=1e-2)
+    rgba = fg.colorize(escape_time, smooth, "gray", mode="Histogram")
+    levels = rgba[escaped, 0] / 255
+    for q in (0.1, 0.25, 0.5, 0.75, 0.9):
+        assert abs(np.mean(levels <= q) - q) < 0.02
+
+
+def test_palette_shift_recolors_without_new_data():
+    escape_time, smooth = fg.escape_time_kernel(points("seahorse"), 300)
+    escaped = escape_time > 0
+    base = fg.colorize(escape_time, smooth, "gray", mode="Smooth")
+    shifted = fg.colorize(escape_time, smooth, "gray", mode="Smooth", offset=0.25)
+    values = smooth[escaped] / smooth[escaped].max()
+    np.testing.assert_allclose(shifted[escaped, 0] / 255, (values + 0.25) % 1.0, atol=2 / 255 + 1e-6)
+    np.testing.assert_array_equal(shifted[~escaped], base[~escaped])
+
+
+POSTER_VIEW = (-2.0, 1.0, -1.0, 1.0)
+
+
+def read_raw(path, width, height):
+    return np.fromfile(path, dtype=np.uint8).reshape(height, width, 3)
+
+
+@pytest.mark.parametrize("height", [1, 10, 16, 40])
+def test_poster_tiff_matches_raw(tmp_path, height):
+    Image = pytest.importorskip("PIL.Image")
+    for extension in (".tif", ".raw", ".png"):
+        assert fg.export_poster(str(tmp_path / f"poster{extension}"), 64, height, POSTER_VIEW, 50)
+    expected = read_raw(tmp_path / "poster.raw", 64, height)
+    for extension in (".tif", ".png"):
+        with Image.open(tmp_path / f"poster{extension}") as image:
+            assert image.size == (64, height)
+            np.testing.assert_array_equal(np.asarray(image.convert("RGB")), expected)
+    assert not list(tmp_path.glob("*.progress.json"))
+
+
+@pytest.mark.parametrize("extension", [".tif", ".raw"])
+def test_poster_resumes_after_cancel(tmp_path, monkeypatch, extension):
+    monkeypatch.setattr(fg, "STRIP_PIXELS", 64 * 8)
+    whole = str(tmp_path / f"whole{extension}")
+    assert fg.export_poster(whole, 64, 40, POSTER_VIEW, 50)
+
+    path = str(tmp_path / f"resumed{extension}")
+    done = []
+    assert not fg.export_poster(path, 64, 40, POSTER_VIEW, 50,
+                                progress=lambda rows, height: done.append(rows),
+                                cancel=lambda: len(done) == 2)
+    assert done == [8, 16]
+    assert os.path.exists(path + ".progress.json")
+
+    done.clear()
+    assert fg.export_poster(path, 64, 40, POSTER_VIEW, 50,
+                            progress=lambda rows, height: done.append(rows))
+    assert done == [24, 32, 40]
+    assert not os.path.exists(path + ".progress.json")
+    with open(whole, "rb") as a, open(path, "rb") as b:
+        assert a.read() == b.read()
+
+
+@pytest.mark.parametrize("changed", [{"max_iter": 60}, {"algorithm": "Mariani–Silver"}])
+def test_poster_restarts_when_settings_change(tmp_path, monkeypatch, changed):
+    monkeypatch.setattr(fg, "STRIP_PIXELS", 64 * 8)
+    path = str(tmp_path / "poster.raw")
+    settings = {"max_iter": 50, "algorithm": "Standard"}
+    done = []
+    fg.export_poster(path, 64, 40, POSTER_VIEW, cancel=lambda: len(done) == 1,
+                     progress=lambda rows, height: done.append(rows), **settings)
+    done.clear()
+    assert fg.export_poster(path, 64, 40, POSTER_VIEW,
+                            progress=lambda rows, height: done.append(rows), **dict(settings, **changed))
+    assert done[0] == 8
+
+
+def wait_for(worker, timeout=5.0):
+    """Poll worker like the GUI does until it is idle; return the finished renders."""
+    finished = []
+    deadline = time.perf_counter() + timeout
+    busy = True
+    while busy:
+        assert time.perf_counter() < deadline
+        result, busy = worker.poll()
+        if result is not None:
+            finished.append(result)
+        time.sleep(0.001)
+    return finished
+
+
+def test_render_worker_result_is_collected_with_the_last_busy_poll():
+    started, release = threading.Event(), threading.Event()
+
+    def render(request, cancel):
+        started.set()
+        release.wait()
+        return request * 2
+
+    worker = fg.RenderWorker(render, debounce=0)
+    try:
+        worker.submit(21)
+        assert started.wait(5)
+        assert worker.poll() == (None, True)
+        release.set()
+        assert wait_for(worker) == [(21, 42)]
+    finally:
+        worker.close()
+
+
+def test_render_worker_coalesces_submissions():
+    rendered = []
+
+    def render(request, cancel):
+        rendered.append(request)
+        return request
+
+    worker = fg.RenderWorker(render, debounce=0.05)
+    try:
+        for request in range(5):
+            worker.submit(request)
+        assert wait_for(worker) == [(4, 4)]
+        assert rendered == [4]
+    finally:
+        worker.close()
+
+
+def test_render_worker_reports_failures():
+    def render(request, cancel):
+        raise MemoryError("too big")
+
+    worker = fg.RenderWorker(render, debounce=0)
+    try:
+        worker.submit(1)
+        [(_, error)] = wait_for(worker)
+        assert isinstance(error, MemoryError)
+    finally:
+        worker.close()
+
+
+def test_kernel_stops_when_cancelled():
+    polls = []
+
+    def cancel():
+        polls.append(None)
+        return len(polls) > 3
+
+    with pytest.raises(fg.RenderCancelled):
+        fg.escape_time_kernel(points("seahorse"), 1000, cancel=cancel)
+    assert len(polls) == 4
+
+
+@pytest.mark.parametrize("end_scale", [1.5, 3.0, 0.0])
+def test_zoom_video_rejects_scales_that_do_not_zoom_in(tmp_path, end_scale):
+    with pytest.raises(ValueError, match="end scale"):
+        fg.render_zoom_video(str(tmp_path / "zoom.raw"), (-0.5, 0.0), 1.5, end_scale)
+
+
+def test_zoom_video_frames(tmp_path):
+    frames = {}
+    for mode in ("Smooth", "Histogram"):
+        path = tmp_path / f"{mode}.raw"
+        done = []
+        fg.render_zoom_video(str(path), (-0.75, 0.1), 1.5, 0.375, frame_size=(32, 24),
+                             frames_per_octave=4, max_iter=50, mode=mode, supersample=1,
+                             progress=lambda frame, total: done.append((frame, total)))
+        assert done[-1] == (9, 9)
+        frames[mode] = np.fromfile(path, dtype=np.uint8).reshape(9, 24, 32, 3)
+    assert not np.array_equal(frames["Smooth"], frames["Histogram"])
+
+
+@pytest.mark.parametrize("error, message", [
+    (MemoryError("poster too large"), "Failed (poster too large)"),
+    (FileNotFoundError(2, "No such file or directory"), "Failed (No such file or directory)"),
+])
+def test_failed_job_is_reported(error, message):
+    def job(**kwargs):
+        raise error
+
+    button = SimpleNamespace(text="Cancel")
+    gui = SimpleNamespace(_job_state=(3, 10, "rows", time.perf_counter(), None),
+                          job_progress=Var(), job_status_var=Var(), _job_thread=object(),
+                          _job_button=button, _job_button_text="Export Poster…",
+                          root=SimpleNamespace(after=lambda ms, f: pytest.fail("still polling")))
+    button.configure = lambda text: setattr(button, "text", text)
+    fg.FractalGUI.run_job(gui, job)
+    fg.FractalGUI.poll_job(gui)
+    assert gui.job_status_var.get().startswith(message + ": 3/10 rows")
+    assert button.text == "Export Poster…"
+    assert gui._job_thread is None
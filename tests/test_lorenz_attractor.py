@@ -0,0 +1,173 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from scipy.integrate import odeint
+
+from tests.scripts import load
+
+la = load("lorenz-attractor")
+
+CLASSIC = (10.0, 8 / 3, 28.0)
+
+
+def lorenz(state, t, sigma, beta, rho):
+    x, y, z = state
+    return [sigma * (y - x), x * (rho - z) - y, x * y - beta * z]
+
+
+def test_trajectory_cache_does_not_depend_on_scrub_history():
+    direct = la.TrajectoryCache(lorenz)
+    expected = direct.get(CLASSIC, (1.0, 1.0, 1.0), 35.0)
+    assert direct.last == "solved"
+
+    scrubbed = la.TrajectoryCache(lorenz)
+    for t_max, last in [(3.0, "solved"), (12.345, "extended"), (7.0, "hit"), (35.0, "extended")]:
+        states = scrubbed.get(CLASSIC, (1.0, 1.0, 1.0), t_max)
+        assert scrubbed.last == last
+        assert len(states) == int(round(t_max / la.TRAJECTORY_DT)) + 1
+    np.testing.assert_array_equal(states, expected)
+    assert direct.nbytes == scrubbed.nbytes
+
+
+def test_trajectory_cache_solves_the_quantized_problem():
+    cache = la.TrajectoryCache(lorenz)
+    states = cache.get((10.001, 8 / 3, 27.996), (0.999, 1.003, 1.0), 1.0)
+    assert cache.get(CLASSIC, (1.0, 1.0, 1.0), 1.0) is not states
+    assert cache.last == "hit" and len(cache.entries) == 1
+    t = np.arange(len(states)) * la.TRAJECTORY_DT
+    np.testing.assert_allclose(states, odeint(lorenz, [1.0, 1.0, 1.0], t, args=(10.0, 2.67, 28.0)),
+                               atol=1e-5)
+
+
+def test_trajectory_cache_evicts_least_recently_used():
+    entry = (la.TrajectoryCache(lorenz).segment_points + 1) * 3 * 8
+    cache = la.TrajectoryCache(lorenz, budget=2 * entry)
+    for rho in (20.0, 21.0, 22.0):
+        cache.get((10.0, 8 / 3, rho), (1.0, 1.0, 1.0), 5.0)
+    assert [key[2] for key in cache.entries] == [2100, 2200]
+    cache.get((10.0, 8 / 3, 21.0), (1.0, 1.0, 1.0), 5.0)
+    assert cache.last == "hit"
+    # A single trajectory over budget is kept, alone
+    cache.get(CLASSIC, (1.0, 1.0, 1.0), 25.0)
+    assert len(cache.entries) == 1 and cache.nbytes > cache.budget
+
+
+def test_engine_matches_odeint():
+    starts = np.array([[1.0, 1.0, 1.0], [-5.0, 3.0, 20.0], [3.0, -2.0, 10.0]])
+    state = starts.T.copy()
+    la.LorenzEngine(*CLASSIC, h=0.001).step(state, 1000)
+    for start, end in zip(starts, state.T):
+        expected = odeint(lorenz, start, [0.0, 1.0], args=CLASSIC, rtol=1e-12, atol=1e-12)[-1]
+        np.testing.assert_allclose(end, expected, atol=1e-6)
+
+def test_stream_trail_wraps_around_the_ring_buffer(monkeypatch):
+    monkeypatch.setattr(la, "LIVE_SPEED", 1000.0)
+    stream = la.LorenzStream([1.0, 1.0, 1.0], CLASSIC, capacity=50)
+    stream.start()
+    while stream.count < 3 * len(stream.buffer) + 7:
+        stream.stopped.wait(0.01)
+    stream.stop()
+    assert stream.count % len(stream.buffer) != 0
+
+    trail = stream.trail(1000)
+    assert len(trail) == len(stream.buffer)
+    np.testing.assert_array_equal(trail[-1], stream.state[:, 0])
+    # Oldest first and contiguous across the wrap: each point is one step on
+    stepped = trail[:-1].T.copy()
+    la.LorenzEngine(*CLASSIC, h=stream.engine.h).step(stepped)
+    np.testing.assert_allclose(trail[1:], stepped.T, rtol=1e-12)
+    np.testing.assert_array_equal(stream.trail(5), trail[-5:])
+
+
+@pytest.mark.parametrize("drawn", [False, True])
+def test_stop_live_disconnects_the_animation(drawn):
+    fig = Figure()
+    line, = fig.add_subplot().plot([0, 1], [0, 1])
+    gui = SimpleNamespace(fig=fig, canvas=FigureCanvasAgg(fig), anim=None, callbacks_before_anim=set(),
+                          stream=None)
+    gui.canvas.mpl_connect("button_press_event", print)
+    for name in ("animate", "stop_live"):
+        setattr(gui, name, getattr(la.LorenzAttractorGUI, name).__get__(gui))
+    before = la.canvas_callback_ids(gui.canvas)
+    for _ in range(3):
+        gui.stream = la.LorenzStream([1.0, 1.0, 1.0], CLASSIC)
+        gui.stream.start()
+        gui.animate(lambda frame: [line], 10)
+        assert la.canvas_callback_ids(gui.canvas) > before
+        if drawn:
+            gui.canvas.draw()
+        anim, stream = gui.anim, gui.stream
+        gui.stop_live()
+        assert gui.anim is None and gui.stream is None
+        assert not stream.thread.is_alive()
+        assert la.canvas_callback_ids(gui.canvas) == before
+    # Nothing left on the canvas can restart the last animation's timer
+    started = []
+    anim.event_source.start = lambda *args: started.append(args)
+    gui.canvas.draw()
+    assert not started
+
+
+def test_ensemble_is_seeded_inside_the_ball():
+    center, radius = np.array([1.0, 2.0, 3.0]), 0.5
+    ensemble = la.LorenzEnsemble(center, CLASSIC, 4000, radius)
+    distance = np.linalg.norm(ensemble.state - center[:, np.newaxis], axis=0)
+    assert distance.max() <= radius and distance.max() > 0.98 * radius
+    # Uniform in volume: the RMS distance from the centroid is √(3/5) r
+    offsets = ensemble.state - ensemble.state.mean(axis=1, keepdims=True)
+    assert ensemble.spread() == pytest.approx(np.sqrt(np.mean(np.sum(offsets**2, axis=0))))
+    assert ensemble.spread() == pytest.approx(np.sqrt(3 / 5) * radius, rel=0.03)
+    assert ensemble.latest[0] == 0.0 and ensemble.latest[2] == ensemble.spread0
+    assert ensemble.latest[3] == 0.0 and ensemble.latest[4] == 1.0
+
+
+def test_ensemble_statistics_follow_the_divergence(monkeypatch):
+    monkeypatch.setattr(la, "LIVE_SPEED", 1e4)
+    # Seed a tight ball on the attractor, past the transient from (1, 1, 1)
+    start = np.ones((3, 1))
+    la.LorenzEngine(*CLASSIC, h=0.01).step(start, 2000)
+    ensemble = la.LorenzEnsemble(start[:, 0], CLASSIC, 500, 1e-8)
+    spread0 = ensemble.spread0
+    ensemble.start()
+    while ensemble.latest[0] < 15.0:
+        ensemble.stopped.wait(0.001)
+    early = ensemble.latest
+    while ensemble.latest[0] < 40.0:
+        ensemble.stopped.wait(0.001)
+    ensemble.stop()
+
+    for t, points, spread, growth, right in (early, ensemble.latest):
+        offsets = points - points.mean(axis=1, keepdims=True)
+        assert spread == pytest.approx(np.sqrt(np.mean(np.sum(offsets**2, axis=0))))
+        assert growth == pytest.approx(np.log(spread / spread0) / t)
+        assert right == np.mean(points[0] > 0)
+    # Still tight, the ball grows at about the largest Lyapunov exponent (0.91)
+    # and sits on one wing; once spread over the attractor it fills both
+    assert 0.6 < early[3] < 1.2
+    assert early[4] in (0.0, 1.0)
+    assert 0.25 < ensemble.latest[4] < 0.75
+
+
+def test_engine_parameters_per_column():
+    state = np.array([[1.0, 1.0], [1.0, 1.0], [1.0, 1.0]])
+    la.LorenzEngine(np.array([10.0, 10.0]), np.array([8 / 3, 8 / 3]), np.array([28.0, 15.0]), h=0.01).step(state, 100)
+    single = np.ones((3, 1))
+    la.LorenzEngine(10.0, 8 / 3, 15.0, h=0.01).step(single, 100)
+    np.testing.assert_array_equal(state[:, 1], single[:, 0])
+
+
+def test_atlas_cells_tell_chaos_from_fixed_points():
+    lyapunov, bounds, thumbnails = la.atlas_cells(np.array([10.0, 10.0]), np.array([8 / 3, 8 / 3]),
+                                                  np.array([28.0, 15.0]))
+    assert 0.8 < lyapunov[0] < 1.0
+    assert la.atlas_regime(lyapunov[0]) == "chaotic"
+    assert lyapunov[1] < -la.ATLAS_CHAOS_THRESHOLD
+    # The ρ = 15 cell spirals into a fixed point (±√(β(ρ-1)), ±√(β(ρ-1)), ρ-1)
+    fixed = np.sqrt(8 / 3 * 14)
+    np.testing.assert_allclose(np.abs(thumbnails[1, -1].astype(float)), [fixed, fixed, 14], rtol=1e-2)
+    # The classic attractor spans both wings
+    assert bounds[0, 0] < -15 and bounds[0, 3] > 15 and bounds[0, 5] > 40
+    assert thumbnails.shape == (2, la.ATLAS_THUMBNAIL_POINTS, 3)